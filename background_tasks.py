@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Khmer News Classifier - Background Task Worker
+==============================================
+Durable SQLite-backed job queue and the worker process that drains it
+(``[program:khmer-classifier-tasks]`` in deployment_configs/supervisor.conf).
+
+The Streamlit app only enqueues work and polls job status, so long jobs keep
+running when the browser disconnects and survive app or worker restarts:
+
+- Job IDs are idempotent: enqueueing the same kind + payload twice returns the
+  existing job instead of creating a duplicate (a failed or cancelled one is
+  re-queued with fresh attempts)
+- A worker claims a job with a time-limited lease and renews it while
+  working; jobs whose lease expired (crashed worker) are picked up again
+- Failed jobs are retried with exponential backoff up to ``max_attempts``;
+  a job whose lease expires on its last attempt is marked failed
+
+Job kinds:
+- ``classify``: payload ``{"documents": [{"doc_id", "text" | "pdf_path"}]}``
+- ``extract_pdf``: payload ``{"pdf_path"}``
+- ``export``: payload ``{"source_job_ids", "format", "include_text"}``
+
+Usage:
+    python background_tasks.py [--db jobs/jobs.sqlite3] [--lease 120] [--once]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from classifier_core import Config, ClassificationResult, create_classification_engine, read_pdf_text
+from exporters import export_to_file, result_record
+from online_learning import start_model_watcher
+from warmup import start_warm_up
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+JOB_KINDS = ("classify", "extract_pdf", "export")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            TEXT PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    payload       TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL DEFAULT 3,
+    available_at  REAL NOT NULL,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    progress      REAL NOT NULL DEFAULT 0,
+    result        TEXT,
+    error         TEXT,
+    created_at    REAL NOT NULL,
+    updated_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at, created_at);
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job was cancelled while running"""
+
+
+def job_id_for(kind: str, payload: Dict[str, Any]) -> str:
+    """Deterministic job ID derived from the job kind and canonical payload"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{kind}:{canonical}".encode("utf-8")).hexdigest()[:24]
+
+
+class JobQueue:
+    """SQLite job queue with leases, retries and idempotent job IDs"""
+
+    def __init__(self, db_path: Optional[str] = None, retry_backoff: float = 5.0):
+        self.db_path = db_path or Config.JOBS_DB_PATH
+        self.retry_backoff = retry_backoff
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per operation keeps the queue safe to share
+        # between Streamlit sessions, threads and the worker process
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], job_id: Optional[str] = None,
+                max_attempts: int = 3) -> str:
+        """Add a job and return its ID
+
+        Re-submitting a job that is queued, running or done is a no-op; a failed
+        or cancelled one is reset to queued with fresh attempts.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = job_id or job_id_for(kind, payload)
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET status = excluded.status, attempts = 0, "
+                "max_attempts = excluded.max_attempts, available_at = excluded.available_at, lease_owner = NULL, "
+                "lease_expires = NULL, progress = 0, result = NULL, error = NULL, updated_at = excluded.updated_at "
+                "WHERE jobs.status IN (?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), QUEUED, max_attempts, now, now, now,
+                 FAILED, CANCELLED)
+            )
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float = 120.0) -> Optional[Dict[str, Any]]:
+        """Lease the oldest runnable job (queued, or running with an expired lease)"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # A job whose worker died on every attempt (OOM, crash in native code) is
+            # failed rather than handed to yet another worker
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (FAILED, "Lease expired on the last attempt (worker stopped while running the job)",
+                 now, RUNNING, now)
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE (status = ? AND available_at <= ?) "
+                "OR (status = ? AND lease_expires < ? AND attempts < max_attempts) ORDER BY created_at LIMIT 1",
+                (QUEUED, now, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + lease_seconds, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return self.get(row["id"])
+
+    def renew_lease(self, job_id: str, worker_id: str, lease_seconds: float = 120.0,
+                    progress: Optional[float] = None) -> bool:
+        """Extend a held lease (and optionally record progress); False if the lease was lost"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            if progress is None:
+                cursor = conn.execute(
+                    "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                    (now + lease_seconds, now, job_id, worker_id, RUNNING)
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE jobs SET lease_expires = ?, progress = ?, updated_at = ? "
+                    "WHERE id = ? AND lease_owner = ? AND status = ?",
+                    (now + lease_seconds, progress, now, job_id, worker_id, RUNNING)
+                )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, progress = 1, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), now, job_id, worker_id, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Record a failed attempt: requeue with backoff, or mark failed when out of attempts"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ?",
+                               (job_id, worker_id)).fetchone()
+            if row is None:
+                return False
+            if row["attempts"] < row["max_attempts"]:
+                delay = self.retry_backoff * (2 ** (row["attempts"] - 1))
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, "
+                    "lease_expires = NULL, updated_at = ? WHERE id = ?",
+                    (QUEUED, error, now + delay, now, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+                    "updated_at = ? WHERE id = ?",
+                    (FAILED, error, now, job_id)
+                )
+            return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not finished yet"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                (CANCELLED, time.time(), job_id, QUEUED, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def is_cancelled(self, job_id: str) -> bool:
+        job = self.get(job_id, include_result=False)
+        return job is None or job["status"] == CANCELLED
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row, include_result) if row else None
+
+    def list_jobs(self, job_ids: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Status of the given jobs (or the most recent ones), without payloads or results"""
+        columns = "id, kind, status, attempts, max_attempts, progress, error, created_at, updated_at"
+        with closing(self._connect()) as conn:
+            if job_ids:
+                placeholders = ",".join("?" * len(job_ids))
+                rows = conn.execute(f"SELECT {columns} FROM jobs WHERE id IN ({placeholders}) ORDER BY created_at",
+                                    list(job_ids)).fetchall()
+            else:
+                rows = conn.execute(f"SELECT {columns} FROM jobs ORDER BY created_at DESC LIMIT ?",
+                                    (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row, include_result: bool) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        if include_result and job.get("result"):
+            job["result"] = json.loads(job["result"])
+        elif not include_result:
+            job.pop("result", None)
+        return job
+
+
+def result_from_record(record: Dict[str, Any]) -> ClassificationResult:
+    """Rebuild a ClassificationResult from a stored export record"""
+    return ClassificationResult(
+        prediction=record["prediction"],
+        confidence=record["all_confidences"],
+        processing_time=record["processing_time"],
+        cleaned_text=record.get("cleaned_text", ""),
+        segmented_text=record.get("segmented_text", ""),
+        embedding=np.asarray(record.get("embedding", np.zeros(300)), dtype=np.float32),
+        timestamp=datetime.fromisoformat(record["timestamp"]),
+        input_text=record.get("text", ""),
+        text_statistics=record["text_statistics"],
+        prediction_id=record["prediction_id"]
+    )
+
+
+class TaskWorker:
+    """Claims jobs from the queue and runs them with the shared classification engine"""
+
+    def __init__(self, queue: JobQueue, engine_factory: Callable[[], Any] = create_classification_engine,
+                 worker_id: Optional[str] = None, lease_seconds: float = 120.0, poll_interval: float = 2.0):
+        self.queue = queue
+        self.engine_factory = engine_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._engine = None
+        self._stop = threading.Event()
+        self.handlers = {
+            "classify": self._run_classify,
+            "extract_pdf": self._run_extract_pdf,
+            "export": self._run_export,
+        }
+
+    @property
+    def engine(self):
+        """Classification engine, loaded on first use and shared by all jobs"""
+        if self._engine is None:
+            logging.info("Loading classification models...")
+            self._engine = self.engine_factory()
+        return self._engine
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def run_forever(self):
+        # Load the models up front and warm their caches while waiting for jobs
+        start_warm_up(self.engine)
+        start_model_watcher(self.engine)
+        logging.info(f"Worker {self.worker_id} polling {self.queue.db_path}")
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._stop.wait(self.poll_interval)
+        logging.info(f"Worker {self.worker_id} stopped")
+
+    def run_once(self) -> bool:
+        """Process a single job; returns False when the queue had nothing runnable"""
+        job = self.queue.claim(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+
+        logging.info(f"Running {job['kind']} job {job['id']} (attempt {job['attempts']}/{job['max_attempts']})")
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["id"], heartbeat_stop), daemon=True)
+        heartbeat.start()
+        try:
+            result = self.handlers[job["kind"]](job)
+            if self.queue.complete(job["id"], self.worker_id, result):
+                logging.info(f"Job {job['id']} done")
+            else:
+                logging.warning(f"Job {job['id']} finished but its lease was lost or it was cancelled")
+        except JobCancelled:
+            logging.info(f"Job {job['id']} cancelled")
+        except Exception as e:
+            logging.exception(f"Job {job['id']} failed")
+            self.queue.fail(job["id"], self.worker_id, f"{type(e).__name__}: {e}")
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+        return True
+
+    def _heartbeat(self, job_id: str, stop: threading.Event):
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.queue.renew_lease(job_id, self.worker_id, self.lease_seconds):
+                return
+
+    # ------------------------------------------------------------------
+    # Job handlers
+    # ------------------------------------------------------------------
+
+    def _run_classify(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        documents = job["payload"]["documents"]
+        include_embedding = job["payload"].get("include_embedding", False)
+        records, failures = [], []
+        batch_size = job["payload"].get("batch_size", 16)
+
+        for start in range(0, len(documents), batch_size):
+            if self.queue.is_cancelled(job["id"]):
+                raise JobCancelled(job["id"])
+            batch = documents[start:start + batch_size]
+            texts, kept = [], []
+            for document in batch:
+                text = document.get("text")
+                if text is None and document.get("pdf_path"):
+                    try:
+                        text = read_pdf_text(document["pdf_path"])
+                    except Exception as e:
+                        failures.append({"doc_id": document.get("doc_id"), "reason": f"Text extraction failed: {e}"})
+                        continue
+                if not text or not text.strip():
+                    failures.append({"doc_id": document.get("doc_id"), "reason": "No text found"})
+                    continue
+                texts.append(text)
+                kept.append(document)
+
+            for document, result in zip(kept, self.engine.classify_batch(texts) if texts else []):
+                record = result_record(result, Config.CATEGORY_LABELS, include_embedding=include_embedding)
+                record["doc_id"] = document.get("doc_id")
+                # Kept so results imported into the session history stay searchable
+                record["cleaned_text"] = result.cleaned_text
+                record["segmented_text"] = result.segmented_text
+                records.append(record)
+
+            self.queue.renew_lease(job["id"], self.worker_id, self.lease_seconds,
+                                   progress=min(1.0, (start + len(batch)) / max(1, len(documents))))
+
+        return {"records": records, "failures": failures}
+
+    def _run_extract_pdf(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        text = read_pdf_text(job["payload"]["pdf_path"])
+        if not text:
+            raise ValueError("No readable text found in PDF")
+        return {"text": text}
+
+    def _run_export(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        payload = job["payload"]
+
+        def results():
+            for source_id in payload["source_job_ids"]:
+                source = self.queue.get(source_id)
+                if source is None or source["status"] != DONE:
+                    continue
+                for record in source["result"].get("records", []):
+                    yield result_from_record(record)
+
+        export_format = payload.get("format", "ndjson")
+        export_dir = os.path.join(os.path.dirname(os.path.abspath(self.queue.db_path)), "exports")
+        os.makedirs(export_dir, exist_ok=True)
+        extension = ".parquet" if export_format == "parquet" else ".ndjson"
+        path = export_to_file(
+            results(),
+            export_format,
+            path=os.path.join(export_dir, f"{job['id']}{extension}"),
+            category_labels=Config.CATEGORY_LABELS,
+            categories=Config.CATEGORIES,
+            include_text=payload.get("include_text", True),
+            include_embedding=payload.get("include_embedding", False)
+        )
+        return {"path": path}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Khmer News Classifier background task worker")
+    parser.add_argument("--db", default=Config.JOBS_DB_PATH, help="SQLite job queue path")
+    parser.add_argument("--lease", type=float, default=120.0, help="Job lease duration in seconds")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between polls when idle")
+    parser.add_argument("--worker-id", default=None, help="Worker identifier (default: host:pid)")
+    parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    worker = TaskWorker(JobQueue(args.db), worker_id=args.worker_id, lease_seconds=args.lease,
+                        poll_interval=args.poll_interval)
+
+    # supervisord stops the program with SIGTERM: finish the current job, then exit
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+
+    if args.once:
+        while worker.run_once():
+            pass
+    else:
+        worker.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Classification
+====================
+Loads document collections from uploaded archives and classifies them on a
+background thread so the Streamlit script thread never blocks.
+
+Supported inputs:
+- CSV file with a text column (plus an optional id / category column)
+- ZIP archive of ``.txt`` and/or ``.pdf`` files
+- ZIP archive with a ``metadata.csv`` manifest (``docId``, ``category``) and
+  one ``{docId}.txt``/``{docId}.pdf`` file per row, as produced by the data
+  preprocessing notebook; the manifest categories are used to report a
+  running accuracy
+
+The worker thread never touches ``st.*``: the UI polls ``BatchJob.progress()``
+and pulls finished results with ``BatchJob.drain_new_results()``.
+"""
+
+import io
+import os
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+TEXT_COLUMN_CANDIDATES = ["text", "content", "article", "body", "input_text"]
+ID_COLUMN_CANDIDATES = ["docId", "doc_id", "id", "index"]
+MANIFEST_NAME = "metadata.csv"
+
+
+@dataclass
+class BatchDocument:
+    """A document waiting to be classified"""
+    doc_id: str
+    kind: str  # "text" or "pdf"
+    payload: Any  # str for text documents, bytes for PDFs
+    expected_category: Optional[str] = None
+
+
+def guess_text_column(columns: List[str]) -> Optional[str]:
+    """Pick the most likely text column of a CSV"""
+    lowered = {c.lower(): c for c in columns}
+    for candidate in TEXT_COLUMN_CANDIDATES:
+        if candidate.lower() in lowered:
+            return lowered[candidate.lower()]
+    return None
+
+
+def _first_present(columns, candidates) -> Optional[str]:
+    for candidate in candidates:
+        if candidate in columns:
+            return candidate
+    return None
+
+
+def load_documents_from_csv(csv_file, text_column: Optional[str] = None) -> List[BatchDocument]:
+    """Read documents from a CSV file with one article per row"""
+    df = pd.read_csv(csv_file)
+    text_column = text_column or guess_text_column(list(df.columns))
+    if text_column is None or text_column not in df.columns:
+        raise ValueError(f"CSV must contain a text column (one of: {', '.join(TEXT_COLUMN_CANDIDATES)})")
+
+    id_column = _first_present(df.columns, ID_COLUMN_CANDIDATES)
+    category_column = "category" if "category" in df.columns else None
+
+    documents = []
+    for i, row in enumerate(df.to_dict("records")):
+        text = row.get(text_column)
+        if not isinstance(text, str) or not text.strip():
+            continue
+        doc_id = str(row[id_column]) if id_column else f"row{i + 1}"
+        expected = row.get(category_column) if category_column else None
+        documents.append(BatchDocument(doc_id, "text", text, expected if isinstance(expected, str) else None))
+    return documents
+
+
+def load_documents_from_zip(zip_file) -> List[BatchDocument]:
+    """Read .txt/.pdf documents from a ZIP archive, honouring a metadata.csv manifest if present"""
+    documents = []
+    with zipfile.ZipFile(zip_file) as archive:
+        members = {
+            os.path.basename(name): name for name in archive.namelist()
+            if not name.endswith("/") and not os.path.basename(name).startswith(".")
+        }
+
+        if MANIFEST_NAME in members:
+            manifest = pd.read_csv(io.BytesIO(archive.read(members[MANIFEST_NAME])))
+            if "docId" not in manifest.columns:
+                raise ValueError(f"{MANIFEST_NAME} manifest must contain a docId column")
+            for _, row in manifest.iterrows():
+                doc_id = str(row["docId"])
+                expected = row["category"] if "category" in manifest.columns else None
+                for extension, kind in ((".txt", "text"), (".pdf", "pdf")):
+                    name = members.get(doc_id + extension)
+                    if name:
+                        documents.append(_zip_document(archive, name, doc_id, kind, expected))
+                        break
+            return documents
+
+        for basename, name in sorted(members.items()):
+            stem, extension = os.path.splitext(basename)
+            if extension.lower() == ".txt":
+                documents.append(_zip_document(archive, name, stem, "text"))
+            elif extension.lower() == ".pdf":
+                documents.append(_zip_document(archive, name, stem, "pdf"))
+    return documents
+
+
+def _zip_document(archive, name, doc_id, kind, expected=None) -> BatchDocument:
+    data = archive.read(name)
+    payload = data.decode("utf-8", errors="replace") if kind == "text" else data
+    return BatchDocument(doc_id, kind, payload, expected if isinstance(expected, str) else None)
+
+
+class BatchJob:
+    """Classify a list of documents in batches on a daemon thread"""
+
+    def __init__(self, documents: List[BatchDocument], classify_batch: Callable[[List[str]], List[Any]],
+                 pdf_to_text: Optional[Callable[[bytes], Optional[str]]] = None, batch_size: int = 16):
+        self.documents = documents
+        self.classify_batch = classify_batch
+        self.pdf_to_text = pdf_to_text
+        self.batch_size = max(1, batch_size)
+
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._results: List[Any] = []
+        self._drained = 0
+        self._processed = 0
+        self._failed: List[Dict[str, str]] = []
+        self._correct = 0
+        self._labelled = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def start(self) -> "BatchJob":
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="batch-classification", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Request cancellation; the worker stops after the current batch"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _document_text(self, document: BatchDocument) -> Optional[str]:
+        if document.kind == "pdf":
+            if self.pdf_to_text is None:
+                raise ValueError("PDF documents are not supported by this job")
+            return self.pdf_to_text(document.payload)
+        return document.payload
+
+    def _run(self):
+        try:
+            for start in range(0, len(self.documents), self.batch_size):
+                if self._cancel.is_set():
+                    break
+                batch = self.documents[start:start + self.batch_size]
+
+                texts, kept = [], []
+                for document in batch:
+                    try:
+                        text = self._document_text(document)
+                    except Exception as e:
+                        self._record_failure(document, f"Text extraction failed: {e}")
+                        continue
+                    if not text or not text.strip():
+                        self._record_failure(document, "No text found")
+                        continue
+                    texts.append(text)
+                    kept.append(document)
+
+                if not texts:
+                    continue
+                try:
+                    results = self.classify_batch(texts)
+                except Exception as e:
+                    for document in kept:
+                        self._record_failure(document, f"Classification failed: {e}")
+                    continue
+
+                with self._lock:
+                    for document, result in zip(kept, results):
+                        self._results.append(result)
+                        if document.expected_category:
+                            self._labelled += 1
+                            self._correct += int(result.prediction == document.expected_category)
+                    self._processed += len(kept)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+
+    def _record_failure(self, document: BatchDocument, reason: str):
+        with self._lock:
+            self._failed.append({"doc_id": document.doc_id, "reason": reason})
+            self._processed += 1
+
+    def drain_new_results(self) -> List[Any]:
+        """Results finished since the previous call (to be added to the session history)"""
+        with self._lock:
+            new_results = self._results[self._drained:]
+            self._drained = len(self._results)
+        return new_results
+
+    def completed_results(self) -> List[Any]:
+        with self._lock:
+            return list(self._results)
+
+    def failures(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._failed)
+
+    def progress(self) -> Dict[str, Any]:
+        """Snapshot of the job state for progress display"""
+        with self._lock:
+            processed = self._processed
+            succeeded = len(self._results)
+            failed = len(self._failed)
+            correct, labelled = self._correct, self._labelled
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        total = len(self.documents)
+        return {
+            "total": total,
+            "processed": processed,
+            "succeeded": succeeded,
+            "failed": failed,
+            "fraction": processed / total if total else 1.0,
+            "elapsed": elapsed,
+            "docs_per_sec": succeeded / elapsed if elapsed > 0 else 0.0,
+            "accuracy": correct / labelled if labelled else None,
+            "running": self.running,
+            "cancelled": self.cancelled,
+            "error": self.error,
+        }
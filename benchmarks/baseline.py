@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Baselines
+===================
+JSON baselines shared by the benchmark suites in this folder. A result
+file holds flat ``metric name -> value`` maps plus the environment they
+were measured in; ``compare`` checks a new run against the stored
+baseline and reports every metric that regressed past its threshold.
+
+Each metric has a direction, taken from its name:
+
+- higher is better: ``accuracy``, ``macro_f1``, ``*_per_second``
+- everything else (latencies, ``*_ms``, ``*_mb``) is lower-is-better
+
+Quality metrics (accuracy, F1) use an absolute tolerance, cost metrics a
+relative one, since timings are noisy and scale with the machine.
+"""
+
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+QUALITY_METRICS = ("accuracy", "macro_f1")
+
+
+def higher_is_better(name: str) -> bool:
+    return name.endswith(QUALITY_METRICS) or name.endswith("_per_second")
+
+
+def environment() -> Dict[str, str]:
+    """Where the numbers were measured (compare like with like)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(BASELINE_DIR), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def save(path: str, metrics: Dict[str, float]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "metrics": metrics}, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Optional[Dict[str, float]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["metrics"]
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float = 0.10,
+            quality_tolerance: float = 0.005) -> List[Tuple[str, float, float, str]]:
+    """(metric, baseline, current, status) for the metrics of both runs; status is ok, better or REGRESSED"""
+    rows = []
+    for name in sorted(set(current) & set(baseline)):
+        old, new = baseline[name], current[name]
+        if name.endswith(QUALITY_METRICS):
+            regressed, improved = new < old - quality_tolerance, new > old + quality_tolerance
+        elif higher_is_better(name):
+            regressed, improved = new < old * (1 - threshold), new > old * (1 + threshold)
+        else:
+            regressed, improved = new > old * (1 + threshold), new < old * (1 - threshold)
+        rows.append((name, old, new, "REGRESSED" if regressed else "better" if improved else "ok"))
+    return rows
+
+
+def print_comparison(rows: List[Tuple[str, float, float, str]]) -> int:
+    """Print the comparison table; returns the number of regressions"""
+    width = max([40] + [len(name) for name, _, _, _ in rows])
+    print(f"\n{'metric':<{width}} {'baseline':>12} {'current':>12}  status")
+    for name, old, new, status in rows:
+        change = f"{(new - old) / old:+.1%}" if old else ""
+        print(f"{name:<{width}} {old:>12.4g} {new:>12.4g}  {status} {change}")
+    regressions = sum(status == "REGRESSED" for _, _, _, status in rows)
+    print(f"\n{'❌' if regressions else '✅'} {regressions} regression(s) against the baseline")
+    return regressions
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedding Bundle Benchmark
+==========================
+Compares the quantized embedding bundles (float16 / int8 / product
+quantization) with float32 on memory footprint, load time and accuracy:
+
+- size: bytes of the stored word + n-gram matrices
+- load: time to open the bundle (arrays are memory-mapped)
+- accuracy on X_test_fasttext / y_test_fasttext: the test feature rows are
+  passed through each quantizer before the SVM, which isolates the
+  classifier's sensitivity to the quantization error
+- end-to-end accuracy on the raw test split articles embedded with each
+  bundle (when the articles are available)
+
+Usage:
+    python benchmarks/bench_embedding_bundle.py --model cc.km.300.bin [--bundle-dir bundles]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from fixtures import REPO_ROOT, load_test_split
+from classifier_core import ClassificationEngine, Config
+import feature_store
+from embedding_bundle import PRECISIONS, EmbeddingBundle, is_bundle, quantize
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark quantized embedding bundles")
+    parser.add_argument("--model", default=Config.FASTTEXT_MODEL_PATH, help="FastText .bin model to export")
+    parser.add_argument("--bundle-dir", default=os.path.join(REPO_ROOT, "bundles"))
+    parser.add_argument("--precisions", nargs="+", default=list(PRECISIONS), choices=PRECISIONS)
+    parser.add_argument("--pq-subspaces", type=int, default=50)
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--limit", type=int, default=600, help="Test-split articles embedded per bundle")
+    args = parser.parse_args(argv)
+
+    svm_model = joblib.load(Config.SVM_MODEL_PATH) if os.path.exists(Config.SVM_MODEL_PATH) else None
+    X_test = y_test = None
+    if feature_store.exists(Config.X_TEST_PATH) and feature_store.exists(Config.Y_TEST_PATH):
+        X_test = np.asarray(feature_store.load(Config.X_TEST_PATH), dtype=np.float32)
+        y_test = np.asarray(feature_store.load(Config.Y_TEST_PATH))
+    else:
+        print(f"⚠️ {Config.X_TEST_PATH} / {Config.Y_TEST_PATH} not found: the X_test column is skipped")
+    if svm_model is None:
+        print(f"⚠️ {Config.SVM_MODEL_PATH} not found: accuracy columns are skipped")
+
+    model = None
+    test_docs = load_test_split(args.metadata, args.texts)[:args.limit]
+    print(f"{'precision':<10} {'size MB':>10} {'load s':>8} {'X_test acc':>11} {'end-to-end acc':>15}")
+    for precision in args.precisions:
+        path = os.path.join(args.bundle_dir, f"bundle.{precision}")
+        if not is_bundle(path):
+            if model is None:
+                from gensim.models.fasttext import load_facebook_model
+                print(f"📦 Loading {args.model} to export bundles...")
+                model = load_facebook_model(args.model)
+            EmbeddingBundle.from_gensim(model, precision, pq_subspaces=args.pq_subspaces).save(path)
+
+        start = time.perf_counter()
+        bundle = EmbeddingBundle.load(path)
+        load_time = time.perf_counter() - start
+
+        feature_accuracy = end_to_end = None
+        if svm_model is not None:
+            if X_test is not None:
+                quantized = quantize(X_test, precision, pq_subspaces=args.pq_subspaces)
+                X_quantized = quantized.rows(np.arange(len(X_test)))
+                feature_accuracy = float(np.mean(svm_model.predict(X_quantized) == y_test))
+            if test_docs:
+                engine = ClassificationEngine(svm_model, bundle)
+                results = engine.classify_batch([text for _, _, text in test_docs])
+                end_to_end = float(np.mean([r.prediction == c for r, (_, c, _) in zip(results, test_docs)]))
+
+        def fmt(value):
+            return f"{value:.4f}" if value is not None else "-"
+        print(f"{precision:<10} {bundle.nbytes / 1e6:>10,.1f} {load_time:>8.2f} "
+              f"{fmt(feature_accuracy):>11} {fmt(end_to_end):>15}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
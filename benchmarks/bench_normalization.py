@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalization Benchmark
+=======================
+Verifies that the table-driven ``text_normalization`` functions produce
+exactly the output of the original per-character implementation (on the
+corpus plus randomized Unicode input) and reports the per-document cost of
+``normalize_khmer_text``, ``clean_khmer_text`` and token normalization.
+
+Usage:
+    python benchmarks/bench_normalization.py [--texts raw_articles] [--limit 500]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+from fixtures import REPO_ROOT, khmer_sample_text, load_corpus
+from classifier_core import Config, TextProcessor
+import text_normalization
+
+
+def legacy_normalize_khmer_text(text):
+    if not text:
+        return ""
+    normalized = unicodedata.normalize('NFC', text)
+    return ''.join(char for char in normalized if not unicodedata.category(char).startswith('C'))
+
+
+def legacy_clean_khmer_text(text):
+    if not text:
+        return ""
+    text = legacy_normalize_khmer_text(text)
+    chars_to_remove = (Config.KHSYM | Config.KHNUMBER | Config.ARABIC_NUMBER |
+                       Config.LATIN_CHARS | Config.PUNCTUATION)
+    text = text.translate(str.maketrans('', '', ''.join(chars_to_remove)))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def legacy_normalize_word(word):
+    if not word:
+        return ""
+    word = unicodedata.normalize('NFC', word).strip()
+    return ''.join(char for char in word if not unicodedata.category(char).startswith('C'))
+
+
+def random_unicode_text(rng, length):
+    """Mix of Khmer, combining marks, controls, format chars, astral and decomposed Latin"""
+    pools = [
+        (0x1780, 0x17FF), (0x0000, 0x007F), (0x0300, 0x036F), (0x200B, 0x200F),
+        (0x00C0, 0x00FF), (0x1F600, 0x1F64F), (0xE000, 0xE010), (0xE0000, 0xE007F),
+    ]
+    chars = []
+    for _ in range(length):
+        low, high = rng.choice(pools)
+        chars.append(chr(rng.randint(low, high)))
+    return ''.join(chars)
+
+
+def check_equivalence(texts):
+    for text in texts:
+        assert text_normalization.normalize_text(text) == legacy_normalize_khmer_text(text), text
+        assert TextProcessor.clean_khmer_text(text) == legacy_clean_khmer_text(text), text
+        tokens = text.split(' ') + [' ' + text[:5], '', '​', text_normalization._TOKEN_SEPARATOR]
+        assert TextProcessor.normalize_words(tokens) == [legacy_normalize_word(t) for t in tokens], text
+        assert TextProcessor.normalize_words(tokens[:-1]) == [legacy_normalize_word(t) for t in tokens[:-1]], text
+
+
+def per_document_ms(func, documents):
+    start = time.perf_counter()
+    for document in documents:
+        func(document)
+    return (time.perf_counter() - start) * 1000 / len(documents)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark table-driven normalization")
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    corpus = [text for _, _, text in load_corpus(args.metadata, args.texts, args.limit)]
+    if corpus:
+        print(f"📚 Using {len(corpus)} archive articles from {args.texts}")
+    else:
+        corpus = [khmer_sample_text(4000, seed=i) for i in range(args.limit)]
+        print(f"📚 Archive not found, using {len(corpus)} synthetic 4 KB articles")
+
+    rng = random.Random(0)
+    check_equivalence(corpus[:50] + [random_unicode_text(rng, 300) for _ in range(200)])
+    print("✅ Output identical to the per-character implementation")
+
+    token_lists = [text.split() for text in corpus]
+    rows = [
+        ("normalize_khmer_text", legacy_normalize_khmer_text, text_normalization.normalize_text, corpus),
+        ("clean_khmer_text", legacy_clean_khmer_text, TextProcessor.clean_khmer_text, corpus),
+        ("normalize tokens", lambda tokens: [legacy_normalize_word(t) for t in tokens],
+         TextProcessor.normalize_words, token_lists),
+    ]
+    print(f"{'stage':<22} {'legacy ms/doc':>14} {'table ms/doc':>13} {'speedup':>8}")
+    for name, legacy, table_driven, documents in rows:
+        legacy_ms = per_document_ms(legacy, documents)
+        table_ms = per_document_ms(table_driven, documents)
+        print(f"{name:<22} {legacy_ms:>14.3f} {table_ms:>13.3f} {legacy_ms / table_ms:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruned Bundle Fidelity Report
+=============================
+Compares a corpus-pruned embedding bundle (``embedding_bundle.py prune``)
+with the full ``cc.km.300.bin`` model:
+
+- load time and size of the bundle against the full model load
+- token coverage: share of corpus tokens found in the kept vocabulary, and
+  share composed from n-grams
+- cosine similarity between the document vectors of both models (mean of
+  the token vectors of each preprocessed article), overall and for the
+  held-out test split articles
+- largest difference between the bundle's batched document vectors and a
+  word-by-word reference that skips OOV words whose n-gram buckets were
+  all pruned (they have no vector, and must not count as zeros)
+
+Usage:
+    python benchmarks/bench_pruned_bundle.py --bundle bundles/news.float16 [--top-n 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from fixtures import REPO_ROOT, load_corpus, load_test_split
+from classifier_core import Config
+from embedding_bundle import PRECISIONS, EmbeddingBundle, count_corpus_tokens, is_bundle
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 1.0
+
+
+def reference_mean(bundle: EmbeddingBundle, tokens) -> np.ndarray:
+    """Word-by-word document vector: in-vocabulary rows and composed OOV words, skipping the rest"""
+    vectors = []
+    for token in tokens:
+        if token in bundle.key_to_index or len(bundle.ngram_rows(token)):
+            vectors.append(bundle.get_word_vector(token))
+    return np.mean(vectors, axis=0) if vectors else np.zeros(bundle.vector_size, dtype=np.float32)
+
+
+def report(label: str, similarities):
+    if not similarities:
+        print(f"{label:<12} no documents")
+        return
+    values = np.asarray(similarities)
+    print(f"{label:<12} docs={len(values):>6,}  mean={values.mean():.5f}  p1={np.percentile(values, 1):.5f}  "
+          f"p5={np.percentile(values, 5):.5f}  min={values.min():.5f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fidelity of a pruned embedding bundle")
+    parser.add_argument("--model", default=Config.FASTTEXT_MODEL_PATH)
+    parser.add_argument("--bundle", default=os.path.join(REPO_ROOT, "bundles", "news.float16"))
+    parser.add_argument("--corpus", default=os.path.join(REPO_ROOT, "preprocessed_articles"))
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--top-n", type=int, default=100000, help="Used when the bundle has to be built")
+    parser.add_argument("--precision", choices=PRECISIONS, default="float16")
+    parser.add_argument("--limit", type=int, default=None, help="Articles compared (default: all)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.corpus):
+        print(f"⚠️ {args.corpus} not found: nothing to compare")
+        return 0
+
+    from gensim.models.fasttext import load_facebook_model
+
+    start = time.perf_counter()
+    model = load_facebook_model(args.model)
+    model_load = time.perf_counter() - start
+
+    if not is_bundle(args.bundle):
+        print(f"📦 Building {args.bundle} (top {args.top_n:,} words)...")
+        token_counts = count_corpus_tokens(args.corpus, args.metadata)
+        EmbeddingBundle.pruned_from_gensim(model, token_counts, args.top_n, args.precision).save(args.bundle)
+
+    start = time.perf_counter()
+    bundle = EmbeddingBundle.load(args.bundle)
+    bundle_load = time.perf_counter() - start
+    buckets = len(bundle.bucket_ids) if bundle.bucket_ids is not None else bundle.bucket
+    print(f"Full model: {model_load:.2f}s load")
+    print(f"Bundle:     {bundle_load:.3f}s load, {bundle.nbytes / 1e6:,.1f} MB, "
+          f"{len(bundle.words):,} words, {buckets:,} of {bundle.bucket:,} buckets")
+
+    docs = load_corpus(args.metadata, args.corpus, limit=args.limit)
+    test_ids = {doc_id for doc_id, _, _ in load_test_split(args.metadata, args.corpus)}
+    in_vocab = total = 0
+    all_similarities, test_similarities = [], []
+    max_reference_diff = 0.0
+    for doc_id, _, text in docs:
+        tokens = text.split()
+        if not tokens:
+            continue
+        in_vocab += sum(token in bundle.key_to_index for token in tokens)
+        total += len(tokens)
+        full = np.mean([model.wv[token] for token in tokens], axis=0)
+        document_vector = bundle.mean_vector(tokens)
+        max_reference_diff = max(max_reference_diff,
+                                 float(np.abs(document_vector - reference_mean(bundle, tokens)).max()))
+        similarity = cosine(document_vector, full)
+        all_similarities.append(similarity)
+        if doc_id in test_ids:
+            test_similarities.append(similarity)
+
+    if total:
+        print(f"Tokens:     {total:,}, {in_vocab / total:.2%} in the kept vocabulary, "
+              f"{1 - in_vocab / total:.2%} composed from n-grams")
+    report("all", all_similarities)
+    report("test split", test_similarities)
+    print(f"Batched vs word-by-word document vectors: max |diff| {max_reference_diff:.2e}")
+    return 1 if max_reference_diff > 1e-4 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Segmentation Pool Benchmark
+===========================
+Segments the same batch of articles with ``SegmentationPool`` at 1, 2, 4
+and 8 worker processes, checks that every run returns the in-process
+``TextProcessor.segment_khmer_text`` output, and reports the speedup.
+
+Usage:
+    python benchmarks/bench_segmentation_pool.py [--segmenter khmernltk|trie] [--lexicon PATH]
+        [--documents 200] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from fixtures import REPO_ROOT, khmer_sample_text, load_corpus
+from classifier_core import Config, TextProcessor
+from segmentation_pool import SegmentationPool
+from segmenters import split_sentences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the multi-process segmentation pool")
+    parser.add_argument("--segmenter", default=Config.SEGMENTER)
+    parser.add_argument("--lexicon", default=Config.SEGMENTER_LEXICON_PATH)
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    Config.SEGMENTER, Config.SEGMENTER_LEXICON_PATH = args.segmenter, args.lexicon
+    corpus = [text for _, _, text in load_corpus(args.metadata, args.texts, args.documents)]
+    texts = corpus or [khmer_sample_text(4000, seed=i) for i in range(args.documents)]
+    # As ClassificationEngine: sentence boundaries of the raw text survive cleaning
+    cleaned = [TextProcessor.clean_khmer_sentences(text) for text in texts]
+    print(f"📚 {len(cleaned)} {'archive' if corpus else 'synthetic'} articles, "
+          f"{sum(map(len, cleaned)):,} characters, "
+          f"{sum(len(split_sentences(text)) for text in cleaned):,} sentences, segmenter={args.segmenter}")
+
+    start = time.perf_counter()
+    expected = [TextProcessor.segment_khmer_text(text) for text in cleaned]
+    baseline = time.perf_counter() - start
+    print(f"{'in-process':>12}: {baseline:8.2f}s")
+
+    for workers in args.workers:
+        pool = SegmentationPool(workers, args.segmenter, args.lexicon)
+        try:
+            pool.warm_up()
+            start = time.perf_counter()
+            segmented = pool.segment_documents(cleaned)
+            elapsed = time.perf_counter() - start
+        finally:
+            pool.shutdown()
+        mismatches = sum(a != b for a, b in zip(segmented, expected))
+        status = "✅" if not mismatches else f"❌ {mismatches} documents differ"
+        print(f"{workers:>3} workers: {elapsed:8.2f}s  speedup {baseline / elapsed:5.2f}x  "
+              f"chunk {pool.chunk_size_chars(sum(map(len, cleaned))):,} chars  {status}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Segmenter Benchmark
+===================
+Compares the trie/Viterbi segmenter with the khmer-nltk CRF tokenizer:
+
+- agreement: word-boundary precision / recall / F1 and the share of
+  sentences segmented identically, on a sample of archive articles
+- throughput: tokens/sec of each backend on the same sentences
+- accuracy: end-to-end classification accuracy of ``ClassificationEngine``
+  on the held-out test split with each backend (needs the models)
+
+Usage:
+    python benchmarks/bench_segmenters.py --lexicon Demo_model/segmenter_lexicon.tsv \\
+        [--texts raw_articles] [--sample 300] [--accuracy-limit 600]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from fixtures import REPO_ROOT, khmer_sample_text, load_corpus, load_test_split
+import classifier_core
+from classifier_core import Config, TextProcessor
+from segmenters import KhmerNLTKSegmenter, TrieSegmenter
+
+SENTENCE_DELIMITERS = ['។', '.', '!', '?', '\n']
+
+
+def split_sentences(text):
+    """Sentences as produced inside TextProcessor.segment_khmer_text"""
+    sentences, current = [], []
+    for char in text:
+        current.append(char)
+        if char in SENTENCE_DELIMITERS:
+            sentence = ''.join(current).strip()
+            if sentence:
+                sentences.append(sentence)
+            current = []
+    sentence = ''.join(current).strip()
+    if sentence:
+        sentences.append(sentence)
+    return sentences
+
+
+def boundaries(tokens):
+    """Character offsets of the token ends, ignoring whitespace"""
+    offsets, position = set(), 0
+    for token in tokens:
+        token = ''.join(token.split())
+        if token:
+            position += len(token)
+            offsets.add(position)
+    return offsets
+
+
+def timed_tokenize(segmenter, sentences):
+    start = time.perf_counter()
+    tokenized = [segmenter.tokenize(sentence) for sentence in sentences]
+    elapsed = time.perf_counter() - start
+    token_count = sum(len(tokens) for tokens in tokenized)
+    return tokenized, token_count / elapsed if elapsed > 0 else 0.0
+
+
+def agreement_report(reference, candidate):
+    true_positive = predicted = expected = identical = 0
+    for ref_tokens, cand_tokens in zip(reference, candidate):
+        ref_bounds, cand_bounds = boundaries(ref_tokens), boundaries(cand_tokens)
+        true_positive += len(ref_bounds & cand_bounds)
+        predicted += len(cand_bounds)
+        expected += len(ref_bounds)
+        identical += ref_bounds == cand_bounds
+    precision = true_positive / predicted if predicted else 0.0
+    recall = true_positive / expected if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1, identical / len(reference) if reference else 0.0
+
+
+def classification_accuracy(engine, documents, segmenter_name):
+    """Accuracy of the full pipeline with the given segmenter backend"""
+    Config.SEGMENTER = segmenter_name
+    start = time.perf_counter()
+    correct = 0
+    for _, category, text in documents:
+        correct += engine.classify_text(text).prediction == category
+    return correct / len(documents), len(documents) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the trie segmenter with khmer-nltk")
+    parser.add_argument("--lexicon", default=Config.SEGMENTER_LEXICON_PATH)
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--sample", type=int, default=300, help="Articles used for agreement/throughput")
+    parser.add_argument("--accuracy-limit", type=int, default=600,
+                        help="Test-split articles classified per backend (0 to skip)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.lexicon):
+        print(f"❌ Lexicon not found: {args.lexicon} (run: python segmenters.py build-lexicon ...)")
+        return 1
+    trie = TrieSegmenter.from_file(args.lexicon)
+    print(f"🌲 Trie: {trie.vocabulary_size:,} words, {trie.node_count:,} nodes")
+
+    corpus = load_corpus(args.metadata, args.texts, args.sample)
+    texts = [text for _, _, text in corpus] or [khmer_sample_text(4000, seed=i) for i in range(args.sample)]
+    sentences = [s for text in texts for s in split_sentences(TextProcessor.clean_khmer_text(text))]
+    print(f"📚 {len(texts)} articles, {len(sentences):,} sentences"
+          f"{'' if corpus else ' (synthetic, archive not found)'}")
+
+    trie_tokens, trie_rate = timed_tokenize(trie, sentences)
+    print(f"⚡ trie: {trie_rate:,.0f} tokens/sec")
+
+    try:
+        crf = KhmerNLTKSegmenter()
+    except ImportError:
+        print("⚠️ khmer-nltk is not installed: skipping agreement and accuracy comparison")
+        return 0
+    crf_tokens, crf_rate = timed_tokenize(crf, sentences)
+    print(f"⚡ khmernltk: {crf_rate:,.0f} tokens/sec (trie is {trie_rate / crf_rate:.1f}x faster)")
+
+    precision, recall, f1, identical = agreement_report(crf_tokens, trie_tokens)
+    print(f"🤝 Boundary agreement vs khmernltk: P={precision:.3f} R={recall:.3f} F1={f1:.3f}, "
+          f"identical sentences {identical:.1%}")
+
+    if args.accuracy_limit:
+        test_docs = load_test_split(args.metadata, args.texts)[:args.accuracy_limit]
+        if not test_docs:
+            print("⚠️ Test split articles not found: skipping accuracy")
+            return 0
+        engine = classifier_core.create_classification_engine()
+        Config.SEGMENTER_LEXICON_PATH = args.lexicon
+        for name in ("khmernltk", "trie"):
+            accuracy, docs_per_sec = classification_accuracy(engine, test_docs, name)
+            print(f"🎯 {name:<10} accuracy {accuracy:.4f} on {len(test_docs)} test articles "
+                  f"({docs_per_sec:.1f} docs/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
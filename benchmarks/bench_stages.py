@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline Stage Micro-benchmarks
+===============================
+Per-call timings of the hot functions of the classification pipeline on
+fixed inputs of several sizes, with a stored baseline and a complexity
+check:
+
+- ``normalize_khmer_text``, ``clean_khmer_text``, ``segment_khmer_text``,
+  ``get_text_statistics`` and ``format_extracted_text`` on synthetic Khmer
+  text and, when ``raw_articles`` is available, on concatenated real
+  articles, at each ``--sizes`` (UTF-8 bytes)
+- ``get_sentence_embedding`` (mean and weighted) on segmented text of the
+  same sizes, with the configured FastText model or bundle, or a small
+  deterministic FastText model trained on synthetic words when no model
+  is available
+- ``_calculate_confidence_scores`` on a 300-d embedding (fixed size), and
+  the batched confidence path at several row counts
+
+Each case is timed with ``timeit`` (auto-ranged, median of ``--repeat``).
+The complexity check fits the log-log slope of time against input size by
+least squares over every size from ``--min-complexity-size`` up, per
+function and fixture: about 1 for linear code, about 2 for an accidental
+O(n²). The fitted sizes must span at least ``--min-size-ratio``, so timing
+noise between two close sizes cannot fake a superlinear slope. Slopes
+above ``--max-exponent`` fail the run, as do timings that regress past
+``--threshold`` against the baseline.
+
+Usage:
+    python benchmarks/bench_stages.py --save-baseline     # record benchmarks/baselines/stages.json
+    python benchmarks/bench_stages.py [--threshold 0.25]  # compare; exit code 1 on regression
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import baseline
+from fixtures import REPO_ROOT, khmer_sample_text, load_corpus
+from classifier_core import (AnalyticsEngine, ClassificationEngine, Config, TextProcessor,
+                             format_extracted_text, load_embedding_model)
+from segmenters import get_segmenter
+
+BASELINE_PATH = os.path.join(baseline.BASELINE_DIR, "stages.json")
+KHMER_CONSONANTS = [chr(code) for code in range(0x1780, 0x17A3)]
+KHMER_VOWELS = [chr(code) for code in range(0x17B6, 0x17C6)]
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Median per-call time in milliseconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return float(np.median(timer.repeat(repeat=repeat, number=number))) / number * 1000
+
+
+def real_text(articles: List[str], size_bytes: int) -> str:
+    """Real articles concatenated and cut to roughly size_bytes"""
+    parts, total = [], 0
+    for article in articles:
+        parts.append(article)
+        total += len(article.encode("utf-8"))
+        if total >= size_bytes:
+            break
+    text = "\n".join(parts)
+    return text.encode("utf-8")[:size_bytes].decode("utf-8", errors="ignore")
+
+
+def synthetic_words(count: int, seed: int = 0) -> List[str]:
+    """Deterministic Khmer-looking words (consonant + vowel syllables)"""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice(KHMER_CONSONANTS) + rng.choice(KHMER_VOWELS)
+                          for _ in range(rng.randint(1, 3))) for _ in range(2000)]
+    return [rng.choice(vocabulary) for _ in range(count)]
+
+
+def embedding_engines(model_path: str, bundle_path: str) -> Tuple[Dict[str, ClassificationEngine], str]:
+    """Engines for the mean and weighted embedding methods (and where their model came from)"""
+    if bundle_path or os.path.exists(model_path):
+        model = load_embedding_model({"embedding_bundle": bundle_path, "model_path": model_path})
+        source = bundle_path or model_path
+    else:
+        from gensim.models import FastText
+
+        words = synthetic_words(200000)
+        sentences = [words[i:i + 50] for i in range(0, len(words), 50)]
+        model = FastText(sentences, vector_size=300, min_count=1, bucket=50000, epochs=1, workers=1, seed=0)
+        source = "synthetic FastText model"
+    engines = {method: ClassificationEngine(None, model, embedding_method=method, vector_cache_dir="")
+               for method in ("mean", "weighted")}
+    return engines, source
+
+
+def confidence_engine() -> ClassificationEngine:
+    """Engine with a LinearSVC fitted on random 300-d vectors of the six categories"""
+    from sklearn.svm import LinearSVC
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 300))
+    y = [Config.CATEGORIES[i % len(Config.CATEGORIES)] for i in range(len(X))]
+    return ClassificationEngine(LinearSVC(dual="auto").fit(X, y), None, vector_cache_dir="")
+
+
+def segmenter_available() -> bool:
+    try:
+        get_segmenter(Config.SEGMENTER, Config.SEGMENTER_LEXICON_PATH).tokenize("សួស្តី")
+        return True
+    except Exception as e:
+        print(f"⚠️ Segmenter {Config.SEGMENTER} unavailable ({e}); skipping segment_khmer_text")
+        return False
+
+
+def complexity_slope(sizes: List[int], timings: List[float], min_size: int,
+                     min_ratio: float = 10.0) -> Optional[float]:
+    """Least-squares exponent k of time ~ size^k over the sizes >= min_size
+
+    Per-call overhead flattens the curve at small sizes, so they are left
+    out. None when the remaining sizes span less than min_ratio: between
+    close sizes, timing noise alone moves the slope by several tenths.
+    """
+    points = [(size, timing) for size, timing in zip(sizes, timings) if size >= min_size]
+    if len(points) < 2 or points[-1][0] / points[0][0] < min_ratio:
+        return None
+    log_sizes, log_timings = np.log([size for size, _ in points]), np.log([timing for _, timing in points])
+    return float(np.polyfit(log_sizes, log_timings, 1)[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the pipeline stages")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 30000, 100000],
+                        help="Input sizes in UTF-8 bytes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--model", default=Config.FASTTEXT_MODEL_PATH)
+    parser.add_argument("--bundle", default="", help="Embedding bundle used instead of --model")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown per case")
+    parser.add_argument("--max-exponent", type=float, default=1.3,
+                        help="Largest allowed log-log slope of time against size")
+    parser.add_argument("--min-complexity-size", type=int, default=10000,
+                        help="Smallest input size (bytes) in the slope fit")
+    parser.add_argument("--min-size-ratio", type=float, default=10.0,
+                        help="Span (largest / smallest size) the slope fit needs")
+    args = parser.parse_args(argv)
+    sizes = sorted(args.sizes)
+
+    fixtures = {"synthetic": {size: khmer_sample_text(size, seed=size) for size in sizes}}
+    articles = [text for _, _, text in load_corpus(args.metadata, args.texts, limit=200)]
+    if articles:
+        fixtures["real"] = {size: real_text(articles, size) for size in sizes}
+
+    engines, model_source = embedding_engines(args.model, args.bundle)
+    print(f"📦 Embeddings from {model_source}")
+    text_functions: Dict[str, Callable[[str], object]] = {
+        "normalize_khmer_text": TextProcessor.normalize_khmer_text,
+        "clean_khmer_text": TextProcessor.clean_khmer_text,
+        "get_text_statistics": AnalyticsEngine.get_text_statistics,
+        "format_extracted_text": format_extracted_text,
+    }
+    # Segmentation gets cleaned text, as in the pipeline
+    prepare = {"segment_khmer_text": TextProcessor.clean_khmer_sentences}
+    if segmenter_available():
+        text_functions["segment_khmer_text"] = TextProcessor.segment_khmer_text
+
+    metrics: Dict[str, float] = {}
+    slopes: Dict[str, Optional[float]] = {}
+
+    def slope(sizes_or_rows: List[int], timings: List[float], min_size: int) -> Optional[float]:
+        return complexity_slope(sizes_or_rows, timings, min_size, args.min_size_ratio)
+
+    def run_case(name: str, fixture: str, size: int, func: Callable[[], object]) -> float:
+        milliseconds = time_call(func, args.repeat)
+        metrics[f"{name}.{fixture}.{size}_ms"] = milliseconds
+        print(f"{name:<32} {fixture:<10} {size:>9,} {milliseconds:>12.4f} ms")
+        return milliseconds
+
+    print(f"\n{'function':<32} {'fixture':<10} {'size':>9} {'per call':>15}")
+    for name, function in text_functions.items():
+        for fixture, texts in fixtures.items():
+            inputs = {size: prepare.get(name, str)(texts[size]) for size in sizes}
+            timings = [run_case(name, fixture, size, lambda text=inputs[size]: function(text)) for size in sizes]
+            slopes[f"{name}.{fixture}"] = slope(sizes, timings, args.min_complexity_size)
+
+    # Embeddings: segmented input of about the same byte sizes (about 9 bytes per word)
+    for method, engine in engines.items():
+        name = f"get_sentence_embedding[{method}]"
+        words = synthetic_words(max(sizes) // 9, seed=1)
+        timings = []
+        for size in sizes:
+            segmented = " ".join(words[:max(1, size // 9)])
+            timings.append(run_case(name, "synthetic", size, lambda text=segmented: engine.get_sentence_embedding(text)))
+        slopes[f"{name}.synthetic"] = slope(sizes, timings, args.min_complexity_size)
+
+    # Confidence: one embedding, then batches of rows
+    engine = confidence_engine()
+    embedding = np.random.default_rng(1).normal(size=(1, 300))
+    run_case("_calculate_confidence_scores", "synthetic", 1, lambda: engine._calculate_confidence_scores(embedding))
+    rows = [1, 10, 100, 1000]
+    batches = {count: np.random.default_rng(count).normal(size=(count, 300)) for count in rows}
+    timings = [run_case("_calculate_confidence_batch", "synthetic", count,
+                        lambda batch=batches[count]: engine._calculate_confidence_batch(batch)) for count in rows]
+    slopes["_calculate_confidence_batch.synthetic"] = slope(rows, timings, 10)
+
+    print(f"\n{'complexity (time ~ size^k)':<48} {'k':>6}")
+    superlinear = 0
+    for case, exponent in sorted(slopes.items()):
+        if exponent is None:
+            print(f"{case:<48} {'n/a':>6}  sizes from {args.min_complexity_size:,} span less than "
+                  f"{args.min_size_ratio:g}x")
+            continue
+        flagged = exponent > args.max_exponent
+        superlinear += flagged
+        print(f"{case:<48} {exponent:>6.2f}  {'SUPERLINEAR' if flagged else 'ok'}")
+
+    if args.save_baseline:
+        baseline.save(args.baseline, metrics)
+        print(f"\n✅ Baseline saved to {args.baseline}")
+        return 1 if superlinear else 0
+    stored = baseline.load(args.baseline)
+    regressions = 0
+    if stored is None:
+        print(f"\n⚠️ No baseline at {args.baseline}; run with --save-baseline first")
+    else:
+        regressions = baseline.print_comparison(baseline.compare(metrics, stored, args.threshold))
+    if superlinear:
+        print(f"❌ {superlinear} case(s) grow faster than size^{args.max_exponent}")
+    return 1 if regressions or superlinear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stopword Filter Benchmark
+=========================
+Measures what inference-time stopword removal does on the held-out test
+split: share of tokens removed, embedding latency with and without the
+filter, and the accuracy delta of the SVM (the last two need the models).
+
+Usage:
+    python benchmarks/bench_stopwords.py [--texts raw_articles] [--limit 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from fixtures import REPO_ROOT, khmer_sample_text, load_test_split
+from classifier_core import Config, TextProcessor, create_classification_engine
+from stopwords import get_stopword_filter
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark inference-time stopword removal")
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--stopwords", default=Config.STOPWORDS_PATH)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    stopword_filter = get_stopword_filter(args.stopwords)
+    documents = load_test_split(args.metadata, args.texts)[:args.limit]
+    if documents:
+        print(f"📚 {len(documents)} test-split articles")
+    else:
+        documents = [(f"synthetic{i}", None, khmer_sample_text(4000, seed=i)) for i in range(args.limit)]
+        print(f"📚 Test split not found, using {len(documents)} synthetic articles (no accuracy)")
+
+    start = time.perf_counter()
+    segmented = [TextProcessor.segment_khmer_text(TextProcessor.clean_khmer_text(text)) for _, _, text in documents]
+    print(f"✂️ Segmented in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    filtered = [stopword_filter.filter_text(text) for text in segmented]
+    filter_ms = (time.perf_counter() - start) * 1000 / len(documents)
+    total_tokens = sum(len(text.split()) for text in segmented)
+    kept_tokens = sum(len(text.split()) for text in filtered)
+    print(f"🧹 {len(stopword_filter):,} stopword forms: removed {total_tokens - kept_tokens:,} of "
+          f"{total_tokens:,} tokens ({(total_tokens - kept_tokens) / max(1, total_tokens):.1%}), "
+          f"filter cost {filter_ms:.3f} ms/doc")
+
+    try:
+        engine = create_classification_engine()
+    except Exception as e:
+        print(f"⚠️ Models not available ({e}): skipping latency and accuracy")
+        return 0
+
+    labels = [category for _, category, _ in documents]
+    rows = {}
+    for name, texts in (("all tokens", segmented), ("stopwords removed", filtered)):
+        engine.clear_cache()
+        start = time.perf_counter()
+        embeddings = np.vstack([engine.get_sentence_embedding(text) for text in texts])
+        embed_ms = (time.perf_counter() - start) * 1000 / len(texts)
+        accuracy = None
+        if all(labels):
+            accuracy = float(np.mean(engine.svm_model.predict(embeddings) == np.array(labels)))
+        rows[name] = (embed_ms, accuracy)
+        accuracy_text = f", accuracy {accuracy:.4f}" if accuracy is not None else ""
+        print(f"📐 {name:<18} embedding {embed_ms:.3f} ms/doc{accuracy_text}")
+
+    (base_ms, base_acc), (filtered_ms, filtered_acc) = rows["all tokens"], rows["stopwords removed"]
+    print(f"⏱️ Latency saved: {base_ms - filtered_ms - filter_ms:.3f} ms/doc (net of filtering)")
+    if base_acc is not None:
+        print(f"🎯 Accuracy delta: {filtered_acc - base_acc:+.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
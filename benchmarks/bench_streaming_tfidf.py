@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming TF-IDF Order Check
+============================
+Trains ``streaming_tfidf.py``'s models on a synthetic corpus whose
+``metadata.csv`` is sorted by category, as the real one is, once in the
+shuffled per-epoch order the script uses and once in file order. Reports
+accuracy, macro-F1 and the share of the most predicted category per model.
+Exits 1 when the shuffled SVM falls below ``--min-accuracy`` or predicts
+one category for more than ``--max-share`` of the test documents.
+
+Usage:
+    python benchmarks/bench_streaming_tfidf.py [--documents 3000] [--chunk-size 200] [--shuffle-blocks 4]
+        [--epochs 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+import fixtures  # noqa: F401  (puts the repository root on sys.path)
+from classifier_core import Config
+from streaming_tfidf import (build_hashing_vectorizer, build_models, document_frequencies, fit_idf,
+                             iter_chunks, train)
+
+# Khmer consonants, combined into synthetic three-letter words
+KHMER_LETTERS = [chr(code) for code in range(0x1780, 0x17A3)]
+
+
+def synthetic_words(count: int, rng: random.Random) -> List[str]:
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(KHMER_LETTERS) for _ in range(3)))
+    return sorted(words)
+
+
+def write_sorted_corpus(directory: str, documents: int, seed: int = 0) -> str:
+    """Articles of the six categories and a metadata.csv sorted by category; returns its path"""
+    rng = random.Random(seed)
+    words = synthetic_words(300 + 40 * len(Config.CATEGORIES), rng)
+    common, topical = words[:300], words[300:]
+    rows = []
+    for doc_id in range(documents):
+        category_index = doc_id % len(Config.CATEGORIES)
+        own = topical[40 * category_index:40 * (category_index + 1)]
+        tokens = rng.choices(common, k=80) + rng.choices(own, k=3)
+        rng.shuffle(tokens)
+        with open(os.path.join(directory, f"{doc_id}.txt"), "w", encoding="utf-8") as f:
+            f.write(" ".join(tokens))
+        rows.append((Config.CATEGORIES[category_index], doc_id))
+    metadata_path = os.path.join(directory, "metadata.csv")
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        f.write("docId,category\n")
+        for category, doc_id in sorted(rows):
+            f.write(f"{doc_id},{category}\n")
+    return metadata_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check streaming TF-IDF training on category-sorted metadata")
+    parser.add_argument("--documents", type=int, default=3000)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--shuffle-blocks", type=int, default=4,
+                        help="Blocks per shuffle buffer (well below the corpus, to check the bounded shuffle)")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--min-accuracy", type=float, default=0.8)
+    parser.add_argument("--max-share", type=float, default=0.3,
+                        help="Largest share of test documents given the same category")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        metadata_path = write_sorted_corpus(directory, args.documents)
+
+        def chunks(split: str, seed=None):
+            return iter_chunks(metadata_path, directory, split, 0.2, args.chunk_size, seed, args.shuffle_blocks)
+
+        vectorizer = build_hashing_vectorizer(args.n_features)
+        n_documents, df, class_counts = document_frequencies(vectorizer, chunks("train"))
+        transformer = fit_idf(df, n_documents, min_df=2)
+        classes = sorted(class_counts)
+        active_features = max(int(np.count_nonzero(transformer.idf_)), 1)
+        print(f"📦 {n_documents:,} training documents, metadata sorted by category")
+        test_texts, y_test = [], []
+        for texts, labels in chunks("test"):
+            test_texts.extend(texts)
+            y_test.extend(labels)
+        X_test = transformer.transform(vectorizer.transform(test_texts))
+
+        from sklearn.metrics import accuracy_score, f1_score
+
+        print(f"{'order':<10} {'model':<6} {'accuracy':>9} {'macro-F1':>9} {'top share':>10}")
+
+        failed = False
+        orders = {"shuffled": lambda epoch: chunks("train", 42 + epoch), "file": lambda epoch: chunks("train")}
+        for order, chunks_factory in orders.items():
+            models = build_models(active_features, args.n_features)
+            train(vectorizer, transformer, models, chunks_factory, classes, class_counts, args.epochs)
+            for name, model in models.items():
+                predictions = model.predict(X_test)
+                accuracy = accuracy_score(y_test, predictions)
+                share = Counter(predictions).most_common(1)[0][1] / len(predictions)
+                print(f"{order:<10} {name:<6} {accuracy:>9.4f} "
+                      f"{f1_score(y_test, predictions, average='macro'):>9.4f} {share:>10.2%}")
+                if order == "shuffled" and name == "svm":
+                    failed = accuracy < args.min_accuracy or share > args.max_share
+
+    if failed:
+        print(f"❌ Shuffled SVM below {args.min_accuracy} accuracy or above {args.max_share:.0%} on one category")
+        return 1
+    print("✅ Shuffled SVM learns every category from category-sorted metadata")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Subword N-gram Composition Benchmark
+====================================
+Compares gensim's per-word OOV vectors (``wv[word]``) with the batched
+composition of ``subword_ngrams.SubwordVectors`` on the tokens of the
+preprocessed articles:
+
+- OOV rate (token and distinct-token level)
+- microseconds per OOV token for both paths, per document and per batch
+- maximum absolute difference between the vectors
+
+Usage:
+    python benchmarks/bench_subword_ngrams.py --model cc.km.300.bin [--limit 500] [--batch-size 32]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from fixtures import REPO_ROOT, load_corpus
+from classifier_core import Config
+from subword_ngrams import SubwordVectors, oov_tokens
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark batched OOV composition")
+    parser.add_argument("--model", default=Config.FASTTEXT_MODEL_PATH)
+    parser.add_argument("--corpus", default=os.path.join(REPO_ROOT, "preprocessed_articles"))
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--limit", type=int, default=500, help="Articles sampled from the corpus")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    documents = [text.split() for _, _, text in load_corpus(args.metadata, args.corpus, limit=args.limit)]
+    if not documents:
+        print(f"⚠️ No articles found in {args.corpus}")
+        return 0
+    if not os.path.exists(args.model):
+        print(f"⚠️ {args.model} not found")
+        return 0
+
+    from gensim.models.fasttext import load_facebook_model
+    wv = load_facebook_model(args.model).wv
+    subwords = SubwordVectors.from_gensim(wv)
+
+    tokens = sum(len(doc) for doc in documents)
+    oov_count = sum(token not in wv.key_to_index for doc in documents for token in doc)
+    distinct_oov = oov_tokens(documents, wv.key_to_index)
+    print(f"{len(documents):,} articles, {tokens:,} tokens, OOV rate {oov_count / tokens:.2%} "
+          f"({len(distinct_oov):,} distinct OOV tokens)")
+
+    # gensim: one word at a time
+    start = time.perf_counter()
+    reference = [wv[token] for token in distinct_oov]
+    gensim_seconds = time.perf_counter() - start
+
+    # Batched: all distinct OOV tokens at once
+    start = time.perf_counter()
+    vectors, composed = subwords.compose(distinct_oov)
+    batched_seconds = time.perf_counter() - start
+    expected = np.array([vector for vector, ok in zip(reference, composed) if ok], dtype=np.float32)
+    max_diff = float(np.abs(expected - vectors).max()) if len(vectors) else 0.0
+
+    def per_token(seconds):
+        return seconds * 1e6 / max(len(distinct_oov), 1)
+    print(f"gensim per word:   {per_token(gensim_seconds):8.1f} µs per OOV token")
+    print(f"batched (corpus):  {per_token(batched_seconds):8.1f} µs per OOV token  "
+          f"({gensim_seconds / max(batched_seconds, 1e-9):.1f}x), max |diff| {max_diff:.2e}")
+
+    # Serving-shaped workloads: per document and per batch (stats count repeated OOV tokens)
+    for label, size in (("per document", 1), (f"batch of {args.batch_size}", args.batch_size)):
+        subwords.stats.reset()
+        for i in range(0, len(documents), size):
+            subwords.mean_vectors(documents[i:i + size])
+        stats = subwords.stats
+        print(f"{label + ':':<18} {stats.microseconds_per_oov_token:8.1f} µs per OOV token, "
+              f"OOV rate {stats.oov_rate:.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline Evaluation and Throughput Suite
+=======================================
+Repeatable model and serving-path numbers, stored as a JSON baseline that
+later runs are compared against:
+
+- model only: accuracy, macro-F1 and prediction throughput of the SVM on
+  ``X_test_fasttext`` / ``y_test_fasttext`` (joblib or feature store)
+- end to end: a sample of the held-out raw articles through
+  ``ClassificationEngine``: accuracy, macro-F1, docs/sec of
+  ``classify_batch``, p50/p95/p99 latency of ``classify_text`` and the
+  per-stage cost (clean, segment, stopwords, embed, predict, statistics)
+  on a cold pass, before ``classify_text`` has seen the sample
+- peak RSS of the process
+
+Usage:
+    python benchmarks/bench_suite.py --save-baseline          # record benchmarks/baselines/suite.json
+    python benchmarks/bench_suite.py [--threshold 0.10]       # compare; exit code 1 on regression
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+import baseline
+from fixtures import REPO_ROOT, load_test_split
+from classifier_core import AnalyticsEngine, ClassificationEngine, Config, TextProcessor, load_models
+import feature_store
+from search_index import tokens_from_segmented
+
+BASELINE_PATH = os.path.join(baseline.BASELINE_DIR, "suite.json")
+STAGES = ("clean", "segment", "stopwords", "embed", "predict", "statistics")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def quality(y_true, y_pred) -> Tuple[float, float]:
+    from sklearn.metrics import accuracy_score, f1_score
+
+    return accuracy_score(y_true, y_pred), f1_score(y_true, y_pred, average="macro")
+
+
+def model_only(svm_model, repeat: int) -> Dict[str, float]:
+    """Accuracy and prediction throughput on the stored test features"""
+    if not (feature_store.exists(Config.X_TEST_PATH) and feature_store.exists(Config.Y_TEST_PATH)):
+        print(f"⚠️ {Config.X_TEST_PATH} / {Config.Y_TEST_PATH} not found; skipping model-only numbers")
+        return {}
+    X_test = np.asarray(feature_store.load(Config.X_TEST_PATH))
+    y_test = np.asarray(feature_store.load(Config.Y_TEST_PATH))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predictions = svm_model.predict(X_test)
+        timings.append(time.perf_counter() - start)
+    accuracy, macro_f1 = quality(y_test, predictions)
+    return {
+        "model.accuracy": accuracy,
+        "model.macro_f1": macro_f1,
+        "model.docs_per_second": len(X_test) / min(timings),
+    }
+
+
+def staged_classify(engine, text: str, stage_seconds: Dict[str, float]) -> str:
+    """classify_text's steps, timed one by one"""
+    marks = [time.perf_counter()]
+    cleaned = TextProcessor.clean_khmer_sentences(text)
+    marks.append(time.perf_counter())
+    segmented = engine.segment_texts([cleaned])[0]
+    marks.append(time.perf_counter())
+    filtered = engine.filter_stopwords(segmented)
+    marks.append(time.perf_counter())
+    embedding = engine.get_sentence_embedding(filtered).reshape(1, -1)
+    marks.append(time.perf_counter())
+    prediction = engine.svm_model.predict(embedding)[0]
+    engine._calculate_confidence_scores(embedding)
+    marks.append(time.perf_counter())
+    AnalyticsEngine.get_text_statistics(text, tokens_from_segmented(segmented))
+    marks.append(time.perf_counter())
+    for stage, begin, end in zip(STAGES, marks, marks[1:]):
+        stage_seconds[stage] += end - begin
+    return prediction
+
+
+def end_to_end(engine, articles: List[Tuple[str, str, str]], batch_size: int) -> Dict[str, float]:
+    """Accuracy, latency percentiles, batch throughput and stage costs on raw articles"""
+    texts = [text for _, _, text in articles]
+    labels = [category for _, category, _ in articles]
+
+    # Stages first, from an empty word cache: timed after classify_text on the
+    # same text, every embedding would be a cache hit
+    stage_seconds: Dict[str, float] = defaultdict(float)
+    engine.clear_cache()
+    predictions = [staged_classify(engine, text, stage_seconds) for text in texts]
+
+    latencies = []
+    engine.clear_cache()
+    for text in texts:
+        start = time.perf_counter()
+        engine.classify_text(text)
+        latencies.append(time.perf_counter() - start)
+    latencies_ms = np.array(latencies) * 1000
+
+    start = time.perf_counter()
+    for batch_start in range(0, len(texts), batch_size):
+        engine.classify_batch(texts[batch_start:batch_start + batch_size])
+    batch_seconds = time.perf_counter() - start
+
+    accuracy, macro_f1 = quality(labels, predictions)
+    metrics = {
+        "e2e.accuracy": accuracy,
+        "e2e.macro_f1": macro_f1,
+        "e2e.docs_per_second": len(texts) / batch_seconds,
+        "e2e.latency_p50_ms": float(np.percentile(latencies_ms, 50)),
+        "e2e.latency_p95_ms": float(np.percentile(latencies_ms, 95)),
+        "e2e.latency_p99_ms": float(np.percentile(latencies_ms, 99)),
+    }
+    for stage in STAGES:
+        metrics[f"stage.{stage}_ms"] = stage_seconds[stage] / len(texts) * 1000
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline evaluation and throughput benchmark suite")
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--limit", type=int, default=300, help="Held-out articles run end to end")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of the model-only prediction")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative cost regression")
+    parser.add_argument("--quality-tolerance", type=float, default=0.005,
+                        help="Allowed absolute accuracy / macro-F1 drop")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(Config.SVM_MODEL_PATH):
+        print(f"⚠️ {Config.SVM_MODEL_PATH} not found")
+        return 0
+    start = time.time()
+    svm_model, embedding_model, config = load_models()
+    # No persistent vector cache: numbers must not depend on what earlier runs left in vector_cache/
+    engine = ClassificationEngine(svm_model, embedding_model, config.get("embedding_method", "mean"),
+                                  vector_cache_dir="")
+    print(f"📦 Models loaded in {time.time() - start:.1f}s")
+
+    metrics = model_only(engine.svm_model, args.repeat)
+    articles = load_test_split(args.metadata, args.texts)
+    if articles:
+        rng = np.random.default_rng(0)
+        sample = sorted(rng.choice(len(articles), size=min(args.limit, len(articles)), replace=False))
+        metrics.update(end_to_end(engine, [articles[i] for i in sample], args.batch_size))
+    else:
+        print(f"⚠️ No articles found in {args.texts}; skipping end-to-end numbers")
+    metrics["process.peak_rss_mb"] = peak_rss_mb()
+
+    for name, value in sorted(metrics.items()):
+        print(f"{name:<40} {value:>12.4g}")
+
+    if args.save_baseline:
+        baseline.save(args.baseline, metrics)
+        print(f"\n✅ Baseline saved to {args.baseline}")
+        return 0
+    stored = baseline.load(args.baseline)
+    if stored is None:
+        print(f"\n⚠️ No baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    rows = baseline.compare(metrics, stored, args.threshold, args.quality_tolerance)
+    return 1 if baseline.print_comparison(rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text Statistics Benchmark
+=========================
+Compares the fused single-pass ``AnalyticsEngine.get_text_statistics`` with
+the previous multi-pass implementation on large synthetic Khmer inputs and
+checks that both agree on the whitespace-split statistics.
+
+Usage:
+    python benchmarks/bench_text_statistics.py [--sizes 10000 100000 1000000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from fixtures import khmer_sample_text
+from classifier_core import AnalyticsEngine, Config
+
+
+def legacy_text_statistics(text):
+    """The multi-pass implementation replaced by the fused kernel"""
+    words = text.split()
+    chars = len(text)
+    sentences = max(1, text.count('។') + text.count('.') + text.count('!') + text.count('?'))
+    unique_words = len(set(words))
+    avg_word_length = np.mean([len(word) for word in words]) if words else 0
+    lexical_diversity = unique_words / len(words) if words else 0
+    khmer_chars = sum(1 for char in text if char in Config.KHCONST)
+    khmer_ratio = khmer_chars / chars if chars > 0 else 0
+    readability = 0.0
+    if words:
+        avg_sentence_length = len(words) / sentences
+        score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * (np.mean([len(w) for w in words]) / 10))
+        readability = max(0, min(100, score))
+    return {
+        'characters': chars,
+        'words': len(words),
+        'unique_words': unique_words,
+        'sentences': sentences,
+        'avg_word_length': avg_word_length,
+        'avg_sentence_length': len(words) / sentences,
+        'lexical_diversity': lexical_diversity,
+        'khmer_character_ratio': khmer_ratio,
+        'readability_score': readability
+    }
+
+
+def best_time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark get_text_statistics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Input sizes in UTF-8 bytes")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'size':>10} {'legacy ms':>11} {'fused ms':>10} {'speedup':>8} {'MB/s':>8}")
+    for size in args.sizes:
+        text = khmer_sample_text(size)
+
+        legacy = legacy_text_statistics(text)
+        fused = AnalyticsEngine.get_text_statistics(text)
+        for key, value in legacy.items():
+            if not np.isclose(value, fused[key]):
+                print(f"❌ Mismatch for {key}: legacy={value} fused={fused[key]}")
+                return 1
+
+        legacy_time = best_time(lambda: legacy_text_statistics(text), args.repeat)
+        fused_time = best_time(lambda: AnalyticsEngine.get_text_statistics(text), args.repeat)
+        megabytes = len(text.encode("utf-8")) / 1e6
+        print(f"{size:>10,} {legacy_time * 1000:>11.2f} {fused_time * 1000:>10.2f} "
+              f"{legacy_time / fused_time:>7.1f}x {megabytes / fused_time:>8.1f}")
+
+    # With segmentation tokens the raw text is no longer re-split
+    text = khmer_sample_text(args.sizes[-1])
+    tokens = text.split()
+    tokens_time = best_time(lambda: AnalyticsEngine.get_text_statistics(text, tokens), args.repeat)
+    print(f"✅ Statistics match; with precomputed tokens: {tokens_time * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
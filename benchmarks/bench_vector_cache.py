@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent Vector Cache Benchmark
+=================================
+Per-document embedding latency (p50 / p95) of the preprocessed articles:
+
+- no cache
+- cold cache: first pass, every token is resolved and appended
+- after restart: a fresh ``VectorCache`` opened on the same directory, as
+  after a deploy (preloaded, nothing recomputed)
+
+Usage:
+    python benchmarks/bench_vector_cache.py --model cc.km.300.bin [--limit 300]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from fixtures import REPO_ROOT, load_corpus
+from classifier_core import Config, load_embedding_model
+from subword_ngrams import SubwordVectors
+from vector_cache import VectorCache
+
+
+def latencies(subword_vectors: SubwordVectors, documents) -> np.ndarray:
+    timings = []
+    for doc in documents:
+        start = time.perf_counter()
+        subword_vectors.mean_vector(doc)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the persistent word-vector cache")
+    parser.add_argument("--model", default=Config.FASTTEXT_MODEL_PATH)
+    parser.add_argument("--bundle", default="", help="Embedding bundle used instead of --model")
+    parser.add_argument("--corpus", default=os.path.join(REPO_ROOT, "preprocessed_articles"))
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--limit", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    documents = [text.split() for _, _, text in load_corpus(args.metadata, args.corpus, limit=args.limit)]
+    if not documents:
+        print(f"⚠️ No articles found in {args.corpus}")
+        return 0
+    if not args.bundle and not os.path.exists(args.model):
+        print(f"⚠️ {args.model} not found")
+        return 0
+
+    model = load_embedding_model({"embedding_bundle": args.bundle, "model_path": args.model})
+    subword_vectors = model.subwords if hasattr(model, "subwords") else SubwordVectors.from_gensim(model.wv)
+    fingerprint = subword_vectors.fingerprint()
+    directory = tempfile.mkdtemp(prefix="vector_cache_")
+    try:
+        runs = [("no cache", None)]
+        runs.append(("cold cache", VectorCache(directory, subword_vectors.vector_size, fingerprint)))
+        for label, cache in runs:
+            subword_vectors.cache = cache
+            timings = latencies(subword_vectors, documents)
+            print(f"{label:<15} p50 {np.percentile(timings, 50):7.2f} ms  p95 {np.percentile(timings, 95):7.2f} ms")
+
+        start = time.perf_counter()
+        cache = VectorCache(directory, subword_vectors.vector_size, fingerprint)
+        cache.preload()
+        open_time = time.perf_counter() - start
+        subword_vectors.cache = cache
+        timings = latencies(subword_vectors, documents)
+        print(f"{'after restart':<15} p50 {np.percentile(timings, 50):7.2f} ms  p95 {np.percentile(timings, 95):7.2f} ms"
+              f"  (opened {len(cache):,} entries in {open_time:.3f}s, hit rate {cache.stats()['hit_rate']:.1%})")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Fixtures
+==================
+Deterministic Khmer inputs shared by the benchmark scripts in this folder:
+a synthetic article generator for fixed input sizes, and a loader for the
+real article archive (``raw_articles/{docId}.txt`` as written by the data
+preprocessing notebook) when it is available locally.
+"""
+
+import os
+import random
+import sys
+from typing import List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Sentences taken from news articles of the six categories
+KHMER_SENTENCES = [
+    "រដ្ឋាភិបាលកម្ពុជាបានប្រកាសគម្រោងអភិវឌ្ឍន៍ថ្មីសម្រាប់កម្មវិធីបរិស្ថាន និងការកាត់បន្ថយការប្រើប្រាស់ភ្លាស្ទិក។",
+    "ក្រសួងសុខាភិបាលបានណែនាំឱ្យប្រជាពលរដ្ឋចាក់វ៉ាក់សាំងការពារជំងឺគ្រុនផ្តាសាយ។",
+    "ក្រុមបាល់ទាត់ជម្រើសជាតិកម្ពុជាបានយកឈ្នះលើក្រុមភ្ញៀវក្នុងការប្រកួតមិត្តភាព ២ ទល់ ១។",
+    "ធនាគារជាតិនៃកម្ពុជាបានរាយការណ៍ថាកំណើនសេដ្ឋកិច្ចឆ្នាំនេះអាចឡើងដល់ ៦ ភាគរយ។",
+    "ក្រុមហ៊ុនបច្ចេកវិទ្យាបានដាក់ឱ្យប្រើប្រាស់កម្មវិធីទូរស័ព្ទថ្មីសម្រាប់ការទូទាត់ប្រាក់តាមអនឡាញ។",
+    "សភាជាតិបានអនុម័តច្បាប់ស្តីពីការគ្រប់គ្រងធនធានទឹក និងការការពារព្រៃឈើ។",
+    "អាជ្ញាធរខេត្តបានរៀបចំកម្មវិធីដាំកូនឈើចំនួន ១០ ០០០ ដើម នៅតាមបណ្តោយផ្លូវជាតិ។",
+    "Prime Minister Hun Manet met with ASEAN delegates in Phnom Penh (2024).",
+]
+
+
+def khmer_sample_text(size_bytes: int, seed: int = 0) -> str:
+    """Synthetic Khmer article of roughly size_bytes UTF-8 bytes (with paragraph breaks)"""
+    rng = random.Random(seed)
+    parts, total = [], 0
+    while total < size_bytes:
+        sentence = rng.choice(KHMER_SENTENCES)
+        parts.append(sentence)
+        parts.append("\n" if rng.random() < 0.2 else " ")
+        total += len(sentence.encode("utf-8")) + 1
+    return "".join(parts)
+
+
+def load_corpus(metadata_path: str = os.path.join(REPO_ROOT, "metadata.csv"),
+                texts_dir: str = os.path.join(REPO_ROOT, "raw_articles"),
+                limit: Optional[int] = None, seed: int = 0) -> List[Tuple[str, str, str]]:
+    """(doc_id, category, text) of archive articles found on disk, sampled across categories"""
+    import pandas as pd
+
+    if not os.path.isdir(texts_dir):
+        return []
+    metadata = pd.read_csv(metadata_path)
+    if limit is not None and limit < len(metadata):
+        metadata = metadata.sample(n=limit, random_state=seed)
+    corpus = []
+    for doc_id, category in zip(metadata["docId"], metadata["category"]):
+        path = os.path.join(texts_dir, f"{doc_id}.txt")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                corpus.append((doc_id, category, f.read()))
+    return corpus
+
+
+def load_test_split(metadata_path: str = os.path.join(REPO_ROOT, "metadata.csv"),
+                    texts_dir: str = os.path.join(REPO_ROOT, "raw_articles"),
+                    test_size: float = 0.2, random_state: int = 42) -> List[Tuple[str, str, str]]:
+    """(doc_id, category, text) of the held-out test split
+
+    Reproduces the stratified split of the FastText model development notebook
+    (test_size=0.2, random_state=42 over the articles in metadata order), so the
+    returned articles are the ones behind X_test_fasttext / y_test_fasttext.
+    """
+    from sklearn.model_selection import train_test_split
+
+    corpus = load_corpus(metadata_path, texts_dir)
+    if not corpus:
+        return []
+    _, test = train_test_split(corpus, test_size=test_size, random_state=random_state,
+                               stratify=[category for _, category, _ in corpus])
+    return test
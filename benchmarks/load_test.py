@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Concurrent-User Load Test
+=========================
+Self-contained load generator for the classification path, to size worker
+counts behind nginx (which lets bursts of 20 through). N simulated users
+each send a request, wait for the answer, optionally think, and repeat;
+every concurrency level runs for a fixed duration and reports throughput,
+p50/p95/p99 latency (including queueing) and the error rate.
+
+Targets:
+
+- ``engine`` (default): the headless ``ClassificationEngine``, in the load
+  generator process (``--workers 0``, users share one engine and the GIL)
+  or on W worker processes that each load their own engine, as W serving
+  processes would
+- ``http``: any endpoint accepting ``POST {"text": ...}`` (``--url``);
+  non-2xx answers, timeouts and connection errors count as errors
+
+Documents follow the corpus length distribution: each request picks a
+``metadata.csv`` row at random and sends its article from ``raw_articles``
+when available, or synthetic Khmer text of its ``charCount`` otherwise.
+
+Usage:
+    python benchmarks/load_test.py --users 1 2 4 8 16 20 32 --duration 30 --workers 2
+    python benchmarks/load_test.py --target http --url http://127.0.0.1:8000/classify --users 1 5 10 20
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from fixtures import KHMER_SENTENCES, REPO_ROOT
+
+
+# ----------------------------------------------------------------------
+# Documents
+# ----------------------------------------------------------------------
+
+def synthetic_text(char_count: int, rng: random.Random) -> str:
+    """Khmer news-like text of char_count characters"""
+    parts, total = [], 0
+    while total < char_count:
+        sentence = rng.choice(KHMER_SENTENCES)
+        parts.append(sentence)
+        total += len(sentence) + 1
+    return " ".join(parts)[:char_count]
+
+
+def load_documents(metadata_path: str, texts_dir: str, count: int, seed: int = 0) -> List[str]:
+    """count documents sampled from the corpus length distribution (real articles when on disk)"""
+    import pandas as pd
+
+    metadata = pd.read_csv(metadata_path)
+    rows = metadata.sample(n=count, replace=count > len(metadata), random_state=seed)
+    rng = random.Random(seed)
+    documents = []
+    for doc_id, char_count in zip(rows["docId"], rows["charCount"]):
+        path = os.path.join(texts_dir, f"{doc_id}.txt")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                documents.append(f.read())
+        else:
+            documents.append(synthetic_text(int(char_count), rng))
+    return documents
+
+
+# ----------------------------------------------------------------------
+# Targets
+# ----------------------------------------------------------------------
+
+_worker_engine = {}
+
+
+def _init_engine_worker():
+    from classifier_core import create_classification_engine
+
+    _worker_engine["engine"] = create_classification_engine()
+
+
+def _classify_in_worker(text: str) -> str:
+    return _worker_engine["engine"].classify_text(text).prediction
+
+
+class EngineTarget:
+    """Headless engine, in-process (workers=0) or on worker processes"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        if workers > 0:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                initializer=_init_engine_worker)
+        else:
+            from classifier_core import create_classification_engine
+
+            self.engine = create_classification_engine()
+
+    def __call__(self, text: str):
+        if self.workers > 0:
+            return self.executor.submit(_classify_in_worker, text).result()
+        return self.engine.classify_text(text).prediction
+
+    def close(self):
+        if self.workers > 0:
+            self.executor.shutdown()
+
+
+class HttpTarget:
+    """POST {"text": ...} to an HTTP endpoint"""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, text: str):
+        request = urllib.request.Request(self.url, data=json.dumps({"text": text}).encode("utf-8"),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def close(self):
+        pass
+
+
+# ----------------------------------------------------------------------
+# Load generation
+# ----------------------------------------------------------------------
+
+def run_level(target: Callable[[str], object], documents: List[str], users: int, duration: float,
+              think_ms: float, seed: int = 0) -> Dict[str, float]:
+    """Closed-loop load with users concurrent users for duration seconds"""
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def user(user_id: int):
+        rng = random.Random(seed * 1000 + user_id)
+        while time.perf_counter() < deadline:
+            text = rng.choice(documents)
+            start = time.perf_counter()
+            try:
+                target(text)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception as e:  # HTTP errors, timeouts, engine failures
+                with lock:
+                    errors.append(type(e).__name__)
+            if think_ms > 0:
+                time.sleep(rng.expovariate(1000.0 / think_ms))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    requests = len(latencies) + len(errors)
+    timings = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "users": users,
+        "requests": requests,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "error_rate": len(errors) / requests if requests else 0.0,
+    }
+
+
+def print_level(level: Dict[str, float]):
+    print(f"{level['users']:>6} {level['requests']:>9,} {level['throughput']:>10.2f} {level['p50_ms']:>9.0f} "
+          f"{level['p95_ms']:>9.0f} {level['p99_ms']:>9.0f} {level['error_rate']:>8.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-user load test of the classification path")
+    parser.add_argument("--target", choices=["engine", "http"], default="engine")
+    parser.add_argument("--url", default="", help="Endpoint of the http target")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout in seconds")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Engine worker processes (0 runs the engine in the load generator)")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16, 20],
+                        help="Concurrency levels")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per concurrency level")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean think time between a user's requests")
+    parser.add_argument("--documents", type=int, default=500, help="Documents sampled from metadata.csv")
+    parser.add_argument("--metadata", default=os.path.join(REPO_ROOT, "metadata.csv"))
+    parser.add_argument("--texts", default=os.path.join(REPO_ROOT, "raw_articles"))
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p95 latency objective for the summary")
+    parser.add_argument("--output", default="", help="Write the per-level results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.target == "http" and not args.url:
+        parser.error("--url is required for the http target")
+    documents = load_documents(args.metadata, args.texts, args.documents)
+    lengths = np.array([len(text) for text in documents])
+    print(f"📄 {len(documents)} documents: {np.median(lengths):,.0f} chars median, "
+          f"p95 {np.percentile(lengths, 95):,.0f}")
+
+    start = time.time()
+    target = HttpTarget(args.url, args.timeout) if args.target == "http" else EngineTarget(args.workers)
+    try:
+        # Warm-up: load the models (of every worker) and fault in the caches
+        for text in documents[:max(2, 2 * args.workers)]:
+            try:
+                target(text)
+            except Exception as e:
+                print(f"⚠️ Warm-up request failed: {type(e).__name__}: {e}")
+        print(f"📦 Target ready in {time.time() - start:.1f}s")
+
+        print(f"\n{'users':>6} {'requests':>9} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+        levels = []
+        for users in args.users:
+            level = run_level(target, documents, users, args.duration, args.think_ms)
+            levels.append(level)
+            print_level(level)
+    finally:
+        target.close()
+
+    within_slo = [level for level in levels if level["p95_ms"] <= args.slo_ms and level["error_rate"] == 0]
+    if within_slo:
+        best = max(within_slo, key=lambda level: level["throughput"])
+        print(f"\n✅ Best within p95 <= {args.slo_ms:.0f} ms: {best['throughput']:.2f} req/s "
+              f"at {best['users']} users")
+    else:
+        print(f"\n⚠️ No level met p95 <= {args.slo_ms:.0f} ms without errors")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"target": args.target, "workers": args.workers, "levels": levels}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
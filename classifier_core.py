@@ -0,0 +1,694 @@
+# -*- coding: utf-8 -*-
+"""
+Khmer News Classification Core
+==============================
+Streamlit-free part of the Khmer News Classifier: configuration, text
+processing, analytics and the classification engine. It is shared by the web
+application (khmer_news_classifier_pro.py), the background task worker
+(background_tasks.py) and offline tools, so importing it never touches the
+Streamlit runtime.
+"""
+
+import os
+import json
+import time
+import re
+import collections
+import hashlib
+import logging
+import gc
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional, Any
+
+import joblib
+import numpy as np
+import PyPDF2
+
+import text_normalization
+from embedding_bundle import EmbeddingBundle, is_bundle
+from search_index import tokens_from_segmented
+from segmenters import get_segmenter, join_sentences, segment_sentence, split_sentences
+from segmentation_pool import get_shared_pool
+from stopwords import get_stopword_filter
+from subword_ngrams import SubwordVectors
+from vector_cache import get_vector_cache
+
+# Configuration and constants
+class Config:
+    """Application configuration constants"""
+    # Dynamic model path detection
+    @staticmethod
+    def get_model_directory():
+        """Dynamically find the model directory based on current working directory or common locations"""
+        # First, try to find relative to current working directory
+        possible_paths = [
+            os.path.join(os.getcwd(), "Demo_model"),
+            os.path.join(os.getcwd(), "models"),
+            os.path.join(os.getcwd(), "model"),
+            os.path.join(os.path.dirname(__file__), "Demo_model"),
+            os.path.join(os.path.dirname(__file__), "models"),
+            os.path.join(os.path.dirname(__file__), "model"),
+            # Common project structure paths
+            os.path.join(os.path.expanduser("~"), "Documents", "DEV", "Demo_model"),
+            os.path.join(os.path.expanduser("~"), "Desktop", "Demo_model"),
+            os.path.join(os.path.expanduser("~"), "Downloads", "Demo_model"),
+        ]
+        
+        for path in possible_paths:
+            if os.path.exists(path) and os.path.isdir(path):
+                # Verify it contains expected model files
+                expected_files = ["svm_model.joblib", "config.json"]
+                if all(os.path.exists(os.path.join(path, f)) for f in expected_files):
+                    return path
+        
+        # If no valid directory found, return None
+        return None
+    
+    # Initialize model directory
+    MODEL_DIR = get_model_directory.__func__() or os.path.join(os.getcwd(), "Demo_model")
+    
+    SVM_MODEL_PATH = os.path.join(MODEL_DIR, "svm_model.joblib")
+    CONFIG_PATH = os.path.join(MODEL_DIR, "config.json")
+    # FastText model is in the root directory, not in Demo_model
+    FASTTEXT_MODEL_PATH = os.path.join(os.getcwd(), "cc.km.300.bin")
+    
+    # Quantized embedding bundle used instead of the FastText .bin model when present
+    # (see embedding_bundle.py; config.json "embedding_bundle" takes precedence)
+    EMBEDDING_BUNDLE_PATH = os.environ.get("KHMER_CLASSIFIER_EMBEDDING_BUNDLE", "")
+    
+    # Persistent word-vector cache shared by all processes (empty to disable, see vector_cache.py)
+    VECTOR_CACHE_DIR = os.environ.get("KHMER_CLASSIFIER_VECTOR_CACHE_DIR", os.path.join(os.getcwd(), "vector_cache"))
+    
+    # Start-up warm-up (warmup.py): corpus token profile, tokens pre-resolved and time budget (0 disables)
+    WARMUP_PROFILE_PATH = os.path.join(MODEL_DIR, "token_profile.tsv")
+    WARMUP_TOP_K = int(os.environ.get("KHMER_CLASSIFIER_WARMUP_TOP_K", "50000"))
+    WARMUP_BUDGET_SECONDS = float(os.environ.get("KHMER_CLASSIFIER_WARMUP_BUDGET", "30"))
+    
+    # Training data paths (if needed); read with feature_store.load, which prefers the
+    # memory-mapped .npy store next to each pickle
+    X_TRAIN_PATH = os.path.join(MODEL_DIR, "X_train_fasttext.joblib")
+    X_TEST_PATH = os.path.join(MODEL_DIR, "X_test_fasttext.joblib")
+    Y_TRAIN_PATH = os.path.join(MODEL_DIR, "y_train_fasttext.joblib")
+    Y_TEST_PATH = os.path.join(MODEL_DIR, "y_test_fasttext.joblib")
+    
+    # Word segmentation backend ("khmernltk" or "trie", see segmenters.py)
+    SEGMENTER = os.environ.get("KHMER_CLASSIFIER_SEGMENTER", "khmernltk")
+    SEGMENTER_LEXICON_PATH = os.path.join(MODEL_DIR, "segmenter_lexicon.tsv")
+    # Worker processes of the segmentation pool (0 or 1 segments in-process)
+    SEGMENTATION_WORKERS = int(os.environ.get("KHMER_CLASSIFIER_SEGMENTATION_WORKERS", "0"))
+    
+    # Stopwords removed before embedding, as in the training corpus preprocessing
+    STOPWORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Khmer-Stop-Word-1000.txt")
+    REMOVE_STOPWORDS = os.environ.get("KHMER_CLASSIFIER_REMOVE_STOPWORDS", "true").lower() == "true"
+    
+    # Background job queue (shared by the web app and background_tasks.py)
+    JOBS_DIR = os.environ.get("KHMER_CLASSIFIER_JOBS_DIR", os.path.join(os.getcwd(), "jobs"))
+    JOBS_DB_PATH = os.path.join(JOBS_DIR, "jobs.sqlite3")
+    # Streamlit reads a download_button file fully into memory: larger exports stay on
+    # the server (JOBS_DIR/exports) and the app shows their path instead
+    EXPORTS_DIR = os.path.join(JOBS_DIR, "exports")
+    EXPORT_INLINE_MAX_MB = float(os.environ.get("KHMER_CLASSIFIER_EXPORT_INLINE_MB", "100"))
+    
+    # Online learning (online_learning.py): queued corrections, snapshots, and whether the
+    # promoted snapshot replaces the SVC in running engines
+    CORRECTIONS_DB_PATH = os.path.join(JOBS_DIR, "corrections.sqlite3")
+    ONLINE_MODEL_DIR = os.path.join(MODEL_DIR, "online")
+    ONLINE_MODEL = os.environ.get("KHMER_CLASSIFIER_ONLINE_MODEL", "false").lower() in ("1", "true", "yes")
+    
+    CATEGORIES = ["economic", "environment", "health", "politic", "sport", "technology"]
+    CATEGORY_LABELS = {
+        "economic": "Economic",
+        "environment": "Environment", 
+        "health": "Health",
+        "politic": "Politics",
+        "sport": "Sports",
+        "technology": "Technology"
+    }
+    
+    # Khmer character sets for preprocessing
+    KHCONST = set(u'កខគឃងចឆជឈញដឋឌឍណតថទធនបផពភមយរលវឝឞសហឡអឣឤឥឦឧឨឩឪឫឬឭឮឯឰឱឲឳ')
+    KHVOWEL = set(u'឴឵ាិីឹឺុូួើឿៀេែៃោៅ\u17c6\u17c7\u17c8')
+    KHSUB = set(u'្')
+    KHSYM = set('៕។៛ៗ៚៙៘៖«»')
+    KHNUMBER = set(u'០១២៣៤៥៦៧៨៩')
+    ARABIC_NUMBER = set('0123456789')
+    LATIN_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+    PUNCTUATION = set('"!@#$%^&*()-_+=[]{};\'\"\|,.<>?/`~፡.,፣;፤፥፦፧፪፠፨')
+
+class CategoryType(Enum):
+    """Enumeration for news categories"""
+    ECONOMIC = "economic"
+    ENVIRONMENT = "environment"
+    HEALTH = "health"
+    POLITIC = "politic"
+    SPORT = "sport"
+    TECHNOLOGY = "technology"
+
+@dataclass
+class ClassificationResult:
+    """Data class for classification results"""
+    prediction: str
+    confidence: Dict[str, float]
+    processing_time: float
+    cleaned_text: str
+    segmented_text: str
+    embedding: np.ndarray
+    timestamp: datetime
+    input_text: str
+    text_statistics: Dict[str, Any]
+    prediction_id: str
+
+class TextProcessor:
+    """Advanced text processing utilities for Khmer language"""
+    
+    # Removal table for clean_khmer_text, compiled once
+    _normalizer = text_normalization.TextNormalizer(
+        Config.KHSYM | Config.KHNUMBER | Config.ARABIC_NUMBER | Config.LATIN_CHARS | Config.PUNCTUATION
+    )
+    
+    @staticmethod
+    def normalize_khmer_text(text: str) -> str:
+        """Normalize Khmer text using Unicode NFC normalization"""
+        return text_normalization.normalize_text(text)
+
+    @staticmethod
+    def clean_khmer_text(text: str) -> str:
+        """Clean Khmer text by removing unwanted characters"""
+        return TextProcessor._normalizer.clean(text)
+
+    @staticmethod
+    def clean_khmer_sentences(text: str) -> str:
+        """clean_khmer_text per sentence of the raw text, one cleaned sentence per line
+
+        Cleaning removes the sentence delimiters, which would leave a whole
+        article as one sentence; line breaks keep the raw text's boundaries so
+        segmentation (and the segmentation pool) works sentence by sentence.
+        """
+        sentences = (TextProcessor.clean_khmer_text(sentence) for sentence in split_sentences(text))
+        return '\n'.join(sentence for sentence in sentences if sentence)
+
+    @staticmethod
+    def normalize_word(word: str) -> str:
+        """Normalize individual Khmer words"""
+        return text_normalization.normalize_word(word)
+    
+    @staticmethod
+    def normalize_words(words: List[str]) -> List[str]:
+        """Normalize a list of Khmer words in one call"""
+        return text_normalization.normalize_tokens(words)
+
+    @staticmethod
+    def segment_khmer_text(text: str) -> str:
+        """Segment Khmer text using sentence-based approach for better flow"""
+        try:
+            segmenter = get_segmenter(Config.SEGMENTER, Config.SEGMENTER_LEXICON_PATH)
+            
+            # Split into sentences, tokenize each one and keep the sentence structure
+            processed_sentences = []
+            for sentence in split_sentences(text):
+                processed_sentence = segment_sentence(segmenter, sentence)
+                if processed_sentence:
+                    processed_sentences.append(processed_sentence)
+            
+            # Join sentences with sentence delimiters to maintain structure
+            return join_sentences(processed_sentences, text)
+            
+        except Exception as e:
+            logging.warning(f"Sentence-based segmentation failed: {e}")
+            # Fallback to simple sentence splitting
+            sentences = []
+            for delimiter in ['។', '.', '!', '?']:
+                if delimiter in text:
+                    parts = text.split(delimiter)
+                    for i, part in enumerate(parts[:-1]):  # Exclude last empty part
+                        if part.strip():
+                            sentences.append(part.strip())
+            
+            return ' ។ '.join(sentences) if sentences else text
+
+# Codepoint classes used by AnalyticsEngine.get_text_statistics
+_CHAR_OTHER, _CHAR_KHMER_CONSONANT, _CHAR_SENTENCE_END = 0, 1, 2
+_CHAR_CLASS_LIMIT = 0x1800  # End of the Khmer block; every character we classify lies below it
+
+def _build_char_class_table() -> np.ndarray:
+    table = np.zeros(_CHAR_CLASS_LIMIT + 1, dtype=np.uint8)
+    for char in Config.KHCONST:
+        table[ord(char)] = _CHAR_KHMER_CONSONANT
+    for char in '។.!?':
+        table[ord(char)] = _CHAR_SENTENCE_END
+    return table
+
+_CHAR_CLASS_TABLE = _build_char_class_table()
+
+class AnalyticsEngine:
+    """Advanced analytics and visualization engine"""
+    
+    @staticmethod
+    def get_text_statistics(text: str, tokens: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Comprehensive text statistics analysis
+        
+        tokens are the words produced by segmentation (see search_index.tokens_from_segmented);
+        without them the raw text is split on whitespace.
+        """
+        words = tokens if tokens is not None else text.split()
+        chars = len(text)
+        
+        # One vectorized pass over the codepoints classifies every character
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        class_counts = np.bincount(_CHAR_CLASS_TABLE[np.minimum(codepoints, _CHAR_CLASS_LIMIT)], minlength=3)
+        sentences = max(1, int(class_counts[_CHAR_SENTENCE_END]))
+        khmer_chars = int(class_counts[_CHAR_KHMER_CONSONANT])
+        
+        # Word lengths are computed once and shared with the readability score
+        word_count = len(words)
+        unique_words = len(set(words))
+        avg_word_length = sum(map(len, words)) / word_count if word_count else 0
+        lexical_diversity = unique_words / word_count if word_count else 0
+        khmer_ratio = khmer_chars / chars if chars > 0 else 0
+        
+        return {
+            'characters': chars,
+            'words': word_count,
+            'unique_words': unique_words,
+            'sentences': sentences,
+            'avg_word_length': avg_word_length,
+            'avg_sentence_length': word_count / sentences,
+            'lexical_diversity': lexical_diversity,
+            'khmer_character_ratio': khmer_ratio,
+            'readability_score': AnalyticsEngine._calculate_readability(word_count, sentences, avg_word_length)
+        }
+    
+    @staticmethod
+    def _calculate_readability(word_count: int, sentences: int, avg_word_length: float) -> float:
+        """Calculate readability score (simplified Flesch-Kincaid adaptation)"""
+        if not word_count or sentences == 0:
+            return 0.0
+        avg_sentence_length = word_count / sentences
+        # Simplified readability score for Khmer text
+        score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * (avg_word_length / 10))
+        return max(0, min(100, score))
+
+class ClassificationEngine:
+    """Advanced classification engine with confidence analysis"""
+    
+    def __init__(self, svm_model, fasttext_model, embedding_method: str = "mean",
+                 segmentation_workers: Optional[int] = None, remove_stopwords: Optional[bool] = None,
+                 vector_cache_dir: Optional[str] = None):
+        self.svm_model = svm_model
+        self.model_version = None  # Online snapshot being served (None: the SVC)
+        self.fasttext_model = fasttext_model
+        self.embedding_method = embedding_method
+        self.segmentation_workers = (Config.SEGMENTATION_WORKERS if segmentation_workers is None
+                                     else segmentation_workers)
+        self.remove_stopwords = Config.REMOVE_STOPWORDS if remove_stopwords is None else remove_stopwords
+        
+        # Cache for word embeddings to improve performance with 8GB RAM
+        self._word_embedding_cache = {}
+        self._cache_max_size = 10000  # Cache up to 10k word embeddings
+        
+        # Batched OOV composition (bundles and gensim FastText models); None for other models
+        self.subword_vectors = self._create_subword_vectors(fasttext_model)
+        
+        # Token vectors persisted across restarts, memory-mapped and preloaded at start-up
+        vector_cache_dir = Config.VECTOR_CACHE_DIR if vector_cache_dir is None else vector_cache_dir
+        if self.subword_vectors is not None and self.subword_vectors.cache is None and vector_cache_dir:
+            self.subword_vectors.cache = get_vector_cache(vector_cache_dir, self.subword_vectors.vector_size,
+                                                          self.subword_vectors.fingerprint())
+    
+    def swap_model(self, svm_model, version=None):
+        """Serve another classifier; requests in flight finish with the model they started with"""
+        self.svm_model, self.model_version = svm_model, version
+    
+    @staticmethod
+    def _create_subword_vectors(fasttext_model) -> Optional[SubwordVectors]:
+        if hasattr(fasttext_model, 'subwords'):
+            return fasttext_model.subwords
+        try:
+            return SubwordVectors.from_gensim(fasttext_model.wv)
+        except AttributeError:
+            return None
+    
+    def get_sentence_embeddings(self, segmented_texts: List[str]) -> np.ndarray:
+        """Embeddings of several segmented texts, composing all their OOV words together"""
+        if self.embedding_method == "mean" and self.subword_vectors is not None:
+            return self.subword_vectors.mean_vectors([text.split() for text in segmented_texts])
+        return np.vstack([self.get_sentence_embedding(text) for text in segmented_texts])
+    
+    def get_sentence_embedding(self, segmented_text: str) -> np.ndarray:
+        """Generate sentence embedding from segmented text with caching for better performance"""
+        words = segmented_text.strip().split()
+        if not words:
+            return np.zeros(300)
+        
+        # Vectorized path: in-vocabulary rows gathered, OOV words composed in bulk
+        if self.embedding_method == "mean" and self.subword_vectors is not None:
+            return self.subword_vectors.mean_vector(words)
+        
+        word_vecs = []
+        for word in words:
+            try:
+                # Check cache first for better performance
+                if word in self._word_embedding_cache:
+                    vec = self._word_embedding_cache[word]
+                else:
+                    # Get word vector from FastText model
+                    if hasattr(self.fasttext_model, 'get_word_vector'):
+                        vec = self.fasttext_model.get_word_vector(word)
+                    elif hasattr(self.fasttext_model, 'wv') and word in self.fasttext_model.wv:
+                        vec = self.fasttext_model.wv[word]
+                    elif hasattr(self.fasttext_model, 'get_vector'):
+                        vec = self.fasttext_model.get_vector(word)
+                    else:
+                        vec = self.fasttext_model[word]
+                    
+                    # Cache the embedding if we have space
+                    if len(self._word_embedding_cache) < self._cache_max_size:
+                        self._word_embedding_cache[word] = vec
+                
+                word_vecs.append((word, vec))
+            except Exception:
+                continue
+        
+        if not word_vecs:
+            return np.zeros(300)
+        
+        if self.embedding_method == "mean":
+            return np.mean([vec for _, vec in word_vecs], axis=0)
+        elif self.embedding_method == "weighted":
+            word_counts = collections.Counter(word for word, _ in word_vecs)
+            total_count = sum(word_counts.values())
+            weighted_vecs = [vec * (word_counts[word]/total_count) for word, vec in word_vecs]
+            return np.sum(weighted_vecs, axis=0)
+        
+        return np.mean([vec for _, vec in word_vecs], axis=0)
+    
+    def segment_texts(self, cleaned_texts: List[str]) -> List[str]:
+        """Segment cleaned texts, on the shared segmentation pool when it is enabled"""
+        if self.segmentation_workers > 1:
+            try:
+                pool = get_shared_pool(self.segmentation_workers, Config.SEGMENTER, Config.SEGMENTER_LEXICON_PATH)
+                return pool.segment_documents(cleaned_texts)
+            except Exception as e:
+                logging.warning(f"Segmentation pool failed, segmenting in-process: {e}")
+        return [TextProcessor.segment_khmer_text(text) for text in cleaned_texts]
+    
+    def filter_stopwords(self, segmented_text: str) -> str:
+        """Drop stopword tokens before embedding (no-op when stopword removal is disabled)"""
+        if not self.remove_stopwords:
+            return segmented_text
+        filtered = get_stopword_filter(Config.STOPWORDS_PATH).filter_text(segmented_text)
+        # Unsegmented fallback text contains stopwords as substrings everywhere:
+        # keep it rather than embedding an empty document
+        return filtered or segmented_text
+    
+    def classify_text(self, text: str) -> ClassificationResult:
+        """Perform comprehensive text classification"""
+        start_time = time.time()
+        
+        # Generate unique prediction ID
+        prediction_id = hashlib.md5(f"{text[:100]}{datetime.now()}".encode()).hexdigest()[:8]
+        
+        # Preprocess text
+        cleaned = TextProcessor.clean_khmer_sentences(text)
+        segmented = self.segment_texts([cleaned])[0]
+        
+        # Get embedding
+        embedding = self.get_sentence_embedding(self.filter_stopwords(segmented))
+        embedding_reshaped = embedding.reshape(1, -1)
+        
+        # Get prediction and confidence scores (from the same model if it is swapped meanwhile)
+        svm_model = self.svm_model
+        prediction = svm_model.predict(embedding_reshaped)[0]
+        
+        # Calculate confidence scores
+        confidence_dict = self._calculate_confidence_batch(embedding_reshaped, svm_model=svm_model)[0]
+        
+        # Get text statistics
+        text_stats = AnalyticsEngine.get_text_statistics(text, tokens_from_segmented(segmented))
+        
+        processing_time = time.time() - start_time
+        
+        return ClassificationResult(
+            prediction=prediction,
+            confidence=confidence_dict,
+            processing_time=processing_time,
+            cleaned_text=cleaned,
+            segmented_text=segmented,
+            embedding=embedding,
+            timestamp=datetime.now(),
+            input_text=text,  # Store complete original text
+            text_statistics=text_stats,
+            prediction_id=prediction_id
+        )
+    
+    def classify_batch(self, texts: List[str]) -> List[ClassificationResult]:
+        """Classify several texts, running the SVM once for the whole batch"""
+        if not texts:
+            return []
+        
+        # Segmentation runs for the whole batch at once (in parallel when the pool is enabled)
+        segment_start = time.time()
+        cleaned_texts = [TextProcessor.clean_khmer_sentences(text) for text in texts]
+        segmented_texts = self.segment_texts(cleaned_texts)
+        segment_time_per_doc = (time.time() - segment_start) / len(texts)
+        
+        # OOV words of the whole batch are composed together
+        embed_start = time.time()
+        batch_embeddings = self.get_sentence_embeddings([self.filter_stopwords(s) for s in segmented_texts])
+        embed_time_per_doc = (time.time() - embed_start) / len(texts)
+        
+        prepared = []
+        for text, cleaned, segmented, embedding in zip(texts, cleaned_texts, segmented_texts, batch_embeddings):
+            doc_start = time.time()
+            text_stats = AnalyticsEngine.get_text_statistics(text, tokens_from_segmented(segmented))
+            prepared.append((text, cleaned, segmented, embedding, text_stats,
+                             segment_time_per_doc + embed_time_per_doc + time.time() - doc_start))
+        
+        # One predict/decision_function call for the stacked batch embeddings
+        model_start = time.time()
+        embeddings = np.vstack([item[3] for item in prepared])
+        svm_model = self.svm_model
+        predictions = svm_model.predict(embeddings)
+        confidences = self._calculate_confidence_batch(embeddings, predictions, svm_model)
+        model_time_per_doc = (time.time() - model_start) / len(prepared)
+        
+        results = []
+        for (text, cleaned, segmented, embedding, text_stats, doc_time), prediction, confidence_dict in zip(
+                prepared, predictions, confidences):
+            prediction_id = hashlib.md5(f"{text[:100]}{datetime.now()}{len(results)}".encode()).hexdigest()[:8]
+            results.append(ClassificationResult(
+                prediction=prediction,
+                confidence=confidence_dict,
+                processing_time=doc_time + model_time_per_doc,
+                cleaned_text=cleaned,
+                segmented_text=segmented,
+                embedding=embedding,
+                timestamp=datetime.now(),
+                input_text=text,
+                text_statistics=text_stats,
+                prediction_id=prediction_id
+            ))
+        return results
+    
+    def _calculate_confidence_scores(self, embedding_reshaped: np.ndarray) -> Dict[str, float]:
+        """Calculate confidence scores for all categories"""
+        return self._calculate_confidence_batch(embedding_reshaped)[0]
+    
+    def _calculate_confidence_batch(self, embeddings: np.ndarray, predictions=None,
+                                    svm_model=None) -> List[Dict[str, float]]:
+        """Calculate confidence scores for all categories for each row of embeddings"""
+        svm_model = self.svm_model if svm_model is None else svm_model
+        if hasattr(svm_model, 'decision_function'):
+            decision_scores = np.atleast_2d(svm_model.decision_function(embeddings))
+            # Convert to probabilities using a row-wise softmax
+            exp_scores = np.exp(decision_scores - np.max(decision_scores, axis=1, keepdims=True))
+            probabilities = exp_scores / np.sum(exp_scores, axis=1, keepdims=True)
+            
+            confidence_dicts = []
+            for row in probabilities:
+                confidence_dict = {}
+                for i, category in enumerate(Config.CATEGORIES):
+                    confidence_dict[category] = row[i] if i < len(row) else 0.0
+                confidence_dicts.append(confidence_dict)
+        else:
+            # Fallback for models without decision_function
+            if predictions is None:
+                predictions = svm_model.predict(embeddings)
+            confidence_dicts = []
+            for pred in predictions:
+                confidence_dict = {pred: 0.95}
+                for cat in Config.CATEGORIES:
+                    if cat != pred:
+                        confidence_dict[cat] = 0.05 / (len(Config.CATEGORIES) - 1)
+                confidence_dicts.append(confidence_dict)
+        
+        return confidence_dicts
+    
+    def clear_cache(self):
+        """Clear the word embedding cache to free memory if needed"""
+        self._word_embedding_cache.clear()
+        gc.collect()
+    
+    def get_cache_info(self):
+        """Get information about the current cache status"""
+        info = {
+            "cached_words": len(self._word_embedding_cache),
+            "cache_size_limit": self._cache_max_size,
+            "cache_usage": f"{len(self._word_embedding_cache)}/{self._cache_max_size}"
+        }
+        if self.subword_vectors is not None:
+            stats = self.subword_vectors.stats
+            info["oov_rate"] = stats.oov_rate
+            info["oov_us_per_token"] = stats.microseconds_per_oov_token
+            if self.subword_vectors.cache is not None:
+                info["persistent_cache"] = self.subword_vectors.cache.stats()
+        return info
+
+def read_pdf_text(pdf_file):
+    """Extract and format the text of a PDF file"""
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    text = ""
+    
+    # Extract text from all pages
+    for page in pdf_reader.pages:
+        page_text = page.extract_text()
+        if page_text:  # Only add non-empty text
+            text += page_text + "\n"
+    
+    if not text.strip():
+        return None
+        
+    # Clean and format the extracted text
+    return format_extracted_text(text)
+
+def format_extracted_text(raw_text):
+    """Format raw extracted text into proper sentences and paragraphs"""
+    if not raw_text:
+        return ""
+    
+    # Remove excessive whitespace and normalize line breaks
+    text = re.sub(r'\s+', ' ', raw_text.strip())
+    
+    # Define sentence-ending punctuation for multiple languages
+    sentence_endings = ['។', '.', '!', '?', ':', ';']
+    paragraph_indicators = ['\n\n', '\n \n', '  \n']
+    
+    # Split into potential sentences
+    sentences = []
+    current_sentence = ""
+    
+    i = 0
+    while i < len(text):
+        char = text[i]
+        current_sentence += char
+        
+        # Check for sentence endings
+        if char in sentence_endings:
+            # Look ahead to see if this is really the end of a sentence
+            next_chars = text[i+1:i+3] if i+1 < len(text) else ""
+            
+            # If followed by whitespace and capital letter or Khmer character, it's likely a sentence end
+            if (next_chars and 
+                (next_chars[0].isspace() and 
+                 (len(next_chars) > 1 and 
+                  (next_chars[1].isupper() or 
+                   next_chars[1] in Config.KHCONST or
+                   next_chars[1].isdigit())))):
+                
+                # Clean up the sentence
+                clean_sentence = current_sentence.strip()
+                if clean_sentence and len(clean_sentence) > 3:  # Avoid very short fragments
+                    sentences.append(clean_sentence)
+                current_sentence = ""
+        i += 1
+    
+    # Add any remaining text as a sentence
+    if current_sentence.strip() and len(current_sentence.strip()) > 3:
+        sentences.append(current_sentence.strip())
+    
+    # Group sentences into paragraphs
+    if not sentences:
+        return raw_text.strip()
+    
+    # Smart paragraph grouping
+    paragraphs = []
+    current_paragraph = []
+    
+    for sentence in sentences:
+        current_paragraph.append(sentence)
+        
+        # Start new paragraph if:
+        # 1. Current paragraph has 3+ sentences, or
+        # 2. Sentence seems to be a title/header (short and ends with certain punctuation)
+        # 3. Topic seems to change (basic heuristic)
+        
+        should_break = False
+        
+        # Check if we have enough sentences for a paragraph
+        if len(current_paragraph) >= 4:
+            should_break = True
+        
+        # Check if next sentence might be a new topic (if available)
+        current_idx = sentences.index(sentence)
+        if current_idx < len(sentences) - 1:
+            next_sentence = sentences[current_idx + 1]
+            
+            # Simple heuristics for paragraph breaks
+            if (len(sentence) < 50 and  # Short sentence
+                (sentence.endswith(':') or sentence.endswith('។') or sentence.endswith('.'))):
+                should_break = True
+            
+            # If current sentence is very long, consider it a paragraph by itself
+            if len(sentence) > 300:
+                should_break = True
+        
+        if should_break and current_paragraph:
+            paragraph_text = ' '.join(current_paragraph)
+            paragraphs.append(paragraph_text)
+            current_paragraph = []
+    
+    # Add any remaining sentences as final paragraph
+    if current_paragraph:
+        paragraph_text = ' '.join(current_paragraph)
+        paragraphs.append(paragraph_text)
+    
+    # Join paragraphs with double line breaks
+    formatted_text = '\n\n'.join(paragraphs)
+    
+    # Final cleanup
+    formatted_text = re.sub(r'\n\s*\n\s*\n+', '\n\n', formatted_text)  # Remove excessive line breaks
+    formatted_text = re.sub(r'[ \t]+', ' ', formatted_text)  # Normalize spaces
+    
+    return formatted_text.strip()
+
+
+def load_models(config_path: Optional[str] = None):
+    """Load SVM model, FastText model, and configuration without any UI"""
+    svm_model = joblib.load(Config.SVM_MODEL_PATH)
+    with open(config_path or Config.CONFIG_PATH, "r") as f:
+        config = json.load(f)
+    
+    return svm_model, load_embedding_model(config), config
+
+def load_embedding_model(config: Dict[str, Any]):
+    """Quantized embedding bundle if one is configured, otherwise the FastText .bin model"""
+    bundle_path = config.get("embedding_bundle") or Config.EMBEDDING_BUNDLE_PATH
+    if is_bundle(bundle_path):
+        return EmbeddingBundle.load(bundle_path)
+    if bundle_path:
+        logging.warning(f"Embedding bundle not found at {bundle_path}; loading the FastText model")
+    
+    # Prefer the configured model path, fall back to the project root copy
+    model_path = config.get("model_path")
+    if not model_path or not os.path.exists(model_path):
+        model_path = Config.FASTTEXT_MODEL_PATH
+    
+    from gensim.models.fasttext import load_facebook_model
+    return load_facebook_model(model_path)
+
+def create_classification_engine(config_path: Optional[str] = None) -> "ClassificationEngine":
+    """Load the models and build a ready-to-use classification engine"""
+    svm_model, fasttext_model, config = load_models(config_path)
+    return ClassificationEngine(svm_model, fasttext_model, config.get("embedding_method", "mean"))
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+Quantized Embedding Bundle
+==========================
+Compact on-disk replacement for the 300-dim float32 FastText model
+(``cc.km.300.bin``): the vocabulary matrix and the subword n-gram bucket
+matrix are stored as
+
+- ``float16``: half precision (2 bytes per value)
+- ``int8``: one signed byte per value plus one float32 scale per row
+- ``pq``: product quantization, one uint8 code per subspace and row plus a
+  256-centroid codebook per subspace (e.g. 50 bytes per 300-dim row)
+
+A bundle is a directory of ``.npy`` arrays plus ``meta.json`` and
+``vocab.txt`` (the token index). ``EmbeddingBundle`` memory-maps the arrays and dequantizes
+only the rows a document needs, so it loads in well under a second and
+``ClassificationEngine`` can use it in place of the gensim model: it offers
+``get_word_vector`` and a vectorized ``mean_vector``. Out-of-vocabulary
+words are embedded from their hashed character n-grams exactly like
+FastText.
+
+A pruned bundle (``prune``) is built for our news corpus only: it keeps the
+vectors of the top-N words by frequency in the preprocessed articles and
+only the n-gram buckets those articles' other tokens hash to (``bucket_ids``
+maps the kept rows back to FastText bucket numbers; n-grams whose bucket was
+dropped are left out of the OOV average). It loads in a fraction of a
+second instead of minutes.
+
+Usage:
+    python embedding_bundle.py export --model cc.km.300.bin --precision int8 --output bundles/cc.km.300.int8
+    python embedding_bundle.py prune --model cc.km.300.bin --corpus preprocessed_articles --top-n 100000 \
+        --output bundles/news.float16
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from subword_ngrams import SubwordVectors
+
+PRECISIONS = ("float32", "float16", "int8", "pq")
+BUNDLE_VERSION = 1
+_EXPORT_CHUNK_ROWS = 100000
+
+
+# ----------------------------------------------------------------------
+# FastText subword hashing
+# ----------------------------------------------------------------------
+
+def ft_hash(ngram: str) -> int:
+    """FastText's 32-bit FNV-1a hash (bytes sign-extended, as in the reference implementation)"""
+    h = 2166136261
+    for byte in ngram.encode("utf-8"):
+        h = ((h ^ (byte - 256 if byte > 127 else byte)) * 16777619) & 0xFFFFFFFF
+    return h
+
+
+def char_ngrams(word: str, min_n: int, max_n: int) -> List[str]:
+    """Character n-grams of <word> (single boundary characters excluded, as in FastText)"""
+    extended = f"<{word}>"
+    ngrams = []
+    for n in range(min_n, max_n + 1):
+        for i in range(len(extended) - n + 1):
+            if n == 1 and (i == 0 or i == len(extended) - 1):
+                continue
+            ngrams.append(extended[i:i + n])
+    return ngrams
+
+
+def ngram_buckets(word: str, min_n: int, max_n: int, bucket: int) -> List[int]:
+    """Rows of the n-gram matrix used for an out-of-vocabulary word"""
+    if bucket == 0 or max_n < min_n:
+        return []
+    return [ft_hash(ngram) % bucket for ngram in char_ngrams(word, min_n, max_n)]
+
+
+# ----------------------------------------------------------------------
+# Quantized matrices
+# ----------------------------------------------------------------------
+
+class QuantizedMatrix:
+    """Row-addressable matrix stored in one of PRECISIONS"""
+
+    def __init__(self, precision: str, arrays: Dict[str, np.ndarray], shape):
+        self.precision = precision
+        self.arrays = arrays
+        self.shape = tuple(shape)
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(array.nbytes for array in self.arrays.values()))
+
+    def rows(self, indices) -> np.ndarray:
+        """Dequantized float32 rows"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if self.precision in ("float32", "float16"):
+            return np.asarray(self.arrays["values"][indices], dtype=np.float32)
+        if self.precision == "int8":
+            return self.arrays["codes"][indices].astype(np.float32) * self.arrays["scales"][indices, None]
+        codebooks, codes = self.arrays["codebooks"], self.arrays["codes"][indices]
+        subspaces = np.arange(codebooks.shape[0])
+        return codebooks[subspaces, codes].reshape(len(indices), -1)
+
+    def row_sum(self, indices) -> np.ndarray:
+        """Sum of dequantized rows (duplicates counted) without materializing them all at once"""
+        return self.rows(indices).sum(axis=0, dtype=np.float32)
+
+    def save(self, directory: str, name: str):
+        for key, array in self.arrays.items():
+            np.save(os.path.join(directory, f"{name}.{key}.npy"), array)
+
+    @classmethod
+    def load(cls, directory: str, name: str, precision: str, shape, mmap: bool = True) -> "QuantizedMatrix":
+        keys = {"float32": ["values"], "float16": ["values"], "int8": ["codes", "scales"],
+                "pq": ["codes", "codebooks"]}[precision]
+        arrays = {key: np.load(os.path.join(directory, f"{name}.{key}.npy"), mmap_mode="r" if mmap else None)
+                  for key in keys}
+        return cls(precision, arrays, shape)
+
+
+def _iter_chunks(matrix: np.ndarray, chunk_rows: int = _EXPORT_CHUNK_ROWS):
+    for start in range(0, matrix.shape[0], chunk_rows):
+        yield start, np.asarray(matrix[start:start + chunk_rows], dtype=np.float32)
+
+
+def _train_pq_codebooks(matrix: np.ndarray, subspaces: int, sample_rows: int, seed: int) -> np.ndarray:
+    """k-means (256 centroids) codebook per subspace, trained on a row sample"""
+    from sklearn.cluster import KMeans
+
+    rng = np.random.default_rng(seed)
+    rows = matrix.shape[0]
+    sample = np.asarray(matrix[np.sort(rng.choice(rows, size=min(rows, sample_rows), replace=False))],
+                        dtype=np.float32)
+    dim = matrix.shape[1] // subspaces
+    centroids = min(256, len(sample))
+    codebooks = np.zeros((subspaces, 256, dim), dtype=np.float32)
+    for s in range(subspaces):
+        kmeans = KMeans(n_clusters=centroids, n_init=1, max_iter=50, random_state=seed)
+        kmeans.fit(sample[:, s * dim:(s + 1) * dim])
+        codebooks[s, :centroids] = kmeans.cluster_centers_
+    return codebooks
+
+
+def quantize(matrix: np.ndarray, precision: str, pq_subspaces: int = 50, pq_sample_rows: int = 100000,
+             seed: int = 0) -> QuantizedMatrix:
+    """Quantize a float matrix chunk by chunk"""
+    rows, dim = matrix.shape
+    if precision in ("float32", "float16"):
+        values = np.empty((rows, dim), dtype=np.float32 if precision == "float32" else np.float16)
+        for start, chunk in _iter_chunks(matrix):
+            values[start:start + len(chunk)] = chunk
+        return QuantizedMatrix(precision, {"values": values}, (rows, dim))
+
+    if precision == "int8":
+        codes = np.empty((rows, dim), dtype=np.int8)
+        scales = np.empty(rows, dtype=np.float32)
+        for start, chunk in _iter_chunks(matrix):
+            scale = np.abs(chunk).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            codes[start:start + len(chunk)] = np.clip(np.rint(chunk / scale[:, None]), -127, 127)
+            scales[start:start + len(chunk)] = scale
+        return QuantizedMatrix(precision, {"codes": codes, "scales": scales}, (rows, dim))
+
+    if precision == "pq":
+        if dim % pq_subspaces:
+            raise ValueError(f"Vector size {dim} is not divisible by {pq_subspaces} subspaces")
+        codebooks = _train_pq_codebooks(matrix, pq_subspaces, pq_sample_rows, seed)
+        sub_dim = dim // pq_subspaces
+        codes = np.empty((rows, pq_subspaces), dtype=np.uint8)
+        for start, chunk in _iter_chunks(matrix, 20000):
+            for s in range(pq_subspaces):
+                sub = chunk[:, s * sub_dim:(s + 1) * sub_dim]
+                # argmin ||x - c||^2 = argmin (||c||^2 - 2 x.c)
+                distances = (codebooks[s] ** 2).sum(axis=1)[None, :] - 2.0 * sub @ codebooks[s].T
+                codes[start:start + len(chunk), s] = distances.argmin(axis=1)
+        return QuantizedMatrix(precision, {"codes": codes, "codebooks": codebooks}, (rows, dim))
+
+    raise ValueError(f"Unknown precision: {precision} (expected one of {', '.join(PRECISIONS)})")
+
+
+# ----------------------------------------------------------------------
+# Bundle
+# ----------------------------------------------------------------------
+
+class EmbeddingBundle:
+    """Quantized FastText word and subword vectors, usable in place of the gensim model"""
+
+    def __init__(self, words: Sequence[str], vectors: QuantizedMatrix, ngrams: QuantizedMatrix,
+                 min_n: int, max_n: int, meta: Optional[Dict] = None, bucket: Optional[int] = None,
+                 bucket_ids: Optional[np.ndarray] = None):
+        self.words = list(words)
+        self.key_to_index = {word: i for i, word in enumerate(self.words)}
+        self.vectors = vectors
+        self.ngrams = ngrams
+        self.min_n = min_n
+        self.max_n = max_n
+        # Hash modulus of the n-gram table; bucket_ids (sorted) lists the FastText
+        # buckets kept as rows of a pruned table
+        self.bucket = bucket if bucket is not None else ngrams.shape[0]
+        self.bucket_ids = bucket_ids
+        self.vector_size = vectors.shape[1]
+        self.meta = meta or {}
+        self.subwords = SubwordVectors(self.key_to_index, vectors, ngrams, min_n, max_n, self.bucket, bucket_ids)
+
+    @property
+    def precision(self) -> str:
+        return self.vectors.precision
+
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes + self.ngrams.nbytes
+
+    def ngram_rows(self, word: str) -> np.ndarray:
+        """Rows of the n-gram table composing an out-of-vocabulary word"""
+        buckets = np.asarray(ngram_buckets(word, self.min_n, self.max_n, self.bucket), dtype=np.int64)
+        if self.bucket_ids is None or not len(buckets):
+            return buckets
+        positions = np.minimum(np.searchsorted(self.bucket_ids, buckets), len(self.bucket_ids) - 1)
+        return positions[self.bucket_ids[positions] == buckets]
+
+    def __contains__(self, word: str) -> bool:
+        # Like gensim 4: with n-grams every word has a vector
+        return word in self.key_to_index or self.bucket > 0
+
+    def get_word_vector(self, word: str) -> np.ndarray:
+        """Vector of a word, the origin for an OOV word without n-grams (like gensim 4)"""
+        index = self.key_to_index.get(word)
+        if index is not None:
+            return self.vectors.rows([index])[0]
+        if self.bucket == 0:
+            raise KeyError(f"cannot calculate vector for OOV word without ngrams: {word}")
+        rows = self.ngram_rows(word)
+        if not len(rows):
+            return np.zeros(self.vector_size, dtype=np.float32)
+        return self.ngrams.row_sum(rows) / len(rows)
+
+    def mean_vector(self, words: Iterable[str]) -> np.ndarray:
+        """Mean of the word vectors of words (skipping words without a vector)"""
+        return self.subwords.mean_vector(list(words))
+
+    def mean_vectors(self, documents: Sequence[Sequence[str]]) -> np.ndarray:
+        """Mean word vector of every document, OOV words of the batch composed together"""
+        return self.subwords.mean_vectors(documents)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.vectors.save(directory, "vectors")
+        self.ngrams.save(directory, "ngrams")
+        if self.bucket_ids is not None:
+            np.save(os.path.join(directory, "bucket_ids.npy"), self.bucket_ids)
+        with open(os.path.join(directory, "vocab.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(self.words))
+        meta = dict(self.meta, version=BUNDLE_VERSION, precision=self.precision, min_n=self.min_n,
+                    max_n=self.max_n, vector_size=self.vector_size, vocab_size=len(self.words),
+                    bucket=self.bucket, pruned=self.bucket_ids is not None,
+                    vectors_shape=list(self.vectors.shape),
+                    ngrams_shape=list(self.ngrams.shape))
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "EmbeddingBundle":
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, "vocab.txt"), "r", encoding="utf-8") as f:
+            words = f.read().split("\n") if meta["vocab_size"] else []
+        precision = meta["precision"]
+        vectors = QuantizedMatrix.load(directory, "vectors", precision, meta["vectors_shape"], mmap)
+        ngrams = QuantizedMatrix.load(directory, "ngrams", precision, meta["ngrams_shape"], mmap)
+        bucket_ids = np.load(os.path.join(directory, "bucket_ids.npy")) if meta.get("pruned") else None
+        return cls(words, vectors, ngrams, meta["min_n"], meta["max_n"], meta, meta["bucket"], bucket_ids)
+
+    @classmethod
+    def from_gensim(cls, fasttext_model, precision: str = "float16", **quantize_options) -> "EmbeddingBundle":
+        """Quantize the word and n-gram matrices of a gensim FastText model"""
+        wv = getattr(fasttext_model, "wv", fasttext_model)
+        vectors = quantize(wv.vectors, precision, **quantize_options)
+        ngrams = quantize(wv.vectors_ngrams, precision, **quantize_options)
+        return cls(wv.index_to_key, vectors, ngrams, wv.min_n, wv.max_n,
+                   {"source_bucket": int(wv.bucket)})
+
+    @classmethod
+    def pruned_from_gensim(cls, fasttext_model, token_counts: Counter, top_n: int = 100000,
+                           precision: str = "float16", **quantize_options) -> "EmbeddingBundle":
+        """Bundle with the top_n corpus words and the n-gram buckets of the remaining corpus tokens"""
+        wv = getattr(fasttext_model, "wv", fasttext_model)
+        kept = [word for word, _ in token_counts.most_common() if word in wv.key_to_index][:top_n]
+        kept_set = set(kept)
+        vectors = quantize(wv.vectors[[wv.key_to_index[word] for word in kept]], precision, **quantize_options)
+
+        # Buckets composing every corpus token that is not kept as a full word
+        buckets = set()
+        for word in token_counts:
+            if word not in kept_set:
+                buckets.update(ngram_buckets(word, wv.min_n, wv.max_n, wv.bucket))
+        bucket_ids = np.array(sorted(buckets), dtype=np.int64)
+        ngrams = quantize(wv.vectors_ngrams[bucket_ids], precision, **quantize_options)
+        meta = {"source_bucket": int(wv.bucket), "source_vocab_size": len(wv.index_to_key),
+                "corpus_tokens": int(sum(token_counts.values())), "corpus_vocab_size": len(token_counts)}
+        return cls(kept, vectors, ngrams, wv.min_n, wv.max_n, meta, int(wv.bucket), bucket_ids)
+
+
+def count_corpus_tokens(corpus_dir: str, metadata_path: Optional[str] = None) -> Counter:
+    """Token frequencies of the segmented articles (optionally only those listed in metadata.csv)"""
+    if metadata_path:
+        import pandas as pd
+        names = [f"{doc_id}.txt" for doc_id in pd.read_csv(metadata_path)["docId"]]
+    else:
+        names = sorted(name for name in os.listdir(corpus_dir) if name.endswith(".txt"))
+    counts: Counter = Counter()
+    for name in names:
+        path = os.path.join(corpus_dir, name)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                counts.update(f.read().split())
+    return counts
+
+
+def is_bundle(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(os.path.join(path, "meta.json"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a quantized FastText embedding bundle")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Quantize a Facebook FastText .bin model")
+    export_parser.add_argument("--model", default="cc.km.300.bin")
+    export_parser.add_argument("--precision", choices=PRECISIONS, default="int8")
+    export_parser.add_argument("--pq-subspaces", type=int, default=50)
+    export_parser.add_argument("--pq-sample-rows", type=int, default=100000)
+    export_parser.add_argument("--output", required=True, help="Bundle directory")
+
+    prune_parser = subparsers.add_parser("prune", help="Build a corpus-pruned bundle for fast cold starts")
+    prune_parser.add_argument("--model", default="cc.km.300.bin")
+    prune_parser.add_argument("--corpus", default="preprocessed_articles", help="Segmented article directory")
+    prune_parser.add_argument("--metadata", default=None, help="Only count the articles listed in metadata.csv")
+    prune_parser.add_argument("--top-n", type=int, default=100000, help="Words kept with full vectors")
+    prune_parser.add_argument("--precision", choices=PRECISIONS, default="float16")
+    prune_parser.add_argument("--output", required=True, help="Bundle directory")
+
+    info_parser = subparsers.add_parser("info", help="Describe a bundle")
+    info_parser.add_argument("bundle")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from gensim.models.fasttext import load_facebook_model
+
+        start = time.time()
+        print(f"📦 Loading {args.model}...")
+        model = load_facebook_model(args.model)
+        print(f"🔧 Quantizing to {args.precision}...")
+        bundle = EmbeddingBundle.from_gensim(model, args.precision, pq_subspaces=args.pq_subspaces,
+                                             pq_sample_rows=args.pq_sample_rows)
+        bundle.save(args.output)
+        print(f"✅ {len(bundle.words):,} words + {bundle.bucket:,} n-gram buckets, "
+              f"{bundle.nbytes / 1e6:,.1f} MB -> {args.output} ({time.time() - start:.1f}s)")
+        return 0
+
+    if args.command == "prune":
+        from gensim.models.fasttext import load_facebook_model
+
+        start = time.time()
+        token_counts = count_corpus_tokens(args.corpus, args.metadata)
+        print(f"📚 {sum(token_counts.values()):,} corpus tokens, {len(token_counts):,} distinct")
+        print(f"📦 Loading {args.model}...")
+        model = load_facebook_model(args.model)
+        bundle = EmbeddingBundle.pruned_from_gensim(model, token_counts, args.top_n, args.precision)
+        bundle.save(args.output)
+        print(f"✅ {len(bundle.words):,} words + {len(bundle.bucket_ids):,} of {bundle.bucket:,} n-gram buckets, "
+              f"{bundle.nbytes / 1e6:,.1f} MB -> {args.output} ({time.time() - start:.1f}s)")
+        return 0
+
+    start = time.perf_counter()
+    bundle = EmbeddingBundle.load(args.bundle)
+    buckets = len(bundle.bucket_ids) if bundle.bucket_ids is not None else bundle.bucket
+    print(f"{args.bundle}: {bundle.precision}, {len(bundle.words):,} words, {buckets:,} buckets, "
+          f"dim {bundle.vector_size}, {bundle.nbytes / 1e6:,.1f} MB, "
+          f"loaded in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming Result Exporters
+==========================
+Writes classification results to a file in fixed-size chunks instead of
+building one large JSON string in memory. Two formats are supported:
+
+- NDJSON: one JSON record per line, written incrementally
+- Parquet: columnar file written one row group per chunk (requires pyarrow)
+
+The exporters accept any iterable of ClassificationResult objects (session
+history, batch runs, background jobs) and let the caller choose whether the
+full input text and the 300-dim embedding are included.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+EXPORT_FORMATS = {
+    "ndjson": {"extension": ".ndjson", "mime": "application/x-ndjson"},
+    "parquet": {"extension": ".parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def result_record(result, category_labels: Optional[Dict[str, str]] = None,
+                  include_text: bool = True, include_embedding: bool = False) -> Dict[str, Any]:
+    """Build the export record of a single classification result"""
+    record = {
+        "prediction": result.prediction,
+        "category_label": (category_labels or {}).get(result.prediction, result.prediction),
+        "confidence": float(max(result.confidence.values())),
+        "all_confidences": {cat: float(conf) for cat, conf in result.confidence.items()},
+        "processing_time": result.processing_time,
+        "timestamp": result.timestamp.isoformat(),
+        "prediction_id": result.prediction_id,
+        "text_statistics": {key: _to_builtin(value) for key, value in result.text_statistics.items()},
+    }
+    if include_text:
+        record["text"] = result.input_text
+    if include_embedding:
+        record["embedding"] = np.asarray(result.embedding, dtype=np.float32).tolist()
+    return record
+
+
+def _to_builtin(value):
+    """Convert NumPy scalars to plain Python values for serialization"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _chunks(results: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    chunk = []
+    for result in results:
+        chunk.append(result)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _output_path(path: Optional[str], export_format: str) -> str:
+    if path:
+        return path
+    fd, path = tempfile.mkstemp(
+        prefix=f"classification_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}_",
+        suffix=EXPORT_FORMATS[export_format]["extension"]
+    )
+    os.close(fd)
+    return path
+
+
+def write_ndjson(results: Iterable[Any], path: Optional[str] = None,
+                 category_labels: Optional[Dict[str, str]] = None, include_text: bool = True,
+                 include_embedding: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """Stream results to an NDJSON file (a temp file by default) and return its path"""
+    path = _output_path(path, "ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in _chunks(results, chunk_size):
+            f.write("".join(
+                json.dumps(result_record(r, category_labels, include_text, include_embedding),
+                           ensure_ascii=False) + "\n"
+                for r in chunk
+            ))
+    return path
+
+
+def _parquet_schema(categories: List[str], include_text: bool, include_embedding: bool, embedding_dim: int):
+    import pyarrow as pa
+
+    fields = [
+        pa.field("prediction_id", pa.string()),
+        pa.field("prediction", pa.dictionary(pa.int8(), pa.string())),
+        pa.field("category_label", pa.dictionary(pa.int8(), pa.string())),
+        pa.field("confidence", pa.float32()),
+    ]
+    fields += [pa.field(f"confidence_{cat}", pa.float32()) for cat in categories]
+    fields += [
+        pa.field("processing_time", pa.float64()),
+        pa.field("timestamp", pa.timestamp("us")),
+        pa.field("characters", pa.int32()),
+        pa.field("words", pa.int32()),
+        pa.field("sentences", pa.int32()),
+        pa.field("text_statistics", pa.string()),
+    ]
+    if include_text:
+        fields.append(pa.field("text", pa.large_string()))
+    if include_embedding:
+        fields.append(pa.field("embedding", pa.list_(pa.float32(), embedding_dim)))
+    return pa.schema(fields)
+
+
+def write_parquet(results: Iterable[Any], path: Optional[str] = None,
+                  category_labels: Optional[Dict[str, str]] = None, categories: Optional[List[str]] = None,
+                  include_text: bool = True, include_embedding: bool = False,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE, embedding_dim: int = 300) -> str:
+    """Stream results to a Parquet file, one row group per chunk, and return its path"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+    categories = list(categories or (category_labels or {}).keys())
+    schema = _parquet_schema(categories, include_text, include_embedding, embedding_dim)
+    path = _output_path(path, "parquet")
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(results, chunk_size):
+            columns = {
+                "prediction_id": [r.prediction_id for r in chunk],
+                "prediction": [r.prediction for r in chunk],
+                "category_label": [(category_labels or {}).get(r.prediction, r.prediction) for r in chunk],
+                "confidence": [float(max(r.confidence.values())) for r in chunk],
+            }
+            for cat in categories:
+                columns[f"confidence_{cat}"] = [float(r.confidence.get(cat, 0.0)) for r in chunk]
+            columns["processing_time"] = [r.processing_time for r in chunk]
+            columns["timestamp"] = [r.timestamp for r in chunk]
+            columns["characters"] = [int(r.text_statistics.get("characters", 0)) for r in chunk]
+            columns["words"] = [int(r.text_statistics.get("words", 0)) for r in chunk]
+            columns["sentences"] = [int(r.text_statistics.get("sentences", 0)) for r in chunk]
+            columns["text_statistics"] = [
+                json.dumps({k: _to_builtin(v) for k, v in r.text_statistics.items()}, ensure_ascii=False)
+                for r in chunk
+            ]
+            if include_text:
+                columns["text"] = [r.input_text for r in chunk]
+            if include_embedding:
+                flat = np.stack([np.asarray(r.embedding, dtype=np.float32) for r in chunk]).ravel()
+                columns["embedding"] = pa.FixedSizeListArray.from_arrays(pa.array(flat), embedding_dim)
+
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+    return path
+
+
+def export_to_file(results: Iterable[Any], export_format: str = "ndjson", path: Optional[str] = None,
+                   **options) -> str:
+    """Dispatch to the streaming writer for export_format and return the written path"""
+    if export_format == "ndjson":
+        options.pop("categories", None)
+        options.pop("embedding_dim", None)
+        return write_ndjson(results, path, **options)
+    if export_format == "parquet":
+        return write_parquet(results, path, **options)
+    raise ValueError(f"Unsupported export format: {export_format}")
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel FastText Feature Extraction
+====================================
+Replacement for ``extract_fasttext_features_with_timing`` of
+``4A_FastText_Model_Development.ipynb``: mean FastText vectors of the
+preprocessed articles, split exactly like the notebook (stratified,
+test_size=0.2, random_state=42 over the non-empty articles of
+metadata.csv).
+
+- the model is an ``EmbeddingBundle`` (a float32 bundle is exported from
+  ``cc.km.300.bin`` once if needed) that every worker process memory-maps,
+  so the vectors are shared through the page cache instead of copied
+- feature rows are written straight into preallocated ``.npy`` memmaps
+  (``X_train_fasttext.npy`` / ``X_test_fasttext.npy``); no list of arrays
+  is held in RAM
+- a per-row progress memmap makes extraction restartable at row
+  granularity: an interrupted run continues with the rows not written yet
+- the finished arrays and the category-coded labels form a feature store
+  (``feature_store.py``), readable through ``feature_store.load``
+- ``feature_statistics.json`` has the same fields as the notebook's
+
+Usage:
+    python extract_fasttext_features.py --corpus preprocessed_articles --metadata metadata.csv \\
+        --model cc.km.300.bin --output FastText/features --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from embedding_bundle import EmbeddingBundle, is_bundle
+from feature_store import save_labels, write_sidecar
+
+SPLITS = ("train", "test")
+STATE_NAME = "extraction_state.json"
+_STATS_CHUNK_ROWS = 4096
+
+
+def load_documents(metadata_path: str, corpus_dir: str) -> Tuple[List[str], List[str]]:
+    """(doc_ids, labels) of the non-empty preprocessed articles, in metadata order (as the notebook)"""
+    import pandas as pd
+
+    doc_ids, labels = [], []
+    metadata = pd.read_csv(metadata_path)
+    for doc_id, category in zip(metadata["docId"], metadata["category"]):
+        path = os.path.join(corpus_dir, f"{doc_id}.txt")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read().strip():
+                    doc_ids.append(doc_id)
+                    labels.append(category)
+    return doc_ids, labels
+
+
+def split_documents(doc_ids: Sequence[str], labels: Sequence[str], test_size: float = 0.2,
+                    random_state: int = 42) -> Dict[str, Tuple[List[str], List[str]]]:
+    """The notebook's stratified split (the permutation depends only on the labels)"""
+    from sklearn.model_selection import train_test_split
+
+    train_ids, test_ids, train_labels, test_labels = train_test_split(
+        list(doc_ids), list(labels), test_size=test_size, random_state=random_state, stratify=list(labels)
+    )
+    return {"train": (train_ids, train_labels), "test": (test_ids, test_labels)}
+
+
+def ensure_bundle(bundle_path: str, model_path: str) -> str:
+    """Path of a memory-mappable float32 bundle, exported from the .bin model on first use"""
+    if not is_bundle(bundle_path):
+        from gensim.models.fasttext import load_facebook_model
+
+        logging.info(f"Exporting {model_path} to a float32 bundle at {bundle_path} (one-time)")
+        EmbeddingBundle.from_gensim(load_facebook_model(model_path), "float32").save(bundle_path)
+    return bundle_path
+
+
+# ----------------------------------------------------------------------
+# Worker processes
+# ----------------------------------------------------------------------
+
+_worker_state = {}
+
+
+def _init_worker(bundle_path: str, corpus_dir: str, output_dir: str):
+    _worker_state["bundle"] = EmbeddingBundle.load(bundle_path, mmap=True)
+    _worker_state["corpus_dir"] = corpus_dir
+    _worker_state["output_dir"] = output_dir
+    _worker_state["arrays"] = {}
+
+
+def _open_arrays(split: str):
+    arrays = _worker_state["arrays"]
+    if split not in arrays:
+        output_dir = _worker_state["output_dir"]
+        arrays[split] = (np.load(os.path.join(output_dir, f"X_{split}_fasttext.npy"), mmap_mode="r+"),
+                         np.load(os.path.join(output_dir, f"X_{split}_fasttext.progress.npy"), mmap_mode="r+"))
+    return arrays[split]
+
+
+def _extract_rows(split: str, rows: List[int], doc_ids: List[str]) -> Tuple[str, int, float]:
+    """Embed the documents of rows and write them into the split's memmap"""
+    start = time.perf_counter()
+    documents = []
+    for doc_id in doc_ids:
+        with open(os.path.join(_worker_state["corpus_dir"], f"{doc_id}.txt"), "r", encoding="utf-8") as f:
+            documents.append(f.read().strip().split())
+    features, progress = _open_arrays(split)
+    features[rows] = _worker_state["bundle"].mean_vectors(documents)
+    features.flush()
+    # Rows are marked done only once their features are on disk
+    progress[rows] = 1
+    progress.flush()
+    return split, len(rows), time.perf_counter() - start
+
+
+# ----------------------------------------------------------------------
+# Extraction
+# ----------------------------------------------------------------------
+
+def _ids_digest(doc_ids: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(doc_ids).encode("utf-8")).hexdigest()
+
+
+def feature_statistics(X_train: np.ndarray, test_samples: int) -> Dict:
+    """feature_statistics.json of the notebook, computed chunk by chunk over the memmap"""
+    count, total, total_sq = 0, 0.0, 0.0
+    minimum, maximum = np.inf, -np.inf
+    for start in range(0, len(X_train), _STATS_CHUNK_ROWS):
+        chunk = np.asarray(X_train[start:start + _STATS_CHUNK_ROWS], dtype=np.float64)
+        count += chunk.size
+        total += chunk.sum()
+        total_sq += np.square(chunk).sum()
+        minimum, maximum = min(minimum, chunk.min()), max(maximum, chunk.max())
+    mean = total / count if count else 0.0
+    std = float(np.sqrt(max(total_sq / count - mean * mean, 0.0))) if count else 0.0
+    return {
+        "feature_count": int(X_train.shape[1]),
+        "train_samples": int(X_train.shape[0]),
+        "test_samples": int(test_samples),
+        "feature_type": "fasttext_mean_embeddings",
+        "feature_range": {"min": float(minimum), "max": float(maximum), "mean": float(mean), "std": std},
+    }
+
+
+def extract_features(corpus_dir: str, metadata_path: str, bundle_path: str, output_dir: str,
+                     workers: Optional[int] = None, chunk_size: int = 64) -> Dict:
+    """Extract (or finish extracting) the train/test feature memmaps; returns the statistics"""
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, workers or os.cpu_count() or 1)
+    doc_ids, labels = load_documents(metadata_path, corpus_dir)
+    splits = split_documents(doc_ids, labels)
+    bundle = EmbeddingBundle.load(bundle_path)
+    fingerprint = bundle.subwords.fingerprint()
+
+    # Reuse partially written arrays only for the same model and the same split
+    state_path = os.path.join(output_dir, STATE_NAME)
+    state = {"fingerprint": fingerprint, "splits": {split: _ids_digest(splits[split][0]) for split in SPLITS}}
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            resumable = json.load(f) == state
+    except (OSError, ValueError):
+        resumable = False
+
+    tasks = []
+    for split in SPLITS:
+        ids, split_labels = splits[split]
+        features_path = os.path.join(output_dir, f"X_{split}_fasttext.npy")
+        progress_path = os.path.join(output_dir, f"X_{split}_fasttext.progress.npy")
+        shape = (len(ids), bundle.vector_size)
+        if resumable and os.path.exists(features_path):
+            # No progress file left: the split was completed by an earlier run
+            pending = np.flatnonzero(np.load(progress_path, mmap_mode="r") == 0) \
+                if os.path.exists(progress_path) else np.arange(0)
+        else:
+            np.lib.format.open_memmap(features_path, mode="w+", dtype=np.float32, shape=shape).flush()
+            np.lib.format.open_memmap(progress_path, mode="w+", dtype=np.uint8, shape=(len(ids),)).flush()
+            pending = np.arange(len(ids))
+        save_labels(os.path.join(output_dir, f"y_{split}_fasttext.npy"), split_labels, sorted(set(labels)))
+        for start in range(0, len(pending), chunk_size):
+            rows = pending[start:start + chunk_size].tolist()
+            tasks.append((split, rows, [ids[row] for row in rows]))
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+    total_rows = sum(len(rows) for _, rows, _ in tasks)
+    logging.info(f"Extracting {total_rows:,} feature rows ({len(tasks):,} work units, {workers} workers)")
+    start = time.perf_counter()
+    done = 0
+    if workers == 1:
+        _init_worker(bundle_path, corpus_dir, output_dir)
+        results = (_extract_rows(*task) for task in tasks)
+        for _, rows, _ in results:
+            done += rows
+    elif tasks:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(bundle_path, corpus_dir, output_dir)) as executor:
+            futures = [executor.submit(_extract_rows, *task) for task in tasks]
+            for future in as_completed(futures):
+                done += future.result()[1]
+                if done % 1000 < chunk_size:
+                    logging.info(f"   Progress: {done:,}/{total_rows:,} rows")
+    elapsed = time.perf_counter() - start
+    if total_rows:
+        logging.info(f"Extracted {total_rows:,} rows in {elapsed:.1f}s ({total_rows / max(elapsed, 1e-9):.1f} docs/s)")
+
+    # Finished: drop the progress markers; the sidecar makes the split a feature store
+    for split in SPLITS:
+        progress_path = os.path.join(output_dir, f"X_{split}_fasttext.progress.npy")
+        if os.path.exists(progress_path) and np.all(np.load(progress_path, mmap_mode="r") == 1):
+            os.remove(progress_path)
+        if not os.path.exists(progress_path):
+            features_path = os.path.join(output_dir, f"X_{split}_fasttext.npy")
+            write_sidecar(features_path, "features", np.load(features_path, mmap_mode="r"))
+
+    stats = feature_statistics(np.load(os.path.join(output_dir, "X_train_fasttext.npy"), mmap_mode="r"),
+                               len(splits["test"][0]))
+    with open(os.path.join(output_dir, "feature_statistics.json"), "w") as f:
+        json.dump(stats, f, indent=4)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract FastText mean features into memory-mapped arrays")
+    parser.add_argument("--corpus", default="preprocessed_articles")
+    parser.add_argument("--metadata", default="metadata.csv")
+    parser.add_argument("--model", default="cc.km.300.bin", help="FastText .bin model (exported to --bundle once)")
+    parser.add_argument("--bundle", default=os.path.join("bundles", "cc.km.300.float32"),
+                        help="Memory-mappable embedding bundle shared by the workers")
+    parser.add_argument("--output", default=os.path.join("FastText", "features"))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Rows per work unit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    start = time.time()
+    bundle_path = ensure_bundle(args.bundle, args.model)
+    stats = extract_features(args.corpus, args.metadata, bundle_path, args.output, args.workers, args.chunk_size)
+    print(f"✅ {stats['train_samples']:,} train + {stats['test_samples']:,} test rows of {stats['feature_count']} "
+          f"features -> {args.output} in {time.time() - start:.1f}s")
+    print(f"   Feature range: [{stats['feature_range']['min']:.4f}, {stats['feature_range']['max']:.4f}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-Mapped Feature Store
+===========================
+Feature matrices and labels stored as raw ``.npy`` arrays with a JSON
+sidecar instead of joblib pickles, so they open with ``mmap`` in
+milliseconds and rows can be sliced without reading the whole file.
+
+For ``Demo_model/X_train_fasttext.joblib`` the store is
+
+- ``Demo_model/X_train_fasttext.npy``: the float matrix
+- ``Demo_model/X_train_fasttext.json``: the sidecar (kind, dtype, shape)
+
+and for labels (``y_*_fasttext``) the ``.npy`` holds compact integer
+category codes (int8 for up to 127 categories) and the sidecar the
+category names.
+
+``load`` is a transparent reader for ``Config.X_TRAIN_PATH`` and the other
+joblib paths: it opens the store next to the path when there is one and
+falls back to the joblib pickle otherwise. Existing pickles are converted
+with:
+
+    python feature_store.py convert Demo_model FastText/features
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+STORE_FORMAT = "khmer-feature-store"
+STORE_VERSION = 1
+
+
+def store_paths(path: str) -> Dict[str, str]:
+    """The .npy and sidecar paths of a store (path with or without its .joblib/.npy extension)"""
+    stem, extension = os.path.splitext(path)
+    if extension not in (".joblib", ".npy", ".json"):
+        stem = path
+    return {"data": stem + ".npy", "sidecar": stem + ".json"}
+
+
+def is_store(path: str) -> bool:
+    paths = store_paths(path)
+    return os.path.exists(paths["data"]) and os.path.exists(paths["sidecar"])
+
+
+def exists(path: str) -> bool:
+    """True when the store or the joblib pickle of path is available"""
+    return is_store(path) or os.path.exists(path)
+
+
+def read_sidecar(path: str) -> Dict:
+    with open(store_paths(path)["sidecar"], "r", encoding="utf-8") as f:
+        sidecar = json.load(f)
+    if sidecar.get("format") != STORE_FORMAT or sidecar.get("version") != STORE_VERSION:
+        raise ValueError(f"{store_paths(path)['sidecar']} is not a version {STORE_VERSION} feature store sidecar")
+    return sidecar
+
+
+def write_sidecar(path: str, kind: str, array: np.ndarray, **extra):
+    """Sidecar of an already written .npy array (kind: "features" or "labels")"""
+    sidecar = {"format": STORE_FORMAT, "version": STORE_VERSION, "kind": kind,
+               "dtype": str(array.dtype), "shape": list(array.shape)}
+    sidecar.update(extra)
+    sidecar_path = store_paths(path)["sidecar"]
+    temporary = sidecar_path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, ensure_ascii=False, indent=2)
+    os.replace(temporary, sidecar_path)
+
+
+class LabelArray:
+    """Category-coded labels: int codes (memory-mapped) plus the category names"""
+
+    def __init__(self, codes: np.ndarray, categories: Sequence[str]):
+        self.codes = codes
+        self.categories = np.asarray(list(categories), dtype=object)
+
+    @classmethod
+    def from_labels(cls, labels: Sequence[str], categories: Optional[Sequence[str]] = None) -> "LabelArray":
+        labels = np.asarray(list(labels), dtype=object)
+        categories = sorted(set(labels.tolist())) if categories is None else list(categories)
+        lookup = {category: code for code, category in enumerate(categories)}
+        codes = np.fromiter((lookup[label] for label in labels), dtype=code_dtype(len(categories)), count=len(labels))
+        return cls(codes, categories)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index) -> Union[str, "LabelArray"]:
+        if np.isscalar(index):
+            return self.categories[self.codes[index]]
+        return LabelArray(self.codes[index], self.categories)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tolist())
+
+    def __array__(self, dtype=None):
+        decoded = self.categories[np.asarray(self.codes)]
+        return decoded if dtype is None else decoded.astype(dtype)
+
+    def tolist(self) -> List[str]:
+        return self.categories[np.asarray(self.codes)].tolist()
+
+    def __repr__(self) -> str:
+        return f"LabelArray({len(self):,} labels, {len(self.categories)} categories)"
+
+
+def code_dtype(category_count: int) -> np.dtype:
+    """Smallest signed integer dtype holding category_count codes"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if category_count <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def save_features(path: str, features, dtype=np.float32) -> str:
+    """Write a feature matrix as a store; returns the .npy path"""
+    array = np.asarray(features, dtype=dtype)
+    data_path = store_paths(path)["data"]
+    np.save(data_path, array)
+    write_sidecar(path, "features", array)
+    return data_path
+
+
+def save_labels(path: str, labels: Sequence[str], categories: Optional[Sequence[str]] = None) -> str:
+    """Write labels as category codes plus a sidecar; returns the .npy path"""
+    label_array = labels if isinstance(labels, LabelArray) else LabelArray.from_labels(labels, categories)
+    data_path = store_paths(path)["data"]
+    np.save(data_path, np.asarray(label_array.codes))
+    write_sidecar(path, "labels", np.asarray(label_array.codes), categories=label_array.categories.tolist())
+    return data_path
+
+
+def load(path: str, mmap: bool = True):
+    """Transparent reader: the store next to path if there is one, else the joblib pickle
+
+    Features come back as a (memory-mapped) ndarray, labels as a LabelArray.
+    """
+    if is_store(path):
+        sidecar = read_sidecar(path)
+        data = np.load(store_paths(path)["data"], mmap_mode="r" if mmap else None)
+        if list(data.shape) != sidecar["shape"]:
+            raise ValueError(f"{store_paths(path)['data']} has shape {data.shape}, sidecar says {sidecar['shape']}")
+        if sidecar["kind"] == "labels":
+            return LabelArray(data, sidecar["categories"])
+        return data
+    if os.path.exists(path) and path.endswith(".joblib"):
+        import joblib
+
+        return joblib.load(path, mmap_mode="r" if mmap else None)
+    raise FileNotFoundError(f"No feature store or joblib file at {path}")
+
+
+def convert(joblib_path: str, remove: bool = False) -> str:
+    """Convert an X_* / y_* joblib pickle into a store next to it"""
+    import joblib
+
+    value = joblib.load(joblib_path)
+    name = os.path.basename(joblib_path)
+    if name.startswith("y_") or (np.ndim(value) == 1 and not np.issubdtype(np.asarray(value).dtype, np.number)):
+        data_path = save_labels(joblib_path, value)
+    else:
+        array = np.asarray(value)
+        data_path = save_features(joblib_path, array,
+                                  dtype=array.dtype if np.issubdtype(array.dtype, np.floating) else np.float32)
+    if remove:
+        os.remove(joblib_path)
+    return data_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert and inspect memory-mapped feature stores")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser("convert", help="Convert X_*/y_* joblib pickles of directories")
+    convert_parser.add_argument("directories", nargs="+")
+    convert_parser.add_argument("--remove", action="store_true", help="Delete the pickles after conversion")
+
+    info_parser = subparsers.add_parser("info", help="Show a store's sidecar")
+    info_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        sidecar = read_sidecar(args.path)
+        print(f"📦 {store_paths(args.path)['data']}: {sidecar['kind']} {sidecar['dtype']} {tuple(sidecar['shape'])}")
+        if sidecar["kind"] == "labels":
+            print(f"   Categories: {', '.join(sidecar['categories'])}")
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    converted = 0
+    for directory in args.directories:
+        for name in sorted(os.listdir(directory)):
+            if not (name.endswith(".joblib") and name[:2] in ("X_", "y_")):
+                continue
+            path = os.path.join(directory, name)
+            start = time.time()
+            data_path = convert(path, args.remove)
+            open_start = time.time()
+            load(data_path)
+            print(f"✅ {path} -> {data_path} ({os.path.getsize(data_path) / 1024 / 1024:.1f} MB, "
+                  f"converted in {open_start - start:.1f}s, opens in {(time.time() - open_start) * 1000:.1f} ms)")
+            converted += 1
+    if not converted:
+        print("⚠️ No X_*/y_* joblib files found")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
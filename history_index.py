@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar Session History Index
+==============================
+Keeps the classification history of a session in column arrays (prediction,
+max-confidence, timestamp and text length) next to the original result
+objects, so the Session History page can compute its overview, filters and
+sorting with vectorized NumPy operations instead of walking the Python list
+on every Streamlit rerun.
+
+Aggregates (total, confidence sum, per-category and per-confidence-bucket
+counts) are maintained incrementally on append, which makes the overview
+cards O(1) regardless of how many articles have been classified. Each
+appended result is also added to a BM25 inverted index over its segmented
+tokens (row number == document id) for ranked text search.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from search_index import InvertedIndex, tokens_from_segmented
+
+# Confidence buckets used by the history page filter
+CONFIDENCE_HIGH = "high"      # > 0.8
+CONFIDENCE_MEDIUM = "medium"  # 0.5 - 0.8 (inclusive)
+CONFIDENCE_LOW = "low"        # < 0.5
+CONFIDENCE_LEVELS = [CONFIDENCE_HIGH, CONFIDENCE_MEDIUM, CONFIDENCE_LOW]
+
+# Sort options understood by HistoryIndex.sorted_indices
+SORT_MOST_RECENT = "most_recent"
+SORT_OLDEST = "oldest"
+SORT_HIGHEST_CONFIDENCE = "highest_confidence"
+SORT_LOWEST_CONFIDENCE = "lowest_confidence"
+SORT_CATEGORY = "category"
+
+
+def confidence_bucket(confidence: float) -> int:
+    """Return the index in CONFIDENCE_LEVELS of a confidence value"""
+    if confidence > 0.8:
+        return 0
+    if confidence >= 0.5:
+        return 1
+    return 2
+
+
+class HistoryIndex:
+    """Append-only columnar index over ClassificationResult objects"""
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self, categories: Sequence[str], category_labels: Optional[Dict[str, str]] = None):
+        self.categories = list(categories)
+        self._category_codes = {cat: i for i, cat in enumerate(self.categories)}
+
+        # Rank of each category code when sorting alphabetically by display label
+        labels = [(category_labels or {}).get(cat, cat) for cat in self.categories]
+        order = sorted(range(len(labels)), key=lambda i: labels[i])
+        self._label_rank = np.empty(len(labels), dtype=np.int16)
+        self._label_rank[order] = np.arange(len(labels), dtype=np.int16)
+
+        self.clear()
+
+    def clear(self):
+        """Drop every stored result and reset the aggregates"""
+        self.results: List[Any] = []
+        self._lowered_texts: List[str] = []
+        self.search_index = InvertedIndex()
+        self._size = 0
+        self._capacity = self._INITIAL_CAPACITY
+        self._category = np.zeros(self._capacity, dtype=np.int16)
+        self._confidence = np.zeros(self._capacity, dtype=np.float64)
+        self._timestamp = np.zeros(self._capacity, dtype=np.float64)
+        self._length = np.zeros(self._capacity, dtype=np.int32)
+
+        self._confidence_sum = 0.0
+        self._category_counts = np.zeros(len(self.categories), dtype=np.int64)
+        self._bucket_counts = np.zeros(len(CONFIDENCE_LEVELS), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def _grow(self):
+        """Double the capacity of every column (amortized O(1) appends)"""
+        self._capacity *= 2
+        for name in ("_category", "_confidence", "_timestamp", "_length"):
+            column = getattr(self, name)
+            grown = np.zeros(self._capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def append(self, result) -> int:
+        """Add a classification result and update the aggregates, returning its row"""
+        if result.prediction not in self._category_codes:
+            self._category_codes[result.prediction] = len(self.categories)
+            self.categories.append(result.prediction)
+            self._category_counts = np.append(self._category_counts, 0)
+            self._label_rank = np.append(self._label_rank, len(self._label_rank))
+
+        if self._size == self._capacity:
+            self._grow()
+
+        row = self._size
+        code = self._category_codes[result.prediction]
+        confidence = float(max(result.confidence.values())) if result.confidence else 0.0
+
+        self._category[row] = code
+        self._confidence[row] = confidence
+        self._timestamp[row] = result.timestamp.timestamp()
+        self._length[row] = len(result.input_text)
+        self.results.append(result)
+        self._lowered_texts.append(result.input_text.lower())
+        self.search_index.add_document(result.prediction_id, tokens_from_segmented(result.segmented_text))
+        self._size += 1
+
+        self._confidence_sum += confidence
+        self._category_counts[code] += 1
+        self._bucket_counts[confidence_bucket(confidence)] += 1
+        return row
+
+    def extend(self, results):
+        """Append several results at once"""
+        for result in results:
+            self.append(result)
+
+    # ------------------------------------------------------------------
+    # Column views
+    # ------------------------------------------------------------------
+
+    @property
+    def category_codes(self) -> np.ndarray:
+        return self._category[:self._size]
+
+    @property
+    def max_confidence(self) -> np.ndarray:
+        return self._confidence[:self._size]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamp[:self._size]
+
+    @property
+    def text_lengths(self) -> np.ndarray:
+        return self._length[:self._size]
+
+    # ------------------------------------------------------------------
+    # Aggregates
+    # ------------------------------------------------------------------
+
+    @property
+    def average_confidence(self) -> float:
+        return self._confidence_sum / self._size if self._size else 0.0
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of stored results per predicted category (non-zero only)"""
+        return {cat: int(count) for cat, count in zip(self.categories, self._category_counts) if count}
+
+    def confidence_bucket_counts(self) -> Dict[str, int]:
+        """Number of stored results per confidence level"""
+        return {level: int(count) for level, count in zip(CONFIDENCE_LEVELS, self._bucket_counts)}
+
+    @property
+    def categories_used(self) -> int:
+        return int(np.count_nonzero(self._category_counts))
+
+    def most_common_category(self) -> Optional[str]:
+        if not self._size:
+            return None
+        return self.categories[int(np.argmax(self._category_counts))]
+
+    # ------------------------------------------------------------------
+    # Filtering, sorting and pagination
+    # ------------------------------------------------------------------
+
+    def filter_mask(self, category: Optional[str] = None, confidence_level: Optional[str] = None,
+                    rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean mask over stored rows matching every given criterion"""
+        mask = np.ones(self._size, dtype=bool)
+
+        if category is not None:
+            code = self._category_codes.get(category)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= self.category_codes == code
+
+        if confidence_level is not None:
+            confidence = self.max_confidence
+            if confidence_level == CONFIDENCE_HIGH:
+                mask &= confidence > 0.8
+            elif confidence_level == CONFIDENCE_MEDIUM:
+                mask &= (confidence >= 0.5) & (confidence <= 0.8)
+            elif confidence_level == CONFIDENCE_LOW:
+                mask &= confidence < 0.5
+            else:
+                raise ValueError(f"Unknown confidence level: {confidence_level}")
+
+        if rows is not None:
+            row_mask = np.zeros(self._size, dtype=bool)
+            rows = np.asarray(rows, dtype=np.int64)
+            row_mask[rows[(rows >= 0) & (rows < self._size)]] = True
+            mask &= row_mask
+
+        return mask
+
+    def ranked_rows(self, query_tokens: List[str]) -> np.ndarray:
+        """Rows matching any query token, ordered by decreasing BM25 relevance"""
+        rows, _ = self.search_index.ranked_doc_ids(query_tokens)
+        return rows
+
+    def substring_rows(self, query: str, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows whose text contains query (case-insensitive), scanning only the candidates"""
+        query = query.lower()
+        rows = np.arange(self._size) if candidates is None else np.flatnonzero(candidates)
+        return np.array([i for i in rows if query in self._lowered_texts[i]], dtype=np.int64)
+
+    def sorted_indices(self, mask: np.ndarray, sort_option: str = SORT_MOST_RECENT) -> np.ndarray:
+        """Row indices selected by mask, ordered by the requested sort option"""
+        rows = np.flatnonzero(mask)
+
+        if sort_option == SORT_MOST_RECENT:
+            keys = -self.timestamps[rows]
+        elif sort_option == SORT_OLDEST:
+            keys = self.timestamps[rows]
+        elif sort_option == SORT_HIGHEST_CONFIDENCE:
+            keys = -self.max_confidence[rows]
+        elif sort_option == SORT_LOWEST_CONFIDENCE:
+            keys = self.max_confidence[rows]
+        elif sort_option == SORT_CATEGORY:
+            keys = self._label_rank[self.category_codes[rows]]
+        else:
+            raise ValueError(f"Unknown sort option: {sort_option}")
+
+        return rows[np.argsort(keys, kind="stable")]
+
+    def page(self, indices: np.ndarray, page_number: int, page_size: int) -> List[Any]:
+        """Materialize only the results visible on a page (1-based page numbers)"""
+        start = max(0, (page_number - 1) * page_size)
+        return [self.results[i] for i in indices[start:start + page_size]]
+
+    @staticmethod
+    def page_count(total: int, page_size: int) -> int:
+        return max(1, (total + page_size - 1) // page_size)
@@ -22,23 +22,27 @@ License: Academic Research Use
 
 import streamlit as st
 import joblib
-import numpy as np
 import pandas as pd
 import os
+import io
 import json
-import PyPDF2
-import time
-import unicodedata
-import re
-import collections
-from typing import Dict, List, Tuple, Optional, Any
-import logging
 import hashlib
-from dataclasses import dataclass
-from enum import Enum
+import shutil
 from datetime import datetime
 import gc  # For memory management with 8GB RAM
 
+from classifier_core import Config, TextProcessor, ClassificationEngine, read_pdf_text, load_embedding_model
+from history_index import (
+    HistoryIndex, CONFIDENCE_HIGH, CONFIDENCE_MEDIUM, CONFIDENCE_LOW,
+    SORT_MOST_RECENT, SORT_OLDEST, SORT_HIGHEST_CONFIDENCE, SORT_LOWEST_CONFIDENCE, SORT_CATEGORY
+)
+from search_index import tokens_from_segmented
+from exporters import EXPORT_FORMATS, export_to_file, result_record
+from batch_processing import BatchJob, load_documents_from_csv, load_documents_from_zip, guess_text_column
+from background_tasks import JobQueue, DONE, FINAL_STATES, result_from_record
+from warmup import start_warm_up
+from online_learning import CorrectionQueue, start_model_watcher
+
 # Configure memory optimization for 8GB RAM
 os.environ['PYTHONHASHSEED'] = '0'
 gc.set_threshold(700, 10, 10)  # Optimize garbage collection
@@ -307,209 +311,22 @@ st.markdown("""
     }
 </style>""", unsafe_allow_html=True)
 
-# Configuration and constants
-class Config:
-    """Application configuration constants"""
-    # Dynamic model path detection
-    @staticmethod
-    def get_model_directory():
-        """Dynamically find the model directory based on current working directory or common locations"""
-        # First, try to find relative to current working directory
-        possible_paths = [
-            os.path.join(os.getcwd(), "Demo_model"),
-            os.path.join(os.getcwd(), "models"),
-            os.path.join(os.getcwd(), "model"),
-            os.path.join(os.path.dirname(__file__), "Demo_model"),
-            os.path.join(os.path.dirname(__file__), "models"),
-            os.path.join(os.path.dirname(__file__), "model"),
-            # Common project structure paths
-            os.path.join(os.path.expanduser("~"), "Documents", "DEV", "Demo_model"),
-            os.path.join(os.path.expanduser("~"), "Desktop", "Demo_model"),
-            os.path.join(os.path.expanduser("~"), "Downloads", "Demo_model"),
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path) and os.path.isdir(path):
-                # Verify it contains expected model files
-                expected_files = ["svm_model.joblib", "config.json"]
-                if all(os.path.exists(os.path.join(path, f)) for f in expected_files):
-                    return path
-        
-        # If no valid directory found, return None
-        return None
-    
-    # Initialize model directory
-    MODEL_DIR = get_model_directory.__func__() or os.path.join(os.getcwd(), "Demo_model")
-    
-    if not os.path.exists(MODEL_DIR):
-        st.error(f"""
-        Model directory not found!
-        
-        Please ensure your model files are in one of these locations:
-        • Current directory: {os.path.join(os.getcwd(), "Demo_model")}
-        • Same folder as script: {os.path.join(os.path.dirname(__file__) if '__file__' in globals() else os.getcwd(), "Demo_model")}
-        • Home Documents: {os.path.join(os.path.expanduser("~"), "Documents", "DEV", "Demo_model")}
-        • Desktop: {os.path.join(os.path.expanduser("~"), "Desktop", "Demo_model")}
-        
-        Required files:
-        • svm_model.joblib
-        • config.json
-        """)
-        st.stop()
-    
-    SVM_MODEL_PATH = os.path.join(MODEL_DIR, "svm_model.joblib")
-    CONFIG_PATH = os.path.join(MODEL_DIR, "config.json")
-    # FastText model is in the root directory, not in Demo_model
-    FASTTEXT_MODEL_PATH = os.path.join(os.getcwd(), "cc.km.300.bin")
-    
-    # Training data paths (if needed)
-    X_TRAIN_PATH = os.path.join(MODEL_DIR, "X_train_fasttext.joblib")
-    X_TEST_PATH = os.path.join(MODEL_DIR, "X_test_fasttext.joblib")
-    Y_TRAIN_PATH = os.path.join(MODEL_DIR, "y_train_fasttext.joblib")
-    Y_TEST_PATH = os.path.join(MODEL_DIR, "y_test_fasttext.joblib")
-    
-    CATEGORIES = ["economic", "environment", "health", "politic", "sport", "technology"]
-    CATEGORY_LABELS = {
-        "economic": "Economic",
-        "environment": "Environment", 
-        "health": "Health",
-        "politic": "Politics",
-        "sport": "Sports",
-        "technology": "Technology"
-    }
-    
-    # Khmer character sets for preprocessing
-    KHCONST = set(u'កខគឃងចឆជឈញដឋឌឍណតថទធនបផពភមយរលវឝឞសហឡអឣឤឥឦឧឨឩឪឫឬឭឮឯឰឱឲឳ')
-    KHVOWEL = set(u'឴឵ាិីឹឺុូួើឿៀេែៃោៅ\u17c6\u17c7\u17c8')
-    KHSUB = set(u'្')
-    KHSYM = set('៕។៛ៗ៚៙៘៖«»')
-    KHNUMBER = set(u'០១២៣៤៥៦៧៨៩')
-    ARABIC_NUMBER = set('0123456789')
-    LATIN_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
-    PUNCTUATION = set('"!@#$%^&*()-_+=[]{};\'\"\|,.<>?/`~፡.,፣;፤፥፦፧፪፠፨')
-
-class CategoryType(Enum):
-    """Enumeration for news categories"""
-    ECONOMIC = "economic"
-    ENVIRONMENT = "environment"
-    HEALTH = "health"
-    POLITIC = "politic"
-    SPORT = "sport"
-    TECHNOLOGY = "technology"
-
-@dataclass
-class ClassificationResult:
-    """Data class for classification results"""
-    prediction: str
-    confidence: Dict[str, float]
-    processing_time: float
-    cleaned_text: str
-    segmented_text: str
-    embedding: np.ndarray
-    timestamp: datetime
-    input_text: str
-    text_statistics: Dict[str, Any]
-    prediction_id: str
-
-class TextProcessor:
-    """Advanced text processing utilities for Khmer language"""
-    
-    @staticmethod
-    def normalize_khmer_text(text: str) -> str:
-        """Normalize Khmer text using Unicode NFC normalization"""
-        if not text:
-            return ""
-        normalized = unicodedata.normalize('NFC', text)
-        normalized = ''.join(char for char in normalized if not unicodedata.category(char).startswith('C'))
-        return normalized
-
-    @staticmethod
-    def clean_khmer_text(text: str) -> str:
-        """Clean Khmer text by removing unwanted characters"""
-        if not text:
-            return ""
-        text = TextProcessor.normalize_khmer_text(text)
-        chars_to_remove = (Config.KHSYM | Config.KHNUMBER | Config.ARABIC_NUMBER | 
-                          Config.LATIN_CHARS | Config.PUNCTUATION)
-        translation_table = str.maketrans('', '', ''.join(chars_to_remove))
-        text = text.translate(translation_table)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
-
-    @staticmethod
-    def normalize_word(word: str) -> str:
-        """Normalize individual Khmer words"""
-        if not word:
-            return ""
-        word = unicodedata.normalize('NFC', word)
-        word = word.strip()
-        word = ''.join(char for char in word if not unicodedata.category(char).startswith('C'))
-        return word
-
-    @staticmethod
-    def segment_khmer_text(text: str) -> str:
-        """Segment Khmer text using sentence-based approach for better flow"""
-        try:
-            import khmernltk
-            
-            # First, split into sentences using Khmer and common sentence delimiters
-            sentence_delimiters = ['។', '.', '!', '?', '\n']
-            sentences = []
-            current_sentence = ""
-            
-            for char in text:
-                current_sentence += char
-                if char in sentence_delimiters:
-                    if current_sentence.strip():
-                        sentences.append(current_sentence.strip())
-                    current_sentence = ""
-            
-            # Add remaining text as a sentence if any
-            if current_sentence.strip():
-                sentences.append(current_sentence.strip())
-            
-            # Process each sentence with word tokenization but keep sentence structure
-            processed_sentences = []
-            for sentence in sentences:
-                if sentence:
-                    # Clean the sentence first
-                    cleaned_sentence = sentence.strip()
-                    
-                    # Use KhmerNLTK for word tokenization within the sentence
-                    try:
-                        word_tokens = khmernltk.word_tokenize(cleaned_sentence)
-                        # Normalize each word but maintain sentence boundaries
-                        normalized_words = []
-                        for token in word_tokens:
-                            normalized_token = TextProcessor.normalize_word(token)
-                            if normalized_token and normalized_token not in sentence_delimiters:
-                                normalized_words.append(normalized_token)
-                        
-                        if normalized_words:
-                            # Rejoin words in the sentence with spaces
-                            processed_sentence = ' '.join(normalized_words)
-                            processed_sentences.append(processed_sentence)
-                            
-                    except Exception:
-                        # Fallback: use the cleaned sentence as-is
-                        if cleaned_sentence:
-                            processed_sentences.append(cleaned_sentence)
-            
-            # Join sentences with sentence delimiters to maintain structure
-            return ' ។ '.join(processed_sentences) if processed_sentences else text
-            
-        except Exception as e:
-            logging.warning(f"Sentence-based segmentation failed: {e}")
-            # Fallback to simple sentence splitting
-            sentences = []
-            for delimiter in ['។', '.', '!', '?']:
-                if delimiter in text:
-                    parts = text.split(delimiter)
-                    for i, part in enumerate(parts[:-1]):  # Exclude last empty part
-                        if part.strip():
-                            sentences.append(part.strip())
-            
-            return ' ។ '.join(sentences) if sentences else text
+# Stop early with instructions when no model directory could be located
+if not os.path.exists(Config.MODEL_DIR):
+    st.error(f"""
+    Model directory not found!
+    
+    Please ensure your model files are in one of these locations:
+    • Current directory: {os.path.join(os.getcwd(), "Demo_model")}
+    • Same folder as script: {os.path.join(os.path.dirname(__file__) if '__file__' in globals() else os.getcwd(), "Demo_model")}
+    • Home Documents: {os.path.join(os.path.expanduser("~"), "Documents", "DEV", "Demo_model")}
+    • Desktop: {os.path.join(os.path.expanduser("~"), "Desktop", "Demo_model")}
+    
+    Required files:
+    • svm_model.joblib
+    • config.json
+    """)
+    st.stop()
 
 class ModelManager:
     """Manage model loading and caching"""
@@ -537,8 +354,7 @@ class ModelManager:
             # Load FastText model (this takes the most time)
             status_text.text("Loading FastText embeddings (this may take a moment)...")
             progress_bar.progress(75)
-            from gensim.models.fasttext import load_facebook_model
-            fasttext_model = load_facebook_model(config["model_path"])
+            fasttext_model = load_embedding_model(config)
             
             # Complete
             status_text.text("Models loaded successfully!")
@@ -556,186 +372,49 @@ class ModelManager:
             st.error(f"Make sure the FastText model file exists at: {config.get('model_path', 'cc.km.300.bin')}")
             st.stop()
 
-class AnalyticsEngine:
-    """Advanced analytics and visualization engine"""
-    
-    @staticmethod
-    def get_text_statistics(text: str) -> Dict[str, Any]:
-        """Comprehensive text statistics analysis"""
-        words = text.split()
-        chars = len(text)
-        sentences = max(1, text.count('។') + text.count('.') + text.count('!') + text.count('?'))
-        
-        # Advanced metrics
-        unique_words = len(set(words))
-        avg_word_length = np.mean([len(word) for word in words]) if words else 0
-        lexical_diversity = unique_words / len(words) if words else 0
-        
-        # Khmer-specific metrics
-        khmer_chars = sum(1 for char in text if char in Config.KHCONST)
-        khmer_ratio = khmer_chars / chars if chars > 0 else 0
-        
-        return {
-            'characters': chars,
-            'words': len(words),
-            'unique_words': unique_words,
-            'sentences': sentences,
-            'avg_word_length': avg_word_length,
-            'avg_sentence_length': len(words) / sentences,
-            'lexical_diversity': lexical_diversity,
-            'khmer_character_ratio': khmer_ratio,
-            'readability_score': AnalyticsEngine._calculate_readability(words, sentences)
-        }
-    
-    @staticmethod
-    def _calculate_readability(words: List[str], sentences: int) -> float:
-        """Calculate readability score (simplified Flesch-Kincaid adaptation)"""
-        if not words or sentences == 0:
-            return 0.0
-        avg_sentence_length = len(words) / sentences
-        avg_word_length = np.mean([len(word) for word in words])
-        # Simplified readability score for Khmer text
-        score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * (avg_word_length / 10))
-        return max(0, min(100, score))
-
-class ClassificationEngine:
-    """Advanced classification engine with confidence analysis"""
-    
-    def __init__(self, svm_model, fasttext_model, embedding_method: str = "mean"):
-        self.svm_model = svm_model
-        self.fasttext_model = fasttext_model
-        self.embedding_method = embedding_method
-        
-        # Cache for word embeddings to improve performance with 8GB RAM
-        self._word_embedding_cache = {}
-        self._cache_max_size = 10000  # Cache up to 10k word embeddings
-    
-    def get_sentence_embedding(self, segmented_text: str) -> np.ndarray:
-        """Generate sentence embedding from segmented text with caching for better performance"""
-        words = segmented_text.strip().split()
-        if not words:
-            return np.zeros(300)
-        
-        word_vecs = []
-        for word in words:
-            try:
-                # Check cache first for better performance
-                if word in self._word_embedding_cache:
-                    vec = self._word_embedding_cache[word]
-                else:
-                    # Get word vector from FastText model
-                    if hasattr(self.fasttext_model, 'get_word_vector'):
-                        vec = self.fasttext_model.get_word_vector(word)
-                    elif hasattr(self.fasttext_model, 'wv') and word in self.fasttext_model.wv:
-                        vec = self.fasttext_model.wv[word]
-                    elif hasattr(self.fasttext_model, 'get_vector'):
-                        vec = self.fasttext_model.get_vector(word)
-                    else:
-                        vec = self.fasttext_model[word]
-                    
-                    # Cache the embedding if we have space
-                    if len(self._word_embedding_cache) < self._cache_max_size:
-                        self._word_embedding_cache[word] = vec
-                
-                word_vecs.append((word, vec))
-            except Exception:
-                continue
-        
-        if not word_vecs:
-            return np.zeros(300)
-        
-        if self.embedding_method == "mean":
-            return np.mean([vec for _, vec in word_vecs], axis=0)
-        elif self.embedding_method == "weighted":
-            word_counts = collections.Counter(word for word, _ in word_vecs)
-            total_count = sum(word_counts.values())
-            weighted_vecs = [vec * (word_counts[word]/total_count) for word, vec in word_vecs]
-            return np.sum(weighted_vecs, axis=0)
-        
-        return np.mean([vec for _, vec in word_vecs], axis=0)
-    
-    def classify_text(self, text: str) -> ClassificationResult:
-        """Perform comprehensive text classification"""
-        start_time = time.time()
-        
-        # Generate unique prediction ID
-        prediction_id = hashlib.md5(f"{text[:100]}{datetime.now()}".encode()).hexdigest()[:8]
-        
-        # Preprocess text
-        cleaned = TextProcessor.clean_khmer_text(text)
-        segmented = TextProcessor.segment_khmer_text(cleaned)
-        
-        # Get embedding
-        embedding = self.get_sentence_embedding(segmented)
-        embedding_reshaped = embedding.reshape(1, -1)
-        
-        # Get prediction and confidence scores
-        prediction = self.svm_model.predict(embedding_reshaped)[0]
-        
-        # Calculate confidence scores
-        confidence_dict = self._calculate_confidence_scores(embedding_reshaped)
-        
-        # Get text statistics
-        text_stats = AnalyticsEngine.get_text_statistics(text)
-        
-        processing_time = time.time() - start_time
-        
-        return ClassificationResult(
-            prediction=prediction,
-            confidence=confidence_dict,
-            processing_time=processing_time,
-            cleaned_text=cleaned,
-            segmented_text=segmented,
-            embedding=embedding,
-            timestamp=datetime.now(),
-            input_text=text,  # Store complete original text
-            text_statistics=text_stats,
-            prediction_id=prediction_id
-        )
-    
-    def _calculate_confidence_scores(self, embedding_reshaped: np.ndarray) -> Dict[str, float]:
-        """Calculate confidence scores for all categories"""
-        if hasattr(self.svm_model, 'decision_function'):
-            decision_scores = self.svm_model.decision_function(embedding_reshaped)[0]
-            # Convert to probabilities using softmax
-            exp_scores = np.exp(decision_scores - np.max(decision_scores))
-            probabilities = exp_scores / np.sum(exp_scores)
-            
-            confidence_dict = {}
-            for i, category in enumerate(Config.CATEGORIES):
-                confidence_dict[category] = probabilities[i] if i < len(probabilities) else 0.0
-        else:
-            # Fallback for models without decision_function
-            pred = self.svm_model.predict(embedding_reshaped)[0]
-            confidence_dict = {pred: 0.95}
-            for cat in Config.CATEGORIES:
-                if cat != pred:
-                    confidence_dict[cat] = 0.05 / (len(Config.CATEGORIES) - 1)
-        
-        return confidence_dict
-    
-    def clear_cache(self):
-        """Clear the word embedding cache to free memory if needed"""
-        self._word_embedding_cache.clear()
-        gc.collect()
-    
-    def get_cache_info(self):
-        """Get information about the current cache status"""
-        return {
-            "cached_words": len(self._word_embedding_cache),
-            "cache_size_limit": self._cache_max_size,
-            "cache_usage": f"{len(self._word_embedding_cache)}/{self._cache_max_size}"
-        }
-
 # Initialize database on startup
 # DatabaseManager.init_database()
 
 # Load models and data at startup (8GB RAM version)
 st.info("🔄 Loading models at startup for optimal performance...")
-svm_model, fasttext_model, config = ModelManager.load_models()
-classification_engine = ClassificationEngine(svm_model, fasttext_model, config.get("embedding_method", "mean"))
+@st.cache_resource
+def get_engine():
+    """One ClassificationEngine per server process, shared by every session and rerun
+
+    Streamlit reruns this script on every interaction: an engine built at
+    module level would be replaced each time, leaving the warm-up and the
+    online-model watcher working on a discarded instance.
+    """
+    svm_model, fasttext_model, config = ModelManager.load_models()
+    return ClassificationEngine(svm_model, fasttext_model, config.get("embedding_method", "mean"))
+
+classification_engine = get_engine()
 st.success("✅ All models loaded successfully! Ready for classification.")
 
+@st.cache_resource
+def start_engine_warm_up(_engine):
+    """Warm the caches once per server process, on a background thread"""
+    return start_warm_up(_engine)
+
+start_engine_warm_up(classification_engine)
+
+@st.cache_resource
+def start_online_model_watcher(_engine):
+    """Serve promoted online-learning snapshots (KHMER_CLASSIFIER_ONLINE_MODEL=true)"""
+    return start_model_watcher(_engine)
+
+start_online_model_watcher(classification_engine)
+
+@st.cache_resource
+def get_job_queue():
+    """Shared handle on the durable background job queue"""
+    return JobQueue(Config.JOBS_DB_PATH)
+
+@st.cache_resource
+def get_correction_queue():
+    """Shared handle on the queue of user corrections learned by online_learning.py"""
+    return CorrectionQueue(Config.CORRECTIONS_DB_PATH)
+
 def get_classification_engine():
     """Return the already loaded classification engine"""
     global classification_engine
@@ -747,7 +426,8 @@ def get_classification_engine():
 
 # Initialize session state
 if 'classification_history' not in st.session_state:
-    st.session_state.classification_history = []
+    # Columnar history index: aggregates are updated on append, filters are vectorized
+    st.session_state.classification_history = HistoryIndex(Config.CATEGORIES, Config.CATEGORY_LABELS)
 if 'model_performance' not in st.session_state:
     st.session_state.model_performance = {}
 if 'user_preferences' not in st.session_state:
@@ -760,139 +440,14 @@ if 'user_preferences' not in st.session_state:
 def extract_pdf_text(pdf_file):
     """Extract text from uploaded PDF file and format into proper sentences and paragraphs"""
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        # Extract text from all pages
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:  # Only add non-empty text
-                text += page_text + "\n"
-        
-        if not text.strip():
-            return None
-            
-        # Clean and format the extracted text
-        formatted_text = format_extracted_text(text)
-        return formatted_text
-        
+        return read_pdf_text(pdf_file)
     except Exception as e:
         st.error(f"Error extracting text from PDF: {str(e)}")
         return None
 
-def format_extracted_text(raw_text):
-    """Format raw extracted text into proper sentences and paragraphs"""
-    if not raw_text:
-        return ""
-    
-    # Remove excessive whitespace and normalize line breaks
-    text = re.sub(r'\s+', ' ', raw_text.strip())
-    
-    # Define sentence-ending punctuation for multiple languages
-    sentence_endings = ['។', '.', '!', '?', ':', ';']
-    paragraph_indicators = ['\n\n', '\n \n', '  \n']
-    
-    # Split into potential sentences
-    sentences = []
-    current_sentence = ""
-    
-    i = 0
-    while i < len(text):
-        char = text[i]
-        current_sentence += char
-        
-        # Check for sentence endings
-        if char in sentence_endings:
-            # Look ahead to see if this is really the end of a sentence
-            next_chars = text[i+1:i+3] if i+1 < len(text) else ""
-            
-            # If followed by whitespace and capital letter or Khmer character, it's likely a sentence end
-            if (next_chars and 
-                (next_chars[0].isspace() and 
-                 (len(next_chars) > 1 and 
-                  (next_chars[1].isupper() or 
-                   next_chars[1] in Config.KHCONST or
-                   next_chars[1].isdigit())))):
-                
-                # Clean up the sentence
-                clean_sentence = current_sentence.strip()
-                if clean_sentence and len(clean_sentence) > 3:  # Avoid very short fragments
-                    sentences.append(clean_sentence)
-                current_sentence = ""
-        i += 1
-    
-    # Add any remaining text as a sentence
-    if current_sentence.strip() and len(current_sentence.strip()) > 3:
-        sentences.append(current_sentence.strip())
-    
-    # Group sentences into paragraphs
-    if not sentences:
-        return raw_text.strip()
-    
-    # Smart paragraph grouping
-    paragraphs = []
-    current_paragraph = []
-    
-    for sentence in sentences:
-        current_paragraph.append(sentence)
-        
-        # Start new paragraph if:
-        # 1. Current paragraph has 3+ sentences, or
-        # 2. Sentence seems to be a title/header (short and ends with certain punctuation)
-        # 3. Topic seems to change (basic heuristic)
-        
-        should_break = False
-        
-        # Check if we have enough sentences for a paragraph
-        if len(current_paragraph) >= 4:
-            should_break = True
-        
-        # Check if next sentence might be a new topic (if available)
-        current_idx = sentences.index(sentence)
-        if current_idx < len(sentences) - 1:
-            next_sentence = sentences[current_idx + 1]
-            
-            # Simple heuristics for paragraph breaks
-            if (len(sentence) < 50 and  # Short sentence
-                (sentence.endswith(':') or sentence.endswith('។') or sentence.endswith('.'))):
-                should_break = True
-            
-            # If current sentence is very long, consider it a paragraph by itself
-            if len(sentence) > 300:
-                should_break = True
-        
-        if should_break and current_paragraph:
-            paragraph_text = ' '.join(current_paragraph)
-            paragraphs.append(paragraph_text)
-            current_paragraph = []
-    
-    # Add any remaining sentences as final paragraph
-    if current_paragraph:
-        paragraph_text = ' '.join(current_paragraph)
-        paragraphs.append(paragraph_text)
-    
-    # Join paragraphs with double line breaks
-    formatted_text = '\n\n'.join(paragraphs)
-    
-    # Final cleanup
-    formatted_text = re.sub(r'\n\s*\n\s*\n+', '\n\n', formatted_text)  # Remove excessive line breaks
-    formatted_text = re.sub(r'[ \t]+', ' ', formatted_text)  # Normalize spaces
-    
-    return formatted_text.strip()
-
 def export_results(result):
     """Export a single classification result to JSON"""
-    export_data = {
-        "prediction": result.prediction,
-        "category_label": Config.CATEGORY_LABELS[result.prediction],
-        "confidence": result.confidence[result.prediction],
-        "all_confidences": result.confidence,
-        "text": result.input_text,
-        "processing_time": result.processing_time,
-        "timestamp": result.timestamp.isoformat(),
-        "prediction_id": result.prediction_id,
-        "text_statistics": result.text_statistics
-    }
+    export_data = result_record(result, Config.CATEGORY_LABELS)
     
     # Convert to JSON string
     json_str = json.dumps(export_data, indent=2, ensure_ascii=False)
@@ -908,34 +463,45 @@ def export_results(result):
     
     st.success("Export ready! Click the download button above.")
 
-def export_session_history(results):
-    """Export multiple classification results to JSON"""
-    export_data = []
-    
-    for result in results:
-        export_data.append({
-            "prediction": result.prediction,
-            "category_label": Config.CATEGORY_LABELS[result.prediction],
-            "confidence": max(result.confidence.values()),
-            "all_confidences": result.confidence,
-            "text": result.input_text,
-            "processing_time": result.processing_time,
-            "timestamp": result.timestamp.isoformat(),
-            "prediction_id": result.prediction_id,
-            "text_statistics": result.text_statistics
-        })
-    
-    # Convert to JSON string
-    json_str = json.dumps(export_data, indent=2, ensure_ascii=False)
+def offer_export_download(path, file_name, mime, key, label):
+    """Download button for an export file within the inline size limit; returns False when it is too large
+    
+    Streamlit holds the whole file in memory to serve a download_button, so
+    large exports are left on disk instead of undoing the chunked writing.
+    """
+    if os.path.getsize(path) > Config.EXPORT_INLINE_MAX_MB * 1024 * 1024:
+        return False
+    with open(path, "rb") as f:
+        st.download_button(label=label, data=f, file_name=file_name, mime=mime, key=key)
+    return True
+
+def export_session_history(results, export_format="ndjson", include_text=True, include_embedding=False):
+    """Export multiple classification results to an NDJSON or Parquet file streamed in chunks"""
+    try:
+        export_path = export_to_file(
+            results,
+            export_format,
+            category_labels=Config.CATEGORY_LABELS,
+            categories=Config.CATEGORIES,
+            include_text=include_text,
+            include_embedding=include_embedding
+        )
+    except ImportError as e:
+        st.error(str(e))
+        return
     
-    # Use Streamlit download button
-    st.download_button(
-        label="📥 Download All Results",
-        data=json_str,
-        file_name=f"classification_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-        mime="application/json",
-        key="download_all_results"
-    )
+    extension = EXPORT_FORMATS[export_format]["extension"]
+    file_name = f"classification_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+    if not offer_export_download(export_path, file_name, EXPORT_FORMATS[export_format]["mime"],
+                                 key="download_all_results", label="📥 Download All Results"):
+        # Too large for the browser download: keep it next to the background job exports
+        os.makedirs(Config.EXPORTS_DIR, exist_ok=True)
+        kept_path = os.path.join(Config.EXPORTS_DIR, file_name)
+        shutil.move(export_path, kept_path)
+        st.warning(f"The export is larger than {Config.EXPORT_INLINE_MAX_MB:.0f} MB, the in-browser download "
+                   f"limit (KHMER_CLASSIFIER_EXPORT_INLINE_MB). It was saved on the server: {kept_path}")
+        return
+    os.remove(export_path)
     
     st.success(f"Export ready! {len(results)} records included.")
     
@@ -1313,6 +879,20 @@ def render_single_analysis():
                         st.experimental_rerun()
                     except:
                         pass
+            
+            # Corrections are queued and learned incrementally (online_learning.py update)
+            with st.expander("✏️ Correct category"):
+                corrected = st.selectbox(
+                    "Correct category:", Config.CATEGORIES,
+                    index=Config.CATEGORIES.index(result.prediction) if result.prediction in Config.CATEGORIES else 0,
+                    format_func=lambda category: Config.CATEGORY_LABELS[category], key="correction_category"
+                )
+                if st.button("Submit correction", type="secondary", use_container_width=True):
+                    if corrected == result.prediction:
+                        st.info("That is already the predicted category.")
+                    else:
+                        get_correction_queue().add(result.embedding, corrected, result.prediction, result.input_text)
+                        st.success(f"Correction saved: {Config.CATEGORY_LABELS[corrected]}")
         
         else:
             st.markdown("""
@@ -1327,6 +907,264 @@ def render_single_analysis():
             </div>
             """, unsafe_allow_html=True)
 
+def render_batch_upload():
+    """Batch classification of CSV / ZIP uploads on a background thread"""
+    st.markdown("### Batch Upload")
+    st.markdown("*Classify many articles at once: a CSV with a text column, a ZIP of .txt/.pdf files, "
+                "or a ZIP with a metadata.csv manifest and one file per docId*")
+    
+    job = st.session_state.get('batch_job')
+    
+    if job is None or not job.running:
+        uploaded = st.file_uploader(
+            "Choose a CSV or ZIP file",
+            type=["csv", "zip"],
+            key="batch_upload_file",
+            help="CSV: one article per row. ZIP: .txt/.pdf files, optionally with a metadata.csv manifest"
+        )
+        
+        text_column = None
+        if uploaded is not None and uploaded.name.lower().endswith(".csv"):
+            columns = list(pd.read_csv(uploaded, nrows=0).columns)
+            uploaded.seek(0)
+            default_column = guess_text_column(columns)
+            text_column = st.selectbox(
+                "Text column:",
+                columns,
+                index=columns.index(default_column) if default_column in columns else 0,
+                key="batch_text_column"
+            )
+        
+        batch_size = st.slider("Batch size:", min_value=1, max_value=128, value=16, key="batch_size",
+                               help="Documents classified per SVM call")
+        use_worker = st.toggle(
+            "Run in background worker",
+            key="batch_use_worker",
+            help="Queue the documents for background_tasks.py: jobs keep running if the browser "
+                 "disconnects or the app restarts"
+        )
+        
+        if uploaded is not None and st.button("Start Batch Classification", type="primary", use_container_width=True):
+            try:
+                if uploaded.name.lower().endswith(".csv"):
+                    documents = load_documents_from_csv(uploaded, text_column)
+                else:
+                    documents = load_documents_from_zip(uploaded)
+            except Exception as e:
+                st.error(f"Could not read upload: {e}")
+                documents = []
+            
+            if documents and use_worker:
+                job_ids = enqueue_batch_documents(documents, batch_size)
+                track_background_jobs(job_ids)
+                st.success(f"Queued {len(documents):,} documents as {len(job_ids)} background jobs")
+            elif documents:
+                st.session_state.batch_export = None
+                engine = get_classification_engine()
+                job = BatchJob(
+                    documents,
+                    engine.classify_batch,
+                    pdf_to_text=lambda data: read_pdf_text(io.BytesIO(data)),
+                    batch_size=batch_size
+                ).start()
+                st.session_state.batch_job = job
+            elif uploaded is not None:
+                st.warning("No documents with text were found in the upload.")
+    
+    if st.session_state.get('batch_job') is not None:
+        render_batch_progress()
+    
+    # Only jobs this browser queued (session state or the page URL): the queue is
+    # shared by every visitor, so it is never listed as a whole
+    restore_background_jobs()
+    if st.session_state.get('background_job_ids'):
+        render_background_jobs()
+
+def _get_query_jobs():
+    if hasattr(st, "query_params"):
+        value = st.query_params.get("jobs", "")
+    else:
+        value = ",".join(st.experimental_get_query_params().get("jobs", []))
+    return [job_id for job_id in value.split(",") if job_id]
+
+def _set_query_jobs(job_ids):
+    if hasattr(st, "query_params"):
+        st.query_params["jobs"] = ",".join(job_ids)
+    else:
+        st.experimental_set_query_params(jobs=",".join(job_ids))
+
+def track_background_jobs(job_ids):
+    """Follow job IDs in this session and in the page URL, so a reloaded or reopened page finds them again"""
+    tracked = st.session_state.setdefault('background_job_ids', [])
+    tracked.extend(job_id for job_id in job_ids if job_id not in tracked)
+    _set_query_jobs(tracked)
+
+def restore_background_jobs():
+    """Pick up the jobs listed in the URL after a browser disconnect or reload"""
+    if not st.session_state.get('background_job_ids'):
+        job_ids = _get_query_jobs()
+        if job_ids:
+            st.session_state.background_job_ids = job_ids
+
+def enqueue_batch_documents(documents, batch_size):
+    """Queue documents for the background worker in jobs of batch_size documents"""
+    job_queue = get_job_queue()
+    upload_dir = os.path.join(Config.JOBS_DIR, "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    
+    job_ids = []
+    for start in range(0, len(documents), batch_size):
+        payload_documents = []
+        for document in documents[start:start + batch_size]:
+            if document.kind == "pdf":
+                # PDFs are spooled to disk under their content hash so the payload stays small
+                pdf_path = os.path.join(upload_dir, hashlib.sha256(document.payload).hexdigest() + ".pdf")
+                if not os.path.exists(pdf_path):
+                    with open(pdf_path, "wb") as f:
+                        f.write(document.payload)
+                payload_documents.append({"doc_id": document.doc_id, "pdf_path": pdf_path})
+            else:
+                payload_documents.append({"doc_id": document.doc_id, "text": document.payload})
+        job_ids.append(job_queue.enqueue("classify", {"documents": payload_documents, "batch_size": batch_size}))
+    return job_ids
+
+def _render_background_jobs_body():
+    """Status of queued background jobs; finished classification results are moved into the history"""
+    job_ids = st.session_state.get('background_job_ids', [])
+    if not job_ids:
+        return
+    job_queue = get_job_queue()
+    jobs = job_queue.list_jobs(job_ids)
+    
+    st.markdown("#### Background Jobs")
+    imported = st.session_state.setdefault('imported_job_ids', set())
+    for job in jobs:
+        if job["kind"] == "classify" and job["status"] == DONE and job["id"] not in imported:
+            finished = job_queue.get(job["id"])
+            for record in finished["result"]["records"]:
+                st.session_state.classification_history.append(result_from_record(record))
+            imported.add(job["id"])
+    
+    classify_jobs = [job for job in jobs if job["kind"] == "classify"]
+    done_jobs = [job for job in classify_jobs if job["status"] == DONE]
+    overall = sum(job["progress"] for job in classify_jobs) / len(classify_jobs) if classify_jobs else 1.0
+    st.progress(min(1.0, overall), text=f"{len(done_jobs)} / {len(classify_jobs)} jobs finished")
+    
+    st.dataframe(
+        pd.DataFrame([{
+            "Job": job["id"],
+            "Kind": job["kind"],
+            "Status": job["status"],
+            "Progress": f"{job['progress']:.0%}",
+            "Attempts": f"{job['attempts']}/{job['max_attempts']}",
+            "Error": job["error"] or ""
+        } for job in jobs]),
+        use_container_width=True,
+        hide_index=True
+    )
+    if any(job["status"] == "queued" and job["attempts"] == 0 for job in jobs):
+        st.caption("Queued jobs are picked up by the background worker (python background_tasks.py)")
+    
+    action_col1, action_col2 = st.columns(2)
+    with action_col1:
+        if st.button("Cancel Pending Jobs", type="secondary", key="background_cancel", use_container_width=True):
+            for job in jobs:
+                if job["status"] not in FINAL_STATES:
+                    job_queue.cancel(job["id"])
+    with action_col2:
+        if done_jobs and st.button("Export Finished Results", type="secondary", key="background_export",
+                                   use_container_width=True):
+            export_id = job_queue.enqueue("export", {
+                "source_job_ids": [job["id"] for job in done_jobs],
+                "format": "ndjson",
+                "include_text": True
+            })
+            track_background_jobs([export_id])
+    
+    for job in jobs:
+        if job["kind"] == "export" and job["status"] == DONE:
+            export_path = job_queue.get(job["id"])["result"]["path"]
+            if os.path.exists(export_path) and not offer_export_download(
+                    export_path, os.path.basename(export_path), EXPORT_FORMATS["ndjson"]["mime"],
+                    key=f"background_download_{job['id']}", label=f"📥 Download export {job['id'][:8]}"):
+                st.info(f"Export {job['id'][:8]} is larger than {Config.EXPORT_INLINE_MAX_MB:.0f} MB; "
+                        f"it is on the server at {export_path}")
+
+def _render_batch_progress_body():
+    """Progress panel of the current batch job; results are moved into the history here"""
+    job = st.session_state.get('batch_job')
+    if job is None:
+        return
+    
+    for result in job.drain_new_results():
+        st.session_state.classification_history.append(result)
+    
+    progress = job.progress()
+    st.progress(progress["fraction"], text=f"{progress['processed']:,} / {progress['total']:,} documents")
+    
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("Classified", f"{progress['succeeded']:,}")
+    with metric_cols[1]:
+        st.metric("Failed", f"{progress['failed']:,}")
+    with metric_cols[2]:
+        st.metric("Docs/sec", f"{progress['docs_per_sec']:.2f}")
+    with metric_cols[3]:
+        accuracy = progress["accuracy"]
+        st.metric("Manifest Accuracy", f"{accuracy:.1%}" if accuracy is not None else "N/A")
+    
+    if progress["error"]:
+        st.error(f"Batch job stopped: {progress['error']}")
+    elif progress["running"]:
+        if st.button("Cancel Batch", type="secondary", key="batch_cancel"):
+            job.cancel()
+    elif progress["cancelled"]:
+        st.warning(f"Batch cancelled after {progress['processed']:,} documents ({progress['elapsed']:.1f}s)")
+    else:
+        st.success(f"Batch complete in {progress['elapsed']:.1f}s")
+    
+    # Finished results are downloadable at any time; the export file is only
+    # rewritten when new results arrived since it was last prepared
+    if progress["succeeded"]:
+        prepared = st.session_state.get('batch_export')
+        wanted = not progress["running"] or st.button("Prepare Download of Finished Results", key="batch_prepare")
+        if wanted and (prepared is None or prepared[0] != progress["succeeded"]):
+            if prepared is not None and os.path.exists(prepared[1]):
+                os.remove(prepared[1])
+            results = job.completed_results()
+            export_path = export_to_file(results, "ndjson", category_labels=Config.CATEGORY_LABELS)
+            prepared = st.session_state.batch_export = (len(results), export_path)
+        if prepared is not None and os.path.exists(prepared[1]):
+            with open(prepared[1], "rb") as f:
+                st.download_button(
+                    label=f"📥 Download {prepared[0]:,} Results",
+                    data=f,
+                    file_name="batch_results.ndjson",
+                    mime=EXPORT_FORMATS["ndjson"]["mime"],
+                    key="batch_download"
+                )
+    
+    failures = job.failures()
+    if failures:
+        with st.expander(f"Failed documents ({len(failures)})"):
+            st.dataframe(pd.DataFrame(failures), use_container_width=True)
+
+# Re-render the progress panel every second while the rest of the page stays idle
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+if _fragment is not None:
+    render_batch_progress = _fragment(run_every=1)(_render_batch_progress_body)
+    render_background_jobs = _fragment(run_every=2)(_render_background_jobs_body)
+else:
+    def render_batch_progress():
+        """Progress panel with a manual refresh (Streamlit without fragments)"""
+        _render_batch_progress_body()
+        st.button("Refresh Progress", key="batch_refresh")
+    
+    def render_background_jobs():
+        """Background job panel with a manual refresh (Streamlit without fragments)"""
+        _render_background_jobs_body()
+        st.button("Refresh Jobs", key="background_refresh")
+
 def render_session_history():
     """Render the session history page showing all classified articles with improved UI"""
     
@@ -1351,10 +1189,11 @@ def render_session_history():
         """, unsafe_allow_html=True)
         return
     
-    # Enhanced header with statistics
-    total_articles = len(st.session_state.classification_history)
-    categories_used = len(set(result.prediction for result in st.session_state.classification_history))
-    avg_confidence = np.mean([max(result.confidence.values()) for result in st.session_state.classification_history])
+    # Enhanced header with statistics (maintained incrementally by the history index)
+    history = st.session_state.classification_history
+    total_articles = len(history)
+    categories_used = history.categories_used
+    avg_confidence = history.average_confidence
     
     st.markdown("### Session Overview")
     
@@ -1387,10 +1226,7 @@ def render_session_history():
     
     with col4:
         # Most frequent category
-        category_counts = {}
-        for result in st.session_state.classification_history:
-            cat = result.prediction
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+        category_counts = history.category_counts()
         most_common_cat = max(category_counts.items(), key=lambda x: x[1]) if category_counts else ("N/A", 0)
         
         st.markdown(f"""
@@ -1469,51 +1305,58 @@ def render_session_history():
     with filter_col4:
         sort_option = st.selectbox(
             "📅 Sort by:",
-            ["Most Recent", "Oldest First", "Highest Confidence", "Lowest Confidence", "A-Z Category"],
-            help="Choose sorting method"
+            ["Most Recent", "Oldest First", "Highest Confidence", "Lowest Confidence", "A-Z Category", "Relevance"],
+            help="Choose sorting method (Relevance ranks search matches by BM25 score)"
         )
     
-    # Apply filters
-    filtered_results = st.session_state.classification_history.copy()
-    
-    # Category filter
+    # Apply filters as vectorized masks over the history columns
+    selected_cat = None
     if category_filter != "All Categories":
         selected_cat = next(cat for cat, label in Config.CATEGORY_LABELS.items() if label == category_filter)
-        filtered_results = [r for r in filtered_results if r.prediction == selected_cat]
     
-    # Search filter
+    confidence_levels = {
+        "High (>80%)": CONFIDENCE_HIGH,
+        "Medium (50-80%)": CONFIDENCE_MEDIUM,
+        "Low (<50%)": CONFIDENCE_LOW
+    }
+    mask = history.filter_mask(category=selected_cat, confidence_level=confidence_levels.get(confidence_filter))
+    
+    # Search filter: BM25 lookup in the inverted index over segmented tokens,
+    # falling back to a substring scan (of the surviving rows only) for queries
+    # without indexable Khmer terms
+    ranked_rows = None
     if search_query:
-        search_lower = search_query.lower()
-        filtered_results = [
-            r for r in filtered_results 
-            if search_lower in r.input_text.lower()
-        ]
-    
-    # Confidence filter
-    if confidence_filter != "All Levels":
-        if confidence_filter == "High (>80%)":
-            filtered_results = [r for r in filtered_results if max(r.confidence.values()) > 0.8]
-        elif confidence_filter == "Medium (50-80%)":
-            filtered_results = [r for r in filtered_results if 0.5 <= max(r.confidence.values()) <= 0.8]
-        elif confidence_filter == "Low (<50%)":
-            filtered_results = [r for r in filtered_results if max(r.confidence.values()) < 0.5]
+        query_tokens = tokens_from_segmented(
+            TextProcessor.segment_khmer_text(TextProcessor.clean_khmer_text(search_query))
+        )
+        ranked_rows = history.ranked_rows(query_tokens)
+        if len(ranked_rows):
+            mask &= history.filter_mask(rows=ranked_rows)
+        else:
+            ranked_rows = None
+            mask = history.filter_mask(rows=history.substring_rows(search_query, mask))
     
     # Apply sorting
-    if sort_option == "Most Recent":
-        filtered_results = sorted(filtered_results, key=lambda x: x.timestamp, reverse=True)
-    elif sort_option == "Oldest First":
-        filtered_results = sorted(filtered_results, key=lambda x: x.timestamp)
-    elif sort_option == "Highest Confidence":
-        filtered_results = sorted(filtered_results, key=lambda x: max(x.confidence.values()), reverse=True)
-    elif sort_option == "Lowest Confidence":
-        filtered_results = sorted(filtered_results, key=lambda x: max(x.confidence.values()))
-    elif sort_option == "A-Z Category":
-        filtered_results = sorted(filtered_results, key=lambda x: Config.CATEGORY_LABELS[x.prediction])
+    sort_keys = {
+        "Most Recent": SORT_MOST_RECENT,
+        "Oldest First": SORT_OLDEST,
+        "Highest Confidence": SORT_HIGHEST_CONFIDENCE,
+        "Lowest Confidence": SORT_LOWEST_CONFIDENCE,
+        "A-Z Category": SORT_CATEGORY
+    }
+    if sort_option == "Relevance":
+        if ranked_rows is not None:
+            filtered_indices = ranked_rows[mask[ranked_rows]]
+        else:
+            filtered_indices = history.sorted_indices(mask, SORT_MOST_RECENT)
+    else:
+        filtered_indices = history.sorted_indices(mask, sort_keys[sort_option])
+    total_found = len(filtered_indices)
     
     # Results header with count
-    st.markdown(f"### Articles ({len(filtered_results)} found)")
+    st.markdown(f"### Articles ({total_found} found)")
     
-    if not filtered_results:
+    if not total_found:
         st.markdown("""
         <div style="
             text-align: center;
@@ -1531,17 +1374,32 @@ def render_session_history():
         """, unsafe_allow_html=True)
         return
     
+    # Export options
+    export_col1, export_col2, export_col3 = st.columns([1, 1, 2])
+    with export_col1:
+        export_format = st.selectbox("Export format:", list(EXPORT_FORMATS), key="history_export_format",
+                                     format_func=lambda f: {"ndjson": "NDJSON", "parquet": "Parquet"}[f])
+    with export_col2:
+        export_include_text = st.checkbox("Include full text", value=True, key="history_export_text")
+    with export_col3:
+        export_include_embedding = st.checkbox("Include embeddings", value=False, key="history_export_embedding")
+    
     # Action buttons
     action_col1, action_col2, action_col3 = st.columns([1, 1, 2])
     
     with action_col1:
         if st.button("Export All", type="primary", use_container_width=True):
-            export_session_history(filtered_results)
+            export_session_history(
+                [history.results[i] for i in filtered_indices],
+                export_format,
+                include_text=export_include_text,
+                include_embedding=export_include_embedding
+            )
     
     with action_col2:
         if st.button("Clear History", type="secondary", use_container_width=True):
             if st.session_state.get('confirm_clear', False):
-                st.session_state.classification_history = []
+                history.clear()
                 st.session_state.confirm_clear = False
                 try:
                     st.experimental_rerun()
@@ -1553,13 +1411,25 @@ def render_session_history():
                 st.warning("Click again to confirm clearing all history")
     
     with action_col3:
-        # Display showing results info
-        st.markdown(f"<p style='text-align: right; color: #6c757d; margin-top: 0.5rem;'>Showing {len(filtered_results)} of {total_articles} articles</p>", unsafe_allow_html=True)
+        # Pagination controls: only the visible page of articles is rendered
+        page_size_col, page_col = st.columns(2)
+        with page_size_col:
+            page_size = st.selectbox("Per page:", [10, 25, 50, 100], key="history_page_size")
+        with page_col:
+            page_total = HistoryIndex.page_count(total_found, page_size)
+            # Keep the remembered page valid when filters shrink the result set
+            if st.session_state.get("history_page_number", 1) > page_total:
+                st.session_state.history_page_number = page_total
+            page_number = st.number_input("Page:", min_value=1, max_value=page_total, step=1,
+                                          key="history_page_number")
+        page_results = history.page(filtered_indices, int(page_number), page_size)
+        first_shown = (int(page_number) - 1) * page_size + 1
+        st.markdown(f"<p style='text-align: right; color: #6c757d; margin-top: 0.5rem;'>Showing {first_shown}-{first_shown + len(page_results) - 1} of {total_found} matching ({total_articles} total) articles</p>", unsafe_allow_html=True)
     
     st.markdown("---")
     
     # Enhanced article cards
-    for i, result in enumerate(filtered_results):
+    for i, result in enumerate(page_results):
         confidence_pct = max(result.confidence.values())
         confidence_color = "#28a745" if confidence_pct > 0.8 else "#ffc107" if confidence_pct > 0.5 else "#dc3545"
         
@@ -1643,17 +1513,7 @@ def render_session_history():
                     st.success("Re-analyzed! Check results in Classifier tab.")
                 
                 # Export individual result
-                export_data = {
-                    "prediction": result.prediction,
-                    "category_label": Config.CATEGORY_LABELS[result.prediction],
-                    "confidence": max(result.confidence.values()),
-                    "all_confidences": result.confidence,
-                    "text": result.input_text,
-                    "processing_time": result.processing_time,
-                    "timestamp": result.timestamp.isoformat(),
-                    "prediction_id": result.prediction_id,
-                    "text_statistics": result.text_statistics
-                }
+                export_data = result_record(result, Config.CATEGORY_LABELS)
                 
                 json_str = json.dumps(export_data, indent=2, ensure_ascii=False)
                 st.download_button(
@@ -1707,8 +1567,9 @@ def main():
     st.markdown("<h1 class='main-header'>Multi-Class Khmer News Classifier</h1>", unsafe_allow_html=True)
 
     # Create tabs for different sections
-    classifier_tab, session_history_tab = st.tabs([
+    classifier_tab, batch_tab, session_history_tab = st.tabs([
         "**Classifier**", 
+        "**Batch Upload**",
         "**Session History**"
     ])
     
@@ -1716,6 +1577,9 @@ def main():
     with classifier_tab:
         render_single_analysis()
     
+    with batch_tab:
+        render_batch_upload()
+    
     with session_history_tab:
         render_session_history()
     
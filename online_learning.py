@@ -0,0 +1,510 @@
+# -*- coding: utf-8 -*-
+"""
+Online Learning from User Corrections
+=====================================
+Retraining the RBF SVC takes about 48 s and needs the whole training
+matrix, so corrections used to be dropped. This module keeps an
+incrementally trainable model on the same 300-dim FastText embeddings:
+
+- ``CorrectionQueue``: SQLite queue of corrected labels (embedding, label,
+  original prediction), filled from the app's "Correct category" action
+- ``OnlineClassifier``: ``SGDClassifier`` (hinge loss) trained with
+  ``partial_fit``, over random Fourier features (``RBFSampler``) that
+  approximate the SVC's RBF kernel, or over the raw embeddings
+- ``ModelRegistry``: versioned snapshots (``v0001.joblib`` + ``v0001.json``)
+  and a ``CURRENT`` pointer switched atomically with ``os.replace``
+- guard: a candidate is promoted only if its accuracy on the test split
+  (``Config.X_TEST_PATH`` / ``Config.Y_TEST_PATH``) is not worse than the
+  reference snapshot's (the ``init`` snapshot the current one descends
+  from) by more than a tolerance, so promotions cannot drift down step by
+  step; corrections of a rejected update are retried, and set aside as
+  rejected after ``--max-attempts`` rejections
+- ``start_model_watcher``: swaps a newly promoted snapshot into a running
+  ``ClassificationEngine`` (``KHMER_CLASSIFIER_ONLINE_MODEL=true``)
+
+Usage:
+    python online_learning.py init      # first snapshot from X_train/y_train
+    python online_learning.py update    # learn the queued corrections (cron or by hand)
+    python online_learning.py status
+    python online_learning.py rollback 3
+    python online_learning.py corrections list --rejected
+    python online_learning.py corrections drop --rejected
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+import feature_store
+from classifier_core import Config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS corrections (
+    id              TEXT PRIMARY KEY,
+    embedding       BLOB NOT NULL,
+    label           TEXT NOT NULL,
+    predicted       TEXT,
+    created_at      REAL NOT NULL,
+    applied_version INTEGER,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    rejected_at     REAL
+);
+CREATE INDEX IF NOT EXISTS corrections_pending ON corrections (applied_version, created_at);
+"""
+
+# Columns added after the first release, for queues created before them
+_ADDED_COLUMNS = {
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "rejected_at": "REAL",
+}
+
+
+class CorrectionQueue:
+    """Durable queue of corrected labels with their document embeddings"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.CORRECTIONS_DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(corrections)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE corrections ADD COLUMN {column} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def add(self, embedding: np.ndarray, label: str, predicted: Optional[str] = None,
+            text: Optional[str] = None) -> str:
+        """Queue a correction; correcting the same document again replaces its label (and re-queues it)"""
+        if label not in Config.CATEGORIES:
+            raise ValueError(f"Unknown category: {label}")
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        key = text.encode("utf-8") if text is not None else vector.tobytes()
+        correction_id = hashlib.sha256(key).hexdigest()[:24]
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO corrections "
+                "(id, embedding, label, predicted, created_at, applied_version, attempts, rejected_at) "
+                "VALUES (?, ?, ?, ?, ?, NULL, 0, NULL)",
+                (correction_id, vector.tobytes(), label, predicted, time.time())
+            )
+        return correction_id
+
+    def pending(self, limit: Optional[int] = None) -> Tuple[List[str], np.ndarray, List[str]]:
+        """(ids, embeddings, labels) of the corrections not learned or rejected yet, oldest first"""
+        query = ("SELECT id, embedding, label FROM corrections "
+                 "WHERE applied_version IS NULL AND rejected_at IS NULL ORDER BY created_at")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + (f" LIMIT {int(limit)}" if limit else "")).fetchall()
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32), []
+        embeddings = np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+        return [row[0] for row in rows], embeddings, [row[2] for row in rows]
+
+    def mark_applied(self, correction_ids: Sequence[str], version: int):
+        with closing(self._connect()) as conn:
+            conn.executemany("UPDATE corrections SET applied_version = ? WHERE id = ?",
+                             [(version, correction_id) for correction_id in correction_ids])
+
+    def mark_rejected(self, correction_ids: Sequence[str], max_attempts: int = 3) -> int:
+        """Count a rejected update against each correction; returns how many reached max_attempts"""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE corrections SET attempts = attempts + 1, "
+                "rejected_at = CASE WHEN attempts + 1 >= ? THEN ? END WHERE id = ?",
+                [(max_attempts, time.time(), correction_id) for correction_id in correction_ids]
+            )
+            rejected = sum(conn.execute("SELECT rejected_at IS NOT NULL FROM corrections WHERE id = ?",
+                                        (correction_id,)).fetchone()[0] for correction_id in correction_ids)
+            conn.execute("COMMIT")
+        return rejected
+
+    def list_corrections(self, rejected: bool = False, limit: Optional[int] = None) -> List[Dict]:
+        """Pending (or rejected) corrections without their embeddings, oldest first"""
+        query = ("SELECT id, label, predicted, created_at, attempts FROM corrections WHERE applied_version IS NULL "
+                 f"AND rejected_at IS {'NOT NULL' if rejected else 'NULL'} ORDER BY created_at")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + (f" LIMIT {int(limit)}" if limit else "")).fetchall()
+        return [dict(zip(("id", "label", "predicted", "created_at", "attempts"), row)) for row in rows]
+
+    def _not_applied(self, correction_ids: Optional[Sequence[str]], rejected: bool) -> Tuple[str, List]:
+        """WHERE clause selecting the given ids, or every rejected correction"""
+        if correction_ids:
+            return (f"applied_version IS NULL AND id IN ({','.join('?' * len(correction_ids))})",
+                    list(correction_ids))
+        return ("applied_version IS NULL AND rejected_at IS NOT NULL", []) if rejected else ("0", [])
+
+    def drop(self, correction_ids: Optional[Sequence[str]] = None, rejected: bool = False) -> int:
+        """Delete the given unlearned corrections, or every rejected one; returns how many"""
+        where, params = self._not_applied(correction_ids, rejected)
+        with closing(self._connect()) as conn:
+            return conn.execute(f"DELETE FROM corrections WHERE {where}", params).rowcount
+
+    def requeue(self, correction_ids: Optional[Sequence[str]] = None, rejected: bool = False) -> int:
+        """Give the given corrections, or every rejected one, a fresh set of attempts"""
+        where, params = self._not_applied(correction_ids, rejected)
+        with closing(self._connect()) as conn:
+            return conn.execute(f"UPDATE corrections SET attempts = 0, rejected_at = NULL WHERE {where}",
+                                params).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with closing(self._connect()) as conn:
+            total, pending, rejected = conn.execute(
+                "SELECT COUNT(*), SUM(applied_version IS NULL AND rejected_at IS NULL), "
+                "SUM(applied_version IS NULL AND rejected_at IS NOT NULL) FROM corrections").fetchone()
+        return {"total": total, "pending": pending or 0, "rejected": rejected or 0}
+
+
+class OnlineClassifier:
+    """Linear SVM trained with partial_fit, optionally over RBF random features
+
+    Exposes predict / decision_function with classes_ in Config.CATEGORIES
+    order, so ClassificationEngine serves it like the SVC.
+    """
+
+    def __init__(self, categories: Sequence[str] = tuple(Config.CATEGORIES), kernel: str = "rbf",
+                 gamma: Optional[float] = None, n_components: int = 2048, alpha: float = 1e-4,
+                 random_state: int = 0):
+        from sklearn.linear_model import SGDClassifier
+
+        self.categories = np.array(sorted(categories))
+        self.kernel = kernel
+        self.gamma = gamma
+        self.n_components = n_components
+        self.random_state = random_state
+        self.sampler = None
+        self.sgd = SGDClassifier(loss="hinge", alpha=alpha, random_state=random_state)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.sgd.classes_
+
+    def _features(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.kernel != "rbf":
+            return X
+        if self.sampler is None:
+            from sklearn.kernel_approximation import RBFSampler
+
+            # gamma="scale" of the SVC: 1 / (n_features * X.var())
+            gamma = self.gamma or 1.0 / (X.shape[1] * max(float(X.var()), 1e-12))
+            self.sampler = RBFSampler(gamma=gamma, n_components=self.n_components,
+                                      random_state=self.random_state).fit(X)
+        return self.sampler.transform(X)
+
+    def partial_fit(self, X, y, sample_weight=None) -> "OnlineClassifier":
+        self.sgd.partial_fit(self._features(X), np.asarray(y), classes=self.categories, sample_weight=sample_weight)
+        return self
+
+    def fit_epochs(self, X, y, epochs: int = 5, batch_size: int = 512, sample_weight=None) -> "OnlineClassifier":
+        """Shuffled mini-batch passes of partial_fit"""
+        X, y = np.asarray(X), np.asarray(y)
+        weights = None if sample_weight is None else np.asarray(sample_weight)
+        rng = np.random.default_rng(self.random_state)
+        for _ in range(epochs):
+            order = rng.permutation(len(X))
+            for start in range(0, len(order), batch_size):
+                rows = order[start:start + batch_size]
+                self.partial_fit(X[rows], y[rows], None if weights is None else weights[rows])
+        return self
+
+    def decision_function(self, X) -> np.ndarray:
+        return self.sgd.decision_function(self._features(X))
+
+    def predict(self, X) -> np.ndarray:
+        return self.sgd.predict(self._features(X))
+
+
+def evaluate(model, X, y) -> float:
+    """Accuracy on (X, y)"""
+    return float(np.mean(model.predict(np.asarray(X)) == np.asarray(y)))
+
+
+class ModelRegistry:
+    """Versioned snapshots with an atomically switched CURRENT pointer"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or Config.ONLINE_MODEL_DIR
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def versions(self) -> List[int]:
+        return sorted(int(name[1:5]) for name in os.listdir(self.directory)
+                      if name.startswith("v") and name.endswith(".json") and name[1:5].isdigit())
+
+    def current_version(self) -> Optional[int]:
+        try:
+            with open(self._path("CURRENT"), "r") as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def metadata(self, version: int) -> Dict:
+        with open(self._path(f"v{version:04d}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def reference_version(self, version: Optional[int] = None) -> Optional[int]:
+        """The init snapshot (no parent) that version, by default the current one, descends from"""
+        version = self.current_version() if version is None else version
+        seen = set()
+        while version is not None and version not in seen:
+            seen.add(version)
+            parent = self.metadata(version).get("parent")
+            if parent is None:
+                return version
+            version = parent
+        return None
+
+    def load(self, version: Optional[int] = None) -> Optional[OnlineClassifier]:
+        version = self.current_version() if version is None else version
+        return None if version is None else joblib.load(self._path(f"v{version:04d}.joblib"))
+
+    def save(self, model: OnlineClassifier, meta: Dict) -> int:
+        """Write a new snapshot (not promoted yet) and return its version"""
+        version = max(self.versions(), default=0) + 1
+        temporary = self._path(f"v{version:04d}.joblib.tmp")
+        joblib.dump(model, temporary)
+        os.replace(temporary, self._path(f"v{version:04d}.joblib"))
+        meta = dict(meta, version=version, created=datetime.now().isoformat(timespec="seconds"))
+        with open(self._path(f"v{version:04d}.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        return version
+
+    def promote(self, version: int):
+        """Point CURRENT at version (atomic for every reader)"""
+        if version not in self.versions():
+            raise ValueError(f"No snapshot v{version:04d} in {self.directory}")
+        temporary = self._path("CURRENT.tmp")
+        with open(temporary, "w") as f:
+            f.write(f"{version}\n")
+        os.replace(temporary, self._path("CURRENT"))
+
+
+@dataclass
+class UpdateReport:
+    """Outcome of one update from the correction queue"""
+    corrections: int
+    baseline_accuracy: Optional[float]
+    candidate_accuracy: Optional[float]
+    version: Optional[int]
+    promoted: bool
+    seconds: float
+    reference_accuracy: Optional[float] = None
+    rejected: int = 0  # Corrections set aside after their last allowed rejection
+
+
+def load_split(x_path: str, y_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    return np.asarray(feature_store.load(x_path)), np.asarray(feature_store.load(y_path))
+
+
+def update_from_corrections(registry: ModelRegistry, queue: CorrectionQueue, X_test, y_test,
+                            X_replay=None, y_replay=None, tolerance: float = 0.005,
+                            correction_weight: float = 5.0, replay_ratio: int = 4, epochs: int = 3,
+                            learning_rate: float = 0.03, limit: Optional[int] = None,
+                            max_attempts: int = 3) -> UpdateReport:
+    """Learn the pending corrections on top of the current snapshot, promoting it if the guard passes
+
+    The guard compares against the reference (init) snapshot, not the current
+    one: each promotion may lose up to tolerance against its parent, so a
+    parent-relative guard would let accuracy slide with every update. After
+    max_attempts rejected updates a correction is set aside as rejected, so
+    one bad correction does not block every later promotion.
+
+    Each pass mixes the corrections (weighted) with replay_ratio times as many
+    random training rows, so the model does not drift towards the corrected
+    categories. Updates use a small constant step: the "optimal" schedule of
+    the initial fit still takes steps large enough to undo it.
+    """
+    start = time.perf_counter()
+    ids, X_corrections, y_corrections = queue.pending(limit)
+    current = registry.load()
+    if not ids or current is None:
+        return UpdateReport(len(ids), None, None, None, False, time.perf_counter() - start)
+
+    baseline_accuracy = evaluate(current, X_test, y_test)
+    reference_version = registry.reference_version()
+    if reference_version is None or reference_version == registry.current_version():
+        reference_accuracy = baseline_accuracy
+    else:
+        reference_accuracy = evaluate(registry.load(reference_version), X_test, y_test)
+    candidate = copy.deepcopy(current)
+    candidate.sgd.set_params(learning_rate="constant", eta0=learning_rate)
+    X_batch, y_batch = X_corrections, np.asarray(y_corrections)
+    weights = np.full(len(ids), correction_weight)
+    if X_replay is not None and len(X_replay):
+        rng = np.random.default_rng(len(registry.versions()))
+        rows = rng.choice(len(X_replay), size=min(len(X_replay), replay_ratio * len(ids)), replace=False)
+        X_batch = np.vstack([X_batch, np.asarray(X_replay)[rows]])
+        y_batch = np.concatenate([y_batch, np.asarray(y_replay)[rows]])
+        weights = np.concatenate([weights, np.ones(len(rows))])
+    candidate.fit_epochs(X_batch, y_batch, epochs=epochs, sample_weight=weights)
+    candidate_accuracy = evaluate(candidate, X_test, y_test)
+
+    if candidate_accuracy < reference_accuracy - tolerance:
+        rejected = queue.mark_rejected(ids, max_attempts)
+        logging.warning(f"Online update rejected: test accuracy {candidate_accuracy:.4f} < reference "
+                        f"{reference_accuracy:.4f} - {tolerance}; {len(ids) - rejected} corrections stay queued, "
+                        f"{rejected} set aside as rejected")
+        return UpdateReport(len(ids), baseline_accuracy, candidate_accuracy, None, False,
+                            time.perf_counter() - start, reference_accuracy, rejected)
+
+    version = registry.save(candidate, {"parent": registry.current_version(), "reference": reference_version,
+                                        "corrections": len(ids), "test_accuracy": candidate_accuracy})
+    registry.promote(version)
+    queue.mark_applied(ids, version)
+    return UpdateReport(len(ids), baseline_accuracy, candidate_accuracy, version, True,
+                        time.perf_counter() - start, reference_accuracy)
+
+
+def start_model_watcher(engine, registry_dir: Optional[str] = None,
+                        interval: float = 30.0) -> Optional[threading.Thread]:
+    """Swap the promoted snapshot into engine now and whenever CURRENT changes (None when disabled)"""
+    if not Config.ONLINE_MODEL:
+        return None
+    registry = ModelRegistry(registry_dir)
+
+    def run():
+        while True:
+            try:
+                version = registry.current_version()
+                if version is not None and version != engine.model_version:
+                    engine.swap_model(registry.load(version), version)
+                    logging.info(f"Serving online model v{version:04d}")
+            except Exception as e:
+                logging.warning(f"Online model swap failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="online-model-watcher", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental learning from user corrections")
+    parser.add_argument("--registry", default=Config.ONLINE_MODEL_DIR)
+    parser.add_argument("--queue", default=Config.CORRECTIONS_DB_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    init_parser = subparsers.add_parser("init", help="Train and promote the first snapshot from X_train")
+    init_parser.add_argument("--kernel", choices=["rbf", "linear"], default="rbf")
+    init_parser.add_argument("--components", type=int, default=2048, help="Random features of the RBF kernel")
+    init_parser.add_argument("--alpha", type=float, default=1e-4)
+    init_parser.add_argument("--epochs", type=int, default=10)
+    init_parser.add_argument("--min-accuracy", type=float, default=0.0,
+                             help="Do not promote below this test accuracy")
+
+    update_parser = subparsers.add_parser("update", help="Learn the queued corrections (guarded)")
+    update_parser.add_argument("--tolerance", type=float, default=0.005, help="Allowed test accuracy drop")
+    update_parser.add_argument("--correction-weight", type=float, default=5.0)
+    update_parser.add_argument("--replay-ratio", type=int, default=4, help="Training rows replayed per correction")
+    update_parser.add_argument("--epochs", type=int, default=3)
+    update_parser.add_argument("--learning-rate", type=float, default=0.03, help="Constant SGD step of updates")
+    update_parser.add_argument("--limit", type=int, default=None)
+    update_parser.add_argument("--max-attempts", type=int, default=3,
+                               help="Rejected updates after which a correction is set aside")
+
+    subparsers.add_parser("status", help="Snapshots and queued corrections")
+    rollback_parser = subparsers.add_parser("rollback", help="Promote an earlier snapshot")
+    rollback_parser.add_argument("version", type=int)
+
+    corrections_parser = subparsers.add_parser("corrections", help="Inspect, drop or re-queue corrections")
+    corrections_parser.add_argument("action", choices=["list", "drop", "requeue"])
+    corrections_parser.add_argument("ids", nargs="*", help="Correction ids (default: every rejected one)")
+    corrections_parser.add_argument("--rejected", action="store_true",
+                                    help="List the rejected corrections instead of the pending ones")
+    corrections_parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    registry = ModelRegistry(args.registry)
+
+    if args.command == "status":
+        current = registry.current_version()
+        for version in registry.versions():
+            meta = registry.metadata(version)
+            marker = "▶" if version == current else " "
+            print(f"{marker} v{version:04d}  accuracy {meta.get('test_accuracy', 0):.4f}  "
+                  f"corrections {meta.get('corrections', 0):>5}  {meta.get('created', '')}")
+        counts = CorrectionQueue(args.queue).counts()
+        print(f"📝 {counts['pending']:,} pending and {counts['rejected']:,} rejected of "
+              f"{counts['total']:,} corrections")
+        return 0
+
+    if args.command == "corrections":
+        queue = CorrectionQueue(args.queue)
+        if args.action == "list":
+            for row in queue.list_corrections(args.rejected, args.limit):
+                created = datetime.fromtimestamp(row["created_at"]).isoformat(timespec="seconds")
+                print(f"{row['id']}  {row['predicted'] or '?':>14} -> {row['label']:<14} "
+                      f"attempts {row['attempts']}  {created}")
+            return 0
+        if not args.ids and not args.rejected:
+            print("❌ Give correction ids or --rejected")
+            return 1
+        if args.action == "drop":
+            print(f"🗑️ Dropped {queue.drop(args.ids, args.rejected):,} corrections")
+        else:
+            print(f"🔁 Re-queued {queue.requeue(args.ids, args.rejected):,} corrections")
+        return 0
+
+    if args.command == "rollback":
+        registry.promote(args.version)
+        print(f"✅ Serving v{args.version:04d}")
+        return 0
+
+    X_test, y_test = load_split(Config.X_TEST_PATH, Config.Y_TEST_PATH)
+    X_train, y_train = load_split(Config.X_TRAIN_PATH, Config.Y_TRAIN_PATH)
+
+    if args.command == "init":
+        start = time.time()
+        model = OnlineClassifier(kernel=args.kernel, n_components=args.components, alpha=args.alpha)
+        model.fit_epochs(X_train, y_train, epochs=args.epochs)
+        accuracy = evaluate(model, X_test, y_test)
+        version = registry.save(model, {"parent": None, "corrections": 0, "test_accuracy": accuracy,
+                                        "kernel": args.kernel, "train_samples": len(X_train)})
+        if accuracy < args.min_accuracy:
+            print(f"❌ v{version:04d} test accuracy {accuracy:.4f} < {args.min_accuracy}; not promoted")
+            return 1
+        registry.promote(version)
+        print(f"✅ v{version:04d} trained in {time.time() - start:.1f}s, test accuracy {accuracy:.4f}")
+        return 0
+
+    report = update_from_corrections(registry, CorrectionQueue(args.queue), X_test, y_test, X_train, y_train,
+                                     args.tolerance, args.correction_weight, args.replay_ratio, args.epochs,
+                                     args.learning_rate, args.limit, args.max_attempts)
+    if report.baseline_accuracy is None:
+        print("ℹ️ Nothing to do (no pending corrections or no promoted snapshot; run init first)")
+        return 0
+    if not report.promoted:
+        print(f"❌ Rejected: accuracy {report.candidate_accuracy:.4f} vs reference {report.reference_accuracy:.4f}"
+              + (f"; {report.rejected} corrections set aside as rejected" if report.rejected else ""))
+        return 1
+    print(f"✅ v{report.version:04d} learned {report.corrections} corrections in {report.seconds:.1f}s, "
+          f"accuracy {report.baseline_accuracy:.4f} -> {report.candidate_accuracy:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
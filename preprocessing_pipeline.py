@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel Preprocessing Pipeline
+===============================
+Importable, process-parallel version of ``2_Data Preprocessing.ipynb``:
+``raw_articles/<docId>.txt`` -> ``preprocessed_articles/<docId>.txt`` for
+the articles listed in ``metadata.csv``, with exactly the notebook's steps:
+
+1. title and content joined with a space
+2. cleaning: NFC, control characters, Khmer symbols and digits, Arabic
+   digits, Latin letters and punctuation removed, whitespace collapsed
+3. word segmentation of the whole text (khmer-nltk by default) with every
+   token normalized and empty tokens dropped
+4. stopword removal (``stopwords.StopwordFilter``, same matching rules)
+
+Documents are sent to worker processes in chunks; each worker loads the
+segmenter and stopword filter once. ``manifest.json`` in the output
+directory records the SHA-256 of every input and of the pipeline settings,
+so a re-run only processes new or changed articles (or everything, when
+the settings or stopword list changed). The manifest is saved as chunks
+complete, so an interrupted run resumes where it stopped.
+
+Usage:
+    python preprocessing_pipeline.py --input raw_articles --output preprocessed_articles \\
+        --metadata metadata.csv --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from classifier_core import Config
+from segmenters import get_segmenter
+from stopwords import StopwordFilter, get_stopword_filter
+from text_normalization import TextNormalizer, normalize_tokens
+
+PIPELINE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+STAGES = ("read", "clean", "segment", "stopwords", "write")
+
+# Punctuation removed by the preprocessing notebook (unlike Config.PUNCTUATION it keeps '-')
+NOTEBOOK_PUNCTUATION = set('!@#$%^&*()_+=[]{};\'"\\|,.<>?/`~፡.,፣;፤፥፦፧፪፠፨')
+_normalizer = TextNormalizer(
+    Config.KHSYM | Config.KHNUMBER | Config.ARABIC_NUMBER | Config.LATIN_CHARS | NOTEBOOK_PUNCTUATION
+)
+
+
+@dataclass
+class PipelineSettings:
+    """Everything that changes the output of the pipeline"""
+    segmenter: str = "khmernltk"
+    lexicon_path: Optional[str] = None
+    stopwords_path: Optional[str] = Config.STOPWORDS_PATH
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha256(json.dumps([PIPELINE_VERSION, self.segmenter]).encode())
+        for path in (self.lexicon_path, self.stopwords_path):
+            if path and os.path.exists(path):
+                with open(path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+            else:
+                digest.update(b"-")
+        return digest.hexdigest()
+
+
+@dataclass
+class PipelineReport:
+    """Outcome and cost of a pipeline run"""
+    total: int = 0
+    processed: int = 0
+    skipped: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    stopwords_removed: int = 0
+    wall_seconds: float = 0.0
+    hash_seconds: float = 0.0
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: {stage: 0.0 for stage in STAGES})
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.processed / self.wall_seconds if self.wall_seconds else 0.0
+
+    def summary(self) -> str:
+        lines = [f"{self.processed:,} processed, {self.skipped:,} unchanged, {len(self.failed):,} failed "
+                 f"of {self.total:,} articles in {self.wall_seconds:.1f}s ({self.docs_per_second:.1f} docs/s)",
+                 f"  {'hash':<10} {self.hash_seconds:8.2f}s (manifest check)"]
+        for stage in STAGES:
+            per_doc = self.stage_seconds[stage] * 1000 / self.processed if self.processed else 0.0
+            lines.append(f"  {stage:<10} {self.stage_seconds[stage]:8.2f}s worker time, {per_doc:7.2f} ms/doc")
+        return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Preprocessing steps (notebook-equivalent)
+# ----------------------------------------------------------------------
+
+def combine_title_and_content(raw_text: str) -> str:
+    """'<title>\\n\\n<content>' article file -> 'title content'"""
+    parts = raw_text.split('\n\n', 1)
+    title = parts[0] if parts else ""
+    content = parts[1] if len(parts) > 1 else ""
+    return f"{title} {content}"
+
+
+def clean_text(text: str) -> str:
+    return _normalizer.clean(text)
+
+
+def segment_text(segmenter, text: str) -> str:
+    """Segment the whole text; normalized, non-empty tokens joined by spaces"""
+    try:
+        return ' '.join(token for token in normalize_tokens(segmenter.tokenize(text)) if token)
+    except Exception as e:
+        logging.warning(f"Error in segmentation: {e}")
+        return text
+
+
+def preprocess_text(text: str, segmenter, stopword_filter: StopwordFilter,
+                    timings: Optional[Dict[str, float]] = None) -> Tuple[str, int]:
+    """Preprocessed text and the number of stopwords removed"""
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    cleaned = clean_text(text)
+    segment_start = time.perf_counter()
+    segmented = segment_text(segmenter, cleaned)
+    stopword_start = time.perf_counter()
+    kept, removed = stopword_filter.filter_tokens(segmented.split())
+    end = time.perf_counter()
+    timings["clean"] = timings.get("clean", 0.0) + segment_start - start
+    timings["segment"] = timings.get("segment", 0.0) + stopword_start - segment_start
+    timings["stopwords"] = timings.get("stopwords", 0.0) + end - stopword_start
+    return ' '.join(kept), removed
+
+
+# ----------------------------------------------------------------------
+# Worker processes
+# ----------------------------------------------------------------------
+
+_worker_state = {}
+
+
+def _init_worker(settings: PipelineSettings):
+    """Load the segmenter and stopword filter once per worker process"""
+    _worker_state["segmenter"] = get_segmenter(settings.segmenter, settings.lexicon_path)
+    _worker_state["stopwords"] = (get_stopword_filter(settings.stopwords_path) if settings.stopwords_path
+                                  else StopwordFilter(()))
+
+
+def _write_atomic(path: str, text: str):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+
+def _process_chunk(items: List[Tuple[str, str, str]]) -> Tuple[List[Dict], Dict[str, float]]:
+    """Process (doc_id, input path, output path) items; returns per-document results and stage times"""
+    timings = {stage: 0.0 for stage in STAGES}
+    results = []
+    for doc_id, input_path, output_path in items:
+        try:
+            start = time.perf_counter()
+            with open(input_path, "r", encoding="utf-8") as f:
+                text = combine_title_and_content(f.read())
+            timings["read"] += time.perf_counter() - start
+
+            processed, removed = preprocess_text(text, _worker_state["segmenter"], _worker_state["stopwords"],
+                                                 timings)
+
+            start = time.perf_counter()
+            _write_atomic(output_path, processed)
+            timings["write"] += time.perf_counter() - start
+            results.append({"doc_id": doc_id, "stopwords_removed": removed})
+        except Exception as e:
+            results.append({"doc_id": doc_id, "error": f"{type(e).__name__}: {e}"})
+    return results, timings
+
+
+# ----------------------------------------------------------------------
+# Pipeline
+# ----------------------------------------------------------------------
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PreprocessingPipeline:
+    """Incremental, process-parallel raw_articles -> preprocessed_articles"""
+
+    def __init__(self, input_dir: str = "raw_articles", output_dir: str = "preprocessed_articles",
+                 metadata_path: Optional[str] = "metadata.csv", workers: Optional[int] = None,
+                 chunk_size: int = 32, settings: Optional[PipelineSettings] = None,
+                 manifest_every: int = 20):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.metadata_path = metadata_path
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.settings = settings or PipelineSettings()
+        self.manifest_every = manifest_every
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    def document_ids(self) -> List[str]:
+        """Articles to preprocess: metadata.csv order, or every .txt in the input directory"""
+        if self.metadata_path:
+            import pandas as pd
+            return [str(doc_id) for doc_id in pd.read_csv(self.metadata_path)["docId"]]
+        return sorted(name[:-4] for name in os.listdir(self.input_dir) if name.endswith(".txt"))
+
+    def load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("settings") != self.settings.fingerprint():
+            # Different segmenter, lexicon or stopword list: every output is stale
+            manifest = {"settings": self.settings.fingerprint(), "documents": {}}
+        manifest.setdefault("documents", {})
+        return manifest
+
+    def save_manifest(self, manifest: Dict):
+        temporary = f"{self.manifest_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(temporary, self.manifest_path)
+
+    def plan(self, manifest: Dict) -> Tuple[List[Tuple[str, str, str, Dict]], int, int]:
+        """Documents to (re)process with their input fingerprints, unchanged count, missing count"""
+        todo, unchanged, missing = [], 0, 0
+        documents = manifest["documents"]
+        for doc_id in self.document_ids():
+            input_path = os.path.join(self.input_dir, f"{doc_id}.txt")
+            output_path = os.path.join(self.output_dir, f"{doc_id}.txt")
+            try:
+                stat = os.stat(input_path)
+            except OSError:
+                missing += 1
+                continue
+            entry = documents.get(doc_id)
+            if entry and os.path.exists(output_path):
+                # Size and mtime unchanged: trust the recorded hash; otherwise compare contents
+                if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+                    unchanged += 1
+                    continue
+                sha256 = file_sha256(input_path)
+                if entry.get("sha256") == sha256:
+                    entry["mtime_ns"] = stat.st_mtime_ns
+                    unchanged += 1
+                    continue
+            else:
+                sha256 = file_sha256(input_path)
+            todo.append((doc_id, input_path, output_path,
+                         {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}))
+        return todo, unchanged, missing
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # forkserver/spawn, as in segmentation_pool: never fork a multi-threaded parent
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(self.settings,))
+
+    def run(self) -> PipelineReport:
+        start = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        report = PipelineReport()
+        manifest = self.load_manifest()
+        todo, report.skipped, missing = self.plan(manifest)
+        report.total = len(todo) + report.skipped + missing
+        report.hash_seconds = time.perf_counter() - start
+        if missing:
+            logging.warning(f"{missing} articles listed in the metadata have no input file")
+
+        fingerprints = {doc_id: fingerprint for doc_id, _, _, fingerprint in todo}
+        chunks = [[item[:3] for item in todo[i:i + self.chunk_size]] for i in range(0, len(todo), self.chunk_size)]
+
+        def collect(results, timings, completed):
+            for result in results:
+                doc_id = result["doc_id"]
+                if "error" in result:
+                    report.failed.append((doc_id, result["error"]))
+                    manifest["documents"].pop(doc_id, None)
+                    continue
+                report.processed += 1
+                report.stopwords_removed += result["stopwords_removed"]
+                manifest["documents"][doc_id] = dict(fingerprints[doc_id],
+                                                     stopwords_removed=result["stopwords_removed"])
+            for stage, seconds in timings.items():
+                report.stage_seconds[stage] += seconds
+            if completed % self.manifest_every == 0:
+                self.save_manifest(manifest)
+
+        if chunks and self.workers == 1:
+            _init_worker(self.settings)
+            for completed, chunk in enumerate(chunks, 1):
+                collect(*_process_chunk(chunk), completed)
+        elif chunks:
+            with self._executor() as executor:
+                futures = [executor.submit(_process_chunk, chunk) for chunk in chunks]
+                for completed, future in enumerate(as_completed(futures), 1):
+                    collect(*future.result(), completed)
+
+        manifest["last_run"] = {"finished": time.strftime("%Y-%m-%dT%H:%M:%S"), "processed": report.processed,
+                                "skipped": report.skipped, "failed": len(report.failed)}
+        self.save_manifest(manifest)
+        report.wall_seconds = time.perf_counter() - start
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preprocess raw articles in parallel (incremental)")
+    parser.add_argument("--input", default="raw_articles")
+    parser.add_argument("--output", default="preprocessed_articles")
+    parser.add_argument("--metadata", default="metadata.csv", help="Articles to process ('' for every .txt file)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Articles per work unit")
+    parser.add_argument("--segmenter", default="khmernltk", choices=["khmernltk", "trie"])
+    parser.add_argument("--lexicon", default=None, help="Lexicon of the trie segmenter")
+    parser.add_argument("--stopwords", default=Config.STOPWORDS_PATH, help="Stopword list ('' to keep stopwords)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    settings = PipelineSettings(args.segmenter, args.lexicon, args.stopwords or None)
+    pipeline = PreprocessingPipeline(args.input, args.output, args.metadata or None, args.workers,
+                                     args.chunk_size, settings)
+    print(f"⚙️ Preprocessing {args.input} -> {args.output} with {pipeline.workers} workers")
+    report = pipeline.run()
+    print(f"✅ {report.summary()}")
+    print(f"   {report.stopwords_removed:,} stopwords removed")
+    for doc_id, error in report.failed[:10]:
+        print(f"❌ {doc_id}: {error}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
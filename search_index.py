@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Inverted Index Search (BM25)
+============================
+Incrementally maintained inverted index over segmented Khmer documents with
+Okapi BM25 ranking. It is used by the Session History page (each classified
+article is indexed with the tokens produced by ``segment_khmer_text``) and
+can be built offline over the preprocessed article archive listed in
+``metadata.csv``.
+
+Postings are stored per term in compact ``array`` buffers that grow on
+append, and are scored with NumPy at query time, so a lookup only touches the
+postings of the query terms.
+
+Usage:
+    python search_index.py build --metadata metadata.csv --texts preprocessed_articles --output archive_index.npz
+    python search_index.py query --index archive_index.npz "<segmented query>"
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Tokens that carry no meaning for search (sentence delimiters kept by segmentation)
+SKIP_TOKENS = frozenset(['។', '.', '!', '?', '៕'])
+
+
+def tokens_from_segmented(segmented_text: str) -> List[str]:
+    """Split segmented text into index terms"""
+    return [token for token in segmented_text.split() if token not in SKIP_TOKENS]
+
+
+class InvertedIndex:
+    """Append-only inverted index with BM25 ranking"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_ids: Dict[str, int] = {}
+        self._postings_docs: List[array] = []
+        self._postings_tfs: List[array] = []
+        self._doc_lengths = array('I')
+        self.doc_keys: List[str] = []
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_keys)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.term_ids)
+
+    @property
+    def average_doc_length(self) -> float:
+        return self._total_length / len(self.doc_keys) if self.doc_keys else 0.0
+
+    def clear(self):
+        """Remove every document from the index"""
+        self.__init__(self.k1, self.b)
+
+    def add_document(self, key: str, tokens: Iterable[str]) -> int:
+        """Index a document's tokens and return its internal document id"""
+        doc_id = len(self.doc_keys)
+        counts: Dict[str, int] = {}
+        length = 0
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+            length += 1
+
+        for term, tf in counts.items():
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                term_id = len(self._postings_docs)
+                self.term_ids[term] = term_id
+                self._postings_docs.append(array('I'))
+                self._postings_tfs.append(array('I'))
+            self._postings_docs[term_id].append(doc_id)
+            self._postings_tfs[term_id].append(tf)
+
+        self.doc_keys.append(key)
+        self._doc_lengths.append(length)
+        self._total_length += length
+        return doc_id
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        return len(self._postings_docs[term_id]) if term_id is not None else 0
+
+    def score(self, query_tokens: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """BM25 scores of every document matching at least one query term
+
+        Returns (doc_ids, scores) for the matching documents, unsorted.
+        """
+        n_docs = len(self.doc_keys)
+        term_ids = {self.term_ids[t] for t in query_tokens if t in self.term_ids}
+        if not n_docs or not term_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.uint32)
+        length_norm = self.k1 * (1 - self.b + self.b * doc_lengths / max(self.average_doc_length, 1e-9))
+
+        doc_parts, score_parts = [], []
+        for term_id in term_ids:
+            docs = np.frombuffer(self._postings_docs[term_id], dtype=np.uint32)
+            tfs = np.frombuffer(self._postings_tfs[term_id], dtype=np.uint32).astype(np.float64)
+            df = len(docs)
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            doc_parts.append(docs)
+            score_parts.append(idf * tfs * (self.k1 + 1) / (tfs + length_norm[docs]))
+
+        docs = np.concatenate(doc_parts).astype(np.int64)
+        scores = np.concatenate(score_parts)
+        if len(doc_parts) == 1:
+            return docs, scores
+
+        # Sum the per-term contributions of documents matching several terms
+        unique_docs, inverse = np.unique(docs, return_inverse=True)
+        return unique_docs, np.bincount(inverse, weights=scores)
+
+    def search(self, query_tokens: Sequence[str], top_k: Optional[int] = 10) -> List[Tuple[str, float]]:
+        """Top-k (key, score) pairs ordered by decreasing BM25 score"""
+        return [(self.doc_keys[d], s) for d, s in zip(*self.ranked_doc_ids(query_tokens, top_k))]
+
+    def ranked_doc_ids(self, query_tokens: Sequence[str], top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Matching internal doc ids and scores ordered by decreasing score"""
+        docs, scores = self.score(query_tokens)
+        if top_k is not None and len(scores) > top_k:
+            keep = np.argpartition(-scores, top_k - 1)[:top_k]
+            docs, scores = docs[keep], scores[keep]
+        order = np.argsort(-scores, kind="stable")
+        return docs[order], scores[order]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """Write the index as an .npz file (CSR postings plus JSON metadata)"""
+        terms = [None] * len(self.term_ids)
+        for term, term_id in self.term_ids.items():
+            terms[term_id] = term
+        lengths = np.array([len(p) for p in self._postings_docs], dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        postings_docs = np.concatenate([np.frombuffer(p, dtype=np.uint32) for p in self._postings_docs]) \
+            if self._postings_docs else np.empty(0, dtype=np.uint32)
+        postings_tfs = np.concatenate([np.frombuffer(p, dtype=np.uint32) for p in self._postings_tfs]) \
+            if self._postings_tfs else np.empty(0, dtype=np.uint32)
+        meta = json.dumps({"terms": terms, "doc_keys": self.doc_keys, "k1": self.k1, "b": self.b},
+                          ensure_ascii=False)
+        np.savez(path, offsets=offsets, postings_docs=postings_docs, postings_tfs=postings_tfs,
+                 doc_lengths=np.frombuffer(self._doc_lengths, dtype=np.uint32),
+                 meta=np.frombuffer(meta.encode("utf-8"), dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        """Load an index written by save(); it stays appendable"""
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            index = cls(k1=meta["k1"], b=meta["b"])
+            offsets = data["offsets"]
+            postings_docs = data["postings_docs"]
+            postings_tfs = data["postings_tfs"]
+            for term_id, term in enumerate(meta["terms"]):
+                start, end = offsets[term_id], offsets[term_id + 1]
+                index.term_ids[term] = term_id
+                index._postings_docs.append(array('I', postings_docs[start:end].tobytes()))
+                index._postings_tfs.append(array('I', postings_tfs[start:end].tobytes()))
+            index._doc_lengths = array('I', data["doc_lengths"].astype(np.uint32).tobytes())
+        index.doc_keys = meta["doc_keys"]
+        index._total_length = int(sum(index._doc_lengths))
+        return index
+
+    @classmethod
+    def build_from_archive(cls, metadata_path: str, texts_dir: str) -> "InvertedIndex":
+        """Index every preprocessed (already segmented) article listed in metadata.csv"""
+        import pandas as pd
+
+        metadata = pd.read_csv(metadata_path)
+        index = cls()
+        for doc_id in metadata['docId']:
+            file_path = os.path.join(texts_dir, f"{doc_id}.txt")
+            if not os.path.exists(file_path):
+                continue
+            with open(file_path, 'r', encoding='utf-8') as f:
+                index.add_document(doc_id, tokens_from_segmented(f.read()))
+        return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the BM25 article index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Index the preprocessed article archive")
+    build_parser.add_argument("--metadata", default="metadata.csv")
+    build_parser.add_argument("--texts", default="preprocessed_articles")
+    build_parser.add_argument("--output", default="archive_index.npz")
+
+    query_parser = subparsers.add_parser("query", help="Run a ranked query against a saved index")
+    query_parser.add_argument("--index", default="archive_index.npz")
+    query_parser.add_argument("--top-k", type=int, default=10)
+    query_parser.add_argument("query", help="Space-separated (segmented) query terms")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.time()
+        index = InvertedIndex.build_from_archive(args.metadata, args.texts)
+        index.save(args.output)
+        print(f"Indexed {len(index):,} documents ({index.vocabulary_size:,} terms) "
+              f"in {time.time() - start:.2f}s -> {args.output}")
+        return 0
+
+    index = InvertedIndex.load(args.index)
+    start = time.perf_counter()
+    results = index.search(tokens_from_segmented(args.query), top_k=args.top_k)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for rank, (key, score) in enumerate(results, 1):
+        print(f"{rank:>3}. {key:<20} {score:.4f}")
+    print(f"{len(results)} results in {elapsed_ms:.2f} ms over {len(index):,} documents")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-Process Segmentation Pool
+===============================
+Word segmentation (khmer-nltk CRF in particular) is CPU-bound and
+independent per sentence. ``SegmentationPool`` splits documents into
+sentences, groups consecutive sentences into chunks, runs the chunks on
+worker processes that load the segmenter once at start-up, and reassembles
+the segmented documents in their original order. The output is identical to
+``TextProcessor.segment_khmer_text``.
+
+The engine cleans text with ``TextProcessor.clean_khmer_sentences``, which
+keeps the raw text's sentence boundaries as line breaks, so a long article
+reaches the pool as many sentences. A sentence that is still very long is
+cut at whitespace into pieces of about ``max_piece_chars`` only for
+backends for which a space is a hard word boundary
+(``Segmenter.whitespace_is_boundary``: the trie); the khmer-nltk CRF uses
+the context around each word, so its sentences are segmented whole.
+
+Chunks are sized from the amount of text to segment: large enough to
+amortize the inter-process round trip, small enough to give every worker
+several chunks for load balancing. Inputs below ``min_parallel_chars`` are
+segmented in-process.
+
+``ClassificationEngine`` uses the shared pool for single articles and
+batches when ``KHMER_CLASSIFIER_SEGMENTATION_WORKERS`` is greater than 1.
+"""
+
+import atexit
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+from segmenters import get_segmenter, join_sentences, segment_sentence, segmenter_class, split_sentences
+
+# Worker-process state, set by _init_worker
+_worker_segmenter = None
+
+
+def _init_worker(segmenter_name: str, lexicon_path: Optional[str]):
+    """Load the segmenter once per worker process"""
+    global _worker_segmenter
+    _worker_segmenter = get_segmenter(segmenter_name, lexicon_path)
+
+
+def _segment_chunk(sentences: List[str]) -> List[Optional[str]]:
+    return [segment_sentence(_worker_segmenter, sentence) for sentence in sentences]
+
+
+class SegmentationPool:
+    """Process pool segmenting documents sentence-chunk by sentence-chunk"""
+
+    def __init__(self, workers: int, segmenter_name: str = "khmernltk", lexicon_path: Optional[str] = None,
+                 min_chunk_chars: int = 2000, max_chunk_chars: int = 64000, chunks_per_worker: int = 4,
+                 min_parallel_chars: int = 4000, max_piece_chars: int = 1000):
+        self.workers = max(1, workers)
+        self.segmenter_name = segmenter_name
+        self.lexicon_path = lexicon_path
+        self.min_chunk_chars = min_chunk_chars
+        self.max_chunk_chars = max_chunk_chars
+        self.chunks_per_worker = chunks_per_worker
+        self.min_parallel_chars = min_parallel_chars
+        self.max_piece_chars = max_piece_chars
+        self.cut_at_whitespace = segmenter_class(segmenter_name, lexicon_path).whitespace_is_boundary
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # forkserver/spawn: never fork the (multi-threaded) Streamlit server process
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.segmenter_name, self.lexicon_path)
+            )
+        return self._executor
+
+    def warm_up(self):
+        """Start every worker process (and load its segmenter) ahead of the first request"""
+        if self.workers > 1:
+            list(self._get_executor().map(_segment_chunk, [[] for _ in range(self.workers)]))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def chunk_size_chars(self, total_chars: int) -> int:
+        """Target characters per chunk for a workload of total_chars"""
+        target = total_chars // (self.workers * self.chunks_per_worker)
+        return max(self.min_chunk_chars, min(self.max_chunk_chars, target))
+
+    def _split_sentence(self, sentence: str) -> List[str]:
+        """Cut an overly long sentence at whitespace into pieces of about max_piece_chars
+
+        Only for backends whose tokens cannot depend on text across a space.
+        """
+        if not self.cut_at_whitespace or len(sentence) <= self.max_piece_chars:
+            return [sentence]
+        pieces, current, current_chars = [], [], 0
+        for word in sentence.split():
+            current.append(word)
+            current_chars += len(word) + 1
+            if current_chars >= self.max_piece_chars:
+                pieces.append(' '.join(current))
+                current, current_chars = [], 0
+        if current:
+            pieces.append(' '.join(current))
+        return pieces
+
+    def _make_chunks(self, sentences: Sequence[str], total_chars: int) -> List[List[str]]:
+        target = self.chunk_size_chars(total_chars)
+        chunks, current, current_chars = [], [], 0
+        for sentence in sentences:
+            current.append(sentence)
+            current_chars += len(sentence)
+            if current_chars >= target:
+                chunks.append(current)
+                current, current_chars = [], 0
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def segment_documents(self, texts: Sequence[str]) -> List[str]:
+        """Segment every text, returning results in input order"""
+        # Per document, per sentence: the pieces sent to the segmenter
+        document_pieces = [[self._split_sentence(sentence) for sentence in split_sentences(text)]
+                           for text in texts]
+        pieces = [piece for doc in document_pieces for sentence in doc for piece in sentence]
+        total_chars = sum(len(piece) for piece in pieces)
+
+        if self.workers == 1 or total_chars < self.min_parallel_chars:
+            segmenter = get_segmenter(self.segmenter_name, self.lexicon_path)
+            segmented = [segment_sentence(segmenter, piece) for piece in pieces]
+        else:
+            chunks = self._make_chunks(pieces, total_chars)
+            segmented = [s for chunk in self._get_executor().map(_segment_chunk, chunks) for s in chunk]
+
+        # Reassemble pieces into sentences and sentences into documents, in order
+        results, position = [], 0
+        for text, doc in zip(texts, document_pieces):
+            processed = []
+            for sentence in doc:
+                words = ' '.join(s for s in segmented[position:position + len(sentence)] if s)
+                position += len(sentence)
+                if words:
+                    processed.append(words)
+            results.append(join_sentences(processed, text))
+        return results
+
+    def segment_text(self, text: str) -> str:
+        return self.segment_documents([text])[0]
+
+
+@lru_cache(maxsize=None)
+def get_shared_pool(workers: int, segmenter_name: str, lexicon_path: Optional[str] = None) -> SegmentationPool:
+    """Process-wide pool for a configuration (shut down at interpreter exit)"""
+    pool = SegmentationPool(workers, segmenter_name, lexicon_path)
+    atexit.register(pool.shutdown)
+    logging.info(f"Segmentation pool: {workers} workers ({segmenter_name})")
+    return pool
+
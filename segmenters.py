@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Pluggable Khmer Word Segmenters
+===============================
+``TextProcessor.segment_khmer_text`` splits text into sentences and hands
+each sentence to a segmenter backend selected by name
+(``Config.SEGMENTER`` / ``KHMER_CLASSIFIER_SEGMENTER``):
+
+- ``khmernltk``: the CRF ``word_tokenize`` of khmer-nltk (default, slowest)
+- ``trie``: Viterbi segmentation over a compact trie built from a word
+  frequency lexicon (FastText vocabulary plus corpus counts); it only places
+  word boundaries between Khmer orthographic clusters and merges runs of
+  unknown clusters into a single out-of-vocabulary token
+
+The lexicon is a UTF-8 TSV file (``word<TAB>frequency``) produced by:
+
+    python segmenters.py build-lexicon --fasttext cc.km.300.bin --corpus preprocessed_articles \\
+        --output Demo_model/segmenter_lexicon.tsv
+
+See benchmarks/bench_segmenters.py for agreement, accuracy and throughput.
+"""
+
+import argparse
+import logging
+import math
+import os
+import re
+import sys
+import time
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from text_normalization import normalize_tokens
+
+# Sentence delimiters of segment_khmer_text (the delimiter stays with its sentence)
+SENTENCE_DELIMITERS = ['។', '.', '!', '?', '\n']
+_SENTENCE_RE = re.compile(r'[^។.!?\n]*[។.!?\n]|[^។.!?\n]+')
+SENTENCE_JOINER = ' ។ '
+
+_COENG = 0x17D2
+
+# Codepoints are below 2**21, so (node << 21) | codepoint is a unique edge key
+_CODEPOINT_BITS = 21
+
+
+def _is_khmer(cp: int) -> bool:
+    """Khmer block or Khmer symbols block"""
+    return 0x1780 <= cp <= 0x17FF or 0x19E0 <= cp <= 0x19FF
+
+
+def _is_dependent(cp: int) -> bool:
+    """Dependent vowels, signs and the coeng: they never start an orthographic cluster"""
+    return 0x17B4 <= cp <= 0x17D3 or cp == 0x17DD
+
+
+def is_khmer_word(word: str) -> bool:
+    """True if every character of word belongs to the Khmer blocks"""
+    return bool(word) and all(_is_khmer(ord(char)) for char in word)
+
+
+class Segmenter:
+    """Word segmenter interface: split one sentence into tokens"""
+
+    name = "base"
+    # True when tokens never span whitespace and the tokens of a span do not depend
+    # on text beyond the surrounding spaces (text may then be cut at any space)
+    whitespace_is_boundary = False
+
+    def tokenize(self, sentence: str) -> List[str]:
+        raise NotImplementedError
+
+
+class KhmerNLTKSegmenter(Segmenter):
+    """khmer-nltk CRF word tokenizer"""
+
+    name = "khmernltk"
+
+    def __init__(self):
+        import khmernltk
+        self._word_tokenize = khmernltk.word_tokenize
+
+    def tokenize(self, sentence: str) -> List[str]:
+        return self._word_tokenize(sentence)
+
+
+class TrieSegmenter(Segmenter):
+    """Most probable segmentation (unigram Viterbi) over a compact character trie"""
+
+    name = "trie"
+    whitespace_is_boundary = True
+
+    def __init__(self, frequencies: Iterable[Tuple[str, float]], unknown_penalty: float = 5.0):
+        # Flat trie: one dict of edges keyed by (node << 21) | codepoint, and one
+        # cost per node (+inf when no lexicon word ends there)
+        self._edges: Dict[int, int] = {}
+        self._costs = array('d', [math.inf])
+        self.max_word_length = 0
+
+        entries = [(word, float(freq)) for word, freq in frequencies if freq > 0 and is_khmer_word(word)]
+        total = sum(freq for _, freq in entries) or 1.0
+        for word, freq in entries:
+            self._insert(word, -math.log(freq / total))
+        self.vocabulary_size = len(entries)
+        # An unknown cluster costs more than the rarest possible word
+        self.unknown_cost = -math.log(1.0 / total) + unknown_penalty
+
+    def _insert(self, word: str, cost: float):
+        node = 0
+        for char in word:
+            key = (node << _CODEPOINT_BITS) | ord(char)
+            child = self._edges.get(key)
+            if child is None:
+                child = len(self._costs)
+                self._edges[key] = child
+                self._costs.append(math.inf)
+            node = child
+        self._costs[node] = min(self._costs[node], cost)
+        self.max_word_length = max(self.max_word_length, len(word))
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "TrieSegmenter":
+        """Build the trie from a word<TAB>frequency lexicon file"""
+        return cls(read_lexicon(path), **kwargs)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._costs)
+
+    def tokenize(self, sentence: str) -> List[str]:
+        tokens = []
+        for chunk in sentence.split():
+            start = 0
+            khmer = _is_khmer(ord(chunk[0]))
+            for i in range(1, len(chunk) + 1):
+                if i < len(chunk) and _is_khmer(ord(chunk[i])) == khmer:
+                    continue
+                run = chunk[start:i]
+                tokens.extend(self._segment_khmer(run) if khmer else [run])
+                if i < len(chunk):
+                    start, khmer = i, not khmer
+        return tokens
+
+    def _segment_khmer(self, text: str) -> List[str]:
+        """Viterbi over cluster boundaries of a run of Khmer characters"""
+        codepoints = [ord(char) for char in text]
+        n = len(codepoints)
+        boundary = [True] * (n + 1)
+        for i in range(1, n):
+            boundary[i] = not _is_dependent(codepoints[i]) and codepoints[i - 1] != _COENG
+
+        best = [math.inf] * (n + 1)
+        back = [0] * (n + 1)
+        unknown = [False] * (n + 1)
+        best[0] = 0.0
+        edges, costs = self._edges, self._costs
+        for i in range(n):
+            if not boundary[i] or best[i] == math.inf:
+                continue
+            # Lexicon words starting at i
+            node = 0
+            for j in range(i, min(n, i + self.max_word_length)):
+                node = edges.get((node << _CODEPOINT_BITS) | codepoints[j])
+                if node is None:
+                    break
+                if boundary[j + 1] and costs[node] != math.inf:
+                    cost = best[i] + costs[node]
+                    if cost < best[j + 1]:
+                        best[j + 1], back[j + 1], unknown[j + 1] = cost, i, False
+            # Fallback: consume the next orthographic cluster as unknown
+            j = i + 1
+            while not boundary[j]:
+                j += 1
+            cost = best[i] + self.unknown_cost
+            if cost < best[j]:
+                best[j], back[j], unknown[j] = cost, i, True
+
+        # Walk back, merging consecutive unknown clusters into one token
+        spans = []
+        end = n
+        while end > 0:
+            start = back[end]
+            if unknown[end] and spans and spans[-1][2]:
+                spans[-1] = (start, spans[-1][1], True)
+            else:
+                spans.append((start, end, unknown[end]))
+            end = start
+        return [text[start:end] for start, end, _ in reversed(spans)]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Non-empty, stripped sentences of text, each ending with its delimiter"""
+    return [sentence for sentence in (match.strip() for match in _SENTENCE_RE.findall(text)) if sentence]
+
+
+def segment_sentence(segmenter: Segmenter, sentence: str) -> Optional[str]:
+    """Tokenized, normalized sentence with words joined by spaces (None if nothing is left)"""
+    sentence = sentence.strip()
+    try:
+        words = [
+            token for token in normalize_tokens(segmenter.tokenize(sentence))
+            if token and token not in SENTENCE_DELIMITERS
+        ]
+        return ' '.join(words) if words else None
+    except Exception:
+        # Fallback: use the sentence as-is
+        return sentence or None
+
+
+def join_sentences(processed_sentences: List[str], original_text: str) -> str:
+    """Join segmented sentences, or return the original text when none are left"""
+    return SENTENCE_JOINER.join(processed_sentences) if processed_sentences else original_text
+
+
+def read_lexicon(path: str) -> List[Tuple[str, float]]:
+    """Read a word<TAB>frequency lexicon file"""
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            word, _, freq = line.rstrip("\n").partition("\t")
+            if word and freq:
+                entries.append((word, float(freq)))
+    return entries
+
+
+def write_lexicon(frequencies: Dict[str, float], path: str):
+    """Write a lexicon ordered by decreasing frequency"""
+    with open(path, "w", encoding="utf-8") as f:
+        for word, freq in sorted(frequencies.items(), key=lambda item: (-item[1], item[0])):
+            f.write(f"{word}\t{freq:.6g}\n")
+
+
+def build_lexicon(fasttext_path: Optional[str] = None, corpus_dir: Optional[str] = None,
+                  metadata_path: Optional[str] = None, max_fasttext_words: int = 200000,
+                  min_count: int = 1) -> Dict[str, float]:
+    """Combine segmented corpus counts and FastText vocabulary counts
+
+    FastText counts are rescaled so both sources carry the same total weight.
+    """
+    corpus_counts: Counter = Counter()
+    if corpus_dir:
+        if metadata_path:
+            import pandas as pd
+            names = [f"{doc_id}.txt" for doc_id in pd.read_csv(metadata_path)["docId"]]
+        else:
+            names = sorted(os.listdir(corpus_dir))
+        for name in names:
+            path = os.path.join(corpus_dir, name)
+            if name.endswith(".txt") and os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    corpus_counts.update(word for word in f.read().split() if is_khmer_word(word))
+
+    fasttext_counts: Dict[str, float] = {}
+    if fasttext_path:
+        from gensim.models.fasttext import load_facebook_model
+        wv = load_facebook_model(fasttext_path).wv
+        for word in wv.index_to_key[:max_fasttext_words]:
+            if is_khmer_word(word):
+                fasttext_counts[word] = float(wv.get_vecattr(word, "count"))
+
+    corpus_total = sum(corpus_counts.values())
+    fasttext_total = sum(fasttext_counts.values())
+    scale = corpus_total / fasttext_total if corpus_total and fasttext_total else 1.0
+
+    frequencies = {word: float(count) for word, count in corpus_counts.items() if count >= min_count}
+    for word, count in fasttext_counts.items():
+        frequencies[word] = frequencies.get(word, 0.0) + count * scale
+    return frequencies
+
+
+@lru_cache(maxsize=None)
+def get_segmenter(name: str = "khmernltk", lexicon_path: Optional[str] = None) -> Segmenter:
+    """Shared segmenter instance for a backend name
+
+    The trie backend falls back to khmer-nltk when its lexicon file is missing.
+    """
+    if name == TrieSegmenter.name:
+        if lexicon_path and os.path.exists(lexicon_path):
+            return TrieSegmenter.from_file(lexicon_path)
+        logging.warning(f"Segmenter lexicon not found ({lexicon_path}); using khmernltk")
+        return get_segmenter(KhmerNLTKSegmenter.name)
+    if name == KhmerNLTKSegmenter.name:
+        return KhmerNLTKSegmenter()
+    raise ValueError(f"Unknown segmenter: {name}")
+
+
+def segmenter_class(name: str = "khmernltk", lexicon_path: Optional[str] = None) -> type:
+    """Class of the backend get_segmenter would return, without loading it"""
+    if name == TrieSegmenter.name:
+        return TrieSegmenter if lexicon_path and os.path.exists(lexicon_path) else KhmerNLTKSegmenter
+    if name == KhmerNLTKSegmenter.name:
+        return KhmerNLTKSegmenter
+    raise ValueError(f"Unknown segmenter: {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or try the trie segmenter lexicon")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build-lexicon", help="Build word frequencies for the trie segmenter")
+    build_parser.add_argument("--fasttext", default=None, help="Facebook FastText .bin model (vocabulary counts)")
+    build_parser.add_argument("--corpus", default=None, help="Directory of segmented articles (preprocessed_articles)")
+    build_parser.add_argument("--metadata", default=None, help="Only read the articles listed in metadata.csv")
+    build_parser.add_argument("--max-fasttext-words", type=int, default=200000)
+    build_parser.add_argument("--min-count", type=int, default=1)
+    build_parser.add_argument("--output", default="segmenter_lexicon.tsv")
+
+    tokenize_parser = subparsers.add_parser("tokenize", help="Segment a sentence with the trie segmenter")
+    tokenize_parser.add_argument("--lexicon", default="segmenter_lexicon.tsv")
+    tokenize_parser.add_argument("text")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build-lexicon":
+        if not args.fasttext and not args.corpus:
+            parser.error("build-lexicon needs --fasttext and/or --corpus")
+        start = time.time()
+        frequencies = build_lexicon(args.fasttext, args.corpus, args.metadata, args.max_fasttext_words,
+                                    args.min_count)
+        write_lexicon(frequencies, args.output)
+        print(f"✅ Wrote {len(frequencies):,} words to {args.output} in {time.time() - start:.1f}s")
+        return 0
+
+    segmenter = TrieSegmenter.from_file(args.lexicon)
+    print(" | ".join(segmenter.tokenize(args.text)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Inference-Time Stopword Filter
+==============================
+Removes Khmer stopwords between segmentation and embedding with the same
+rules the data preprocessing notebook used to build the training corpus:
+
+- stopwords from ``Khmer-Stop-Word-1000.txt`` are normalized and expanded
+  with their NFD / NFKC / NFKD variations
+- a token is removed when it equals a stopword, contains a stopword, or is
+  itself contained in a stopword
+
+Instead of scanning the stopword list for every token, the containment
+tests are compiled once: a frozenset of every substring of every stopword
+answers "token in stopword", and one regex alternation answers "stopword in
+token". Decisions are memoized per distinct token.
+"""
+
+import logging
+import re
+import unicodedata
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Tuple
+
+from text_normalization import normalize_word
+
+
+def load_stopwords(path: str) -> FrozenSet[str]:
+    """Normalized stopwords of a one-word-per-line file, with their Unicode variations"""
+    stopwords = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            word = normalize_word(line.strip())
+            if word:
+                stopwords.add(word)
+
+    expanded = set()
+    for word in stopwords:
+        expanded.add(word)
+        for form in ("NFD", "NFKC", "NFKD"):
+            expanded.add(unicodedata.normalize(form, word))
+    return frozenset(word for word in expanded if word)
+
+
+class StopwordFilter:
+    """Compiled stopword matcher reproducing the preprocessing rules"""
+
+    def __init__(self, stopwords: Iterable[str]):
+        self.stopwords = frozenset(stopwords)
+        # Every substring of every stopword: "token in stopword" becomes a set lookup
+        self._substrings = frozenset(
+            word[i:j] for word in self.stopwords for i in range(len(word)) for j in range(i + 1, len(word) + 1)
+        )
+        # Longest first so the alternation never stops at a shorter prefix needlessly
+        pattern = "|".join(re.escape(word) for word in sorted(self.stopwords, key=len, reverse=True))
+        self._contains_stopword = re.compile(pattern).search if pattern else (lambda token: None)
+        self.is_stopword = lru_cache(maxsize=65536)(self._is_stopword)
+
+    @classmethod
+    def from_file(cls, path: str) -> "StopwordFilter":
+        return cls(load_stopwords(path))
+
+    def __len__(self) -> int:
+        return len(self.stopwords)
+
+    def _is_stopword(self, token: str) -> bool:
+        token = normalize_word(token)
+        if not token:
+            # The empty string is contained in every stopword
+            return bool(self.stopwords)
+        return token in self._substrings or self._contains_stopword(token) is not None
+
+    def filter_tokens(self, tokens: Iterable[str]) -> Tuple[List[str], int]:
+        """Tokens that are not stopwords, and how many were removed"""
+        tokens = list(tokens)
+        kept = [token for token in tokens if not self.is_stopword(token)]
+        return kept, len(tokens) - len(kept)
+
+    def filter_text(self, segmented_text: str) -> str:
+        """Segmented text with the stopword tokens removed"""
+        return " ".join(token for token in segmented_text.split() if not self.is_stopword(token))
+
+
+@lru_cache(maxsize=None)
+def get_stopword_filter(path: str) -> StopwordFilter:
+    """Shared filter for a stopword file (empty filter if it cannot be read)"""
+    try:
+        stopword_filter = StopwordFilter.from_file(path)
+        logging.info(f"Loaded {len(stopword_filter)} stopword forms from {path}")
+        return stopword_filter
+    except OSError as e:
+        logging.warning(f"Could not load stopwords from {path}: {e}")
+        return StopwordFilter(())
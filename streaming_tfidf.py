@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming TF-IDF Training
+=========================
+Out-of-core version of the TF-IDF path of ``3A_Model Development.ipynb``
+for corpora that no longer fit in memory. Documents are read in chunks from
+``metadata.csv`` + the article folder and never held all at once:
+
+1. pass 1 hashes every training chunk (``HashingVectorizer`` with the
+   Khmer analyzer, raw counts) and accumulates document frequencies and
+   class counts
+2. the IDF of ``TfidfTransformer`` is set from those frequencies (smooth
+   IDF, as ``TfidfVectorizer``); terms outside ``--min-df`` / ``--max-df``
+   get a zero weight instead of a vocabulary entry
+3. pass 2 (repeated ``--epochs`` times) streams TF-IDF chunks into the
+   ``partial_fit`` models: a linear SVM (``SGDClassifier``, hinge loss,
+   class-balanced sample weights) and ``MultinomialNB``
+
+Memory depends on ``--chunk-size``, ``--shuffle-blocks`` and
+``--n-features``, not on the corpus size. ``metadata.csv`` is sorted by
+category, and in file order SGD would end every epoch on one category: each
+SVM epoch therefore reads the metadata in blocks of ``--chunk-size`` rows,
+taken ``--shuffle-blocks`` at a time in a fresh seeded order of all blocks
+and shuffled within that buffer (only one byte offset per block is kept).
+The train/test split hashes the document id, so a document stays on the
+same side as the archive grows. Each model is saved as a
+``Pipeline(hashing, tfidf, model)`` that classifies raw text.
+
+Usage:
+    python streaming_tfidf.py --texts preprocessed_articles --metadata metadata.csv --output TF_IDF/models
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+
+from tfidf_analysis import khmer_word_analyzer, khmer_word_analyzer_with_filtering
+
+
+def is_test_document(doc_id, test_fraction: float) -> bool:
+    """Stable split: the same document lands on the same side on every run"""
+    digest = hashlib.md5(str(doc_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") / 2 ** 32 < test_fraction
+
+
+def iter_documents(metadata_path: str, split: str, test_fraction: float,
+                   chunk_size: int) -> Iterator[Tuple[object, str]]:
+    """(docId, category) of one split, in metadata order"""
+    import pandas as pd
+
+    for metadata in pd.read_csv(metadata_path, chunksize=chunk_size, usecols=["docId", "category"]):
+        for doc_id, category in zip(metadata["docId"], metadata["category"]):
+            if is_test_document(doc_id, test_fraction) == (split == "test"):
+                yield doc_id, category
+
+
+def block_offsets(metadata_path: str, block_size: int) -> Tuple[List[str], List[int]]:
+    """CSV header and the byte offset of every block_size-th record (quoted line breaks allowed)"""
+    position = 0
+
+    def lines(f):
+        nonlocal position
+        for line in iter(f.readline, b""):
+            position += len(line)
+            yield line.decode("utf-8")
+
+    with open(metadata_path, "rb") as f:
+        reader = csv.reader(lines(f))
+        header = next(reader)
+        header[0] = header[0].lstrip("\ufeff")
+        # csv.reader pulls lines only as far as the end of each record
+        offsets, record, start = [], 0, position
+        for _ in reader:
+            if record % block_size == 0:
+                offsets.append(start)
+            record, start = record + 1, position
+    return header, offsets
+
+
+def iter_shuffled_documents(metadata_path: str, split: str, test_fraction: float, block_size: int,
+                            seed: int, shuffle_blocks: int = 16) -> Iterator[Tuple[object, str]]:
+    """(docId, category) of one split, blocks of metadata in a seeded order and shuffled within buffers
+
+    Holds shuffle_blocks * block_size rows at a time, whatever the corpus size.
+    """
+    import pandas as pd
+
+    header, offsets = block_offsets(metadata_path, block_size)
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(offsets))
+    with open(metadata_path, "rb") as f:
+        for start in range(0, len(order), shuffle_blocks):
+            buffer = []
+            for block in order[start:start + shuffle_blocks]:
+                f.seek(offsets[block])
+                # Same blocks as the chunked read of iter_documents, so docId types match
+                metadata = pd.read_csv(f, header=None, names=header, nrows=block_size,
+                                       usecols=["docId", "category"])
+                buffer.extend(zip(metadata["docId"], metadata["category"]))
+            for i in rng.permutation(len(buffer)):
+                doc_id, category = buffer[i]
+                if is_test_document(doc_id, test_fraction) == (split == "test"):
+                    yield doc_id, category
+
+
+def iter_chunks(metadata_path: str, texts_dir: str, split: str, test_fraction: float, chunk_size: int,
+                seed: Optional[int] = None, shuffle_blocks: int = 16) -> Iterator[Tuple[List[str], List[str]]]:
+    """(texts, labels) chunks of one split, texts read lazily
+
+    With a seed, in the bounded block shuffle of iter_shuffled_documents;
+    without one, in metadata order.
+    """
+    if seed is None:
+        documents = iter_documents(metadata_path, split, test_fraction, chunk_size)
+    else:
+        documents = iter_shuffled_documents(metadata_path, split, test_fraction, chunk_size, seed, shuffle_blocks)
+    texts, labels = [], []
+    for doc_id, category in documents:
+        path = os.path.join(texts_dir, f"{doc_id}.txt")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+        labels.append(category)
+        if len(texts) == chunk_size:
+            yield texts, labels
+            texts, labels = [], []
+    if texts:
+        yield texts, labels
+
+
+def build_hashing_vectorizer(n_features: int, filtered: bool = False):
+    """Raw term counts in n_features hashed columns (TF-IDF weighting is a separate step)"""
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(analyzer=khmer_word_analyzer_with_filtering if filtered else khmer_word_analyzer,
+                             n_features=n_features, alternate_sign=False, norm=None)
+
+
+def document_frequencies(vectorizer, chunks: Iterator[Tuple[List[str], List[str]]]) -> Tuple[int, np.ndarray, Dict[str, int]]:
+    """(documents, document frequency per hashed column, documents per class) in one pass"""
+    n_documents, df, class_counts = 0, np.zeros(vectorizer.n_features, dtype=np.int64), {}
+    for texts, labels in chunks:
+        counts = vectorizer.transform(texts)
+        df += np.bincount(counts.indices, minlength=vectorizer.n_features)
+        n_documents += counts.shape[0]
+        for label in labels:
+            class_counts[label] = class_counts.get(label, 0) + 1
+    return n_documents, df, class_counts
+
+
+def fit_idf(df: np.ndarray, n_documents: int, min_df: int = 5, max_df: float = 0.8):
+    """TfidfTransformer with TfidfVectorizer's smooth IDF; columns outside [min_df, max_df] weigh 0"""
+    from sklearn.feature_extraction.text import TfidfTransformer
+
+    transformer = TfidfTransformer(norm="l2", use_idf=True, smooth_idf=True)
+    idf = np.log((1 + n_documents) / (1 + df)) + 1
+    idf[(df < min_df) | (df > max_df * n_documents)] = 0.0
+    # Fit on an empty row for the fitted attributes, then use the streamed frequencies
+    transformer.fit(sparse.csr_matrix((1, len(df))))
+    transformer.idf_ = idf
+    return transformer
+
+
+def build_models(active_features: int, n_features: int, mnb_alpha: float = 0.1, random_state: int = 42) -> Dict:
+    """Linear SVM and MultinomialNB for partial_fit
+
+    MultinomialNB smooths every column; most hashed columns are empty, so its
+    alpha is scaled to the share of weighted columns to smooth as much as the
+    notebook's vocabulary-sized model.
+    """
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.naive_bayes import MultinomialNB
+
+    return {
+        "svm": SGDClassifier(loss="hinge", alpha=1e-5, random_state=random_state),
+        "mnb": MultinomialNB(alpha=mnb_alpha * active_features / n_features),
+    }
+
+
+def train(vectorizer, transformer, models: Dict, chunks_factory, classes: List[str],
+          class_counts: Dict[str, int], epochs: int, random_state: int = 42) -> Dict[str, float]:
+    """Stream TF-IDF chunks into every model's partial_fit; returns the seconds per model
+
+    chunks_factory(epoch) returns that epoch's chunks, in a corpus-wide order
+    of its own (see iter_chunks' seed).
+    """
+    rng = np.random.default_rng(random_state)
+    total = sum(class_counts.values())
+    # class_weight="balanced" is not available with partial_fit: pass it as sample weights
+    class_weight = {label: total / (len(classes) * count) for label, count in class_counts.items()}
+    seconds = {name: 0.0 for name in models}
+    for epoch in range(epochs):
+        for texts, labels in chunks_factory(epoch):
+            X = transformer.transform(vectorizer.transform(texts))
+            y = np.asarray(labels)
+            order = rng.permutation(len(y))
+            X, y = X[order], y[order]
+            weights = np.array([class_weight[label] for label in y])
+            for name, model in models.items():
+                if name == "mnb" and epoch > 0:
+                    continue  # counting model: a second pass would count the data twice
+                start = time.perf_counter()
+                model.partial_fit(X, y, classes=classes, sample_weight=weights if name == "svm" else None)
+                seconds[name] += time.perf_counter() - start
+    return seconds
+
+
+def evaluate(vectorizer, transformer, models: Dict, chunks) -> Dict[str, Dict[str, float]]:
+    """Streamed accuracy and weighted F1 of every model"""
+    from sklearn.metrics import accuracy_score, f1_score
+
+    y_true, predictions = [], {name: [] for name in models}
+    for texts, labels in chunks:
+        X = transformer.transform(vectorizer.transform(texts))
+        y_true.extend(labels)
+        for name, model in models.items():
+            predictions[name].extend(model.predict(X).tolist())
+    return {name: {"accuracy": accuracy_score(y_true, y_pred),
+                   "f1_score": f1_score(y_true, y_pred, average="weighted"),
+                   "test_samples": len(y_true)}
+            for name, y_pred in predictions.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core hashing TF-IDF training")
+    parser.add_argument("--texts", default="preprocessed_articles")
+    parser.add_argument("--metadata", default="metadata.csv")
+    parser.add_argument("--output", default=os.path.join("TF_IDF", "models"))
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Documents per chunk")
+    parser.add_argument("--n-features", type=int, default=2 ** 20, help="Hashed feature columns")
+    parser.add_argument("--min-df", type=int, default=5)
+    parser.add_argument("--max-df", type=float, default=0.8)
+    parser.add_argument("--filtered", action="store_true", help="Drop the non-discriminative words")
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--epochs", type=int, default=5, help="Passes of the SVM over the training chunks")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the per-epoch document order")
+    parser.add_argument("--shuffle-blocks", type=int, default=16,
+                        help="Metadata blocks of --chunk-size rows shuffled together in each epoch")
+    args = parser.parse_args(argv)
+
+    def chunks(split: str, seed: Optional[int] = None):
+        return iter_chunks(args.metadata, args.texts, split, args.test_fraction, args.chunk_size, seed,
+                           args.shuffle_blocks)
+
+    vectorizer = build_hashing_vectorizer(args.n_features, args.filtered)
+    start = time.time()
+    n_documents, df, class_counts = document_frequencies(vectorizer, chunks("train"))
+    if not n_documents:
+        print(f"❌ No training documents found in {args.texts}")
+        return 1
+    transformer = fit_idf(df, n_documents, args.min_df, args.max_df)
+    active_features = int(np.count_nonzero(transformer.idf_))
+    print(f"📦 {n_documents:,} training documents, {active_features:,} weighted hashed terms, "
+          f"IDF in {time.time() - start:.1f}s")
+
+    classes = sorted(class_counts)
+    models = build_models(max(active_features, 1), args.n_features, random_state=args.seed)
+    seconds = train(vectorizer, transformer, models, lambda epoch: chunks("train", args.seed + epoch),
+                    classes, class_counts, args.epochs, args.seed)
+    results = evaluate(vectorizer, transformer, models, chunks("test"))
+
+    from sklearn.pipeline import Pipeline
+
+    os.makedirs(args.output, exist_ok=True)
+    suffix = "_filtered" if args.filtered else ""
+    for name, model in models.items():
+        pipeline = Pipeline([("hashing", vectorizer), ("tfidf", transformer), ("clf", model)])
+        joblib.dump(pipeline, os.path.join(args.output, f"{name}_streaming{suffix}_model.joblib"))
+        lines = [
+            f"{name.upper()} Streaming Model Information",
+            "=" * 60,
+            "",
+            f"Pipeline: HashingVectorizer ({args.n_features} features) + TfidfTransformer + {type(model).__name__}",
+            f"Training: partial_fit over chunks of {args.chunk_size} documents"
+            + (f", {args.epochs} epochs" if name == "svm" else ""),
+            f"Training Samples: {n_documents}",
+            f"Test Samples: {results[name]['test_samples']}",
+            f"Training Time: {seconds[name]:.2f} seconds",
+            f"Test Accuracy: {results[name]['accuracy']:.4f}",
+            f"Test F1-Score: {results[name]['f1_score']:.4f}",
+        ]
+        with open(os.path.join(args.output, f"{name}_streaming{suffix}_model_info.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"✅ {name.upper()}: accuracy {results[name]['accuracy']:.4f}, "
+              f"F1 {results[name]['f1_score']:.4f} ({seconds[name]:.1f}s of partial_fit)")
+    print(f"📁 Models written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
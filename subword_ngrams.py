@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized Subword N-gram Composition
+=====================================
+FastText embeds an out-of-vocabulary word as the mean of the vectors of
+its hashed character n-grams. gensim does this one word at a time in
+Python; segmentation errors on Khmer news produce many OOV tokens, so
+``SubwordVectors.mean_vectors`` handles a whole document or batch at once
+(behind the persistent ``vector_cache.VectorCache`` when one is attached):
+
+1. every distinct OOV token of the batch is collected
+2. the n-grams of all of them are cut from one UTF-8 buffer with index
+   arithmetic and their FNV-1a hashes computed in bulk, one byte position
+   per numpy pass
+3. bucket IDs are deduplicated, so each n-gram row is read (and
+   dequantized) once
+4. all OOV vectors come out of one gather of those rows and one segment
+   sum, and document means out of a second one; a segment sum is a single
+   sparse averaging-matrix product, which avoids copying a row per n-gram
+
+The results match ``embedding_bundle.ngram_buckets`` / gensim. ``OOVStats``
+keeps the OOV rate and the composition time per OOV token.
+"""
+
+import hashlib
+import itertools
+import json
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+_FNV_OFFSET = 2166136261
+_FNV_PRIME = 16777619
+# Part of the cache fingerprint; 2: pruned tables stopped caching fully pruned OOV words as zeros
+_CACHE_FORMAT = 2
+_UINT32_MASK = 0xFFFFFFFF
+
+
+def ngram_hashes(words: Sequence[str], min_n: int, max_n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(word index, FastText hash) of every character n-gram of every word
+
+    Same n-grams as ``embedding_bundle.char_ngrams`` on ``<word>``, hashed
+    with FastText's FNV-1a over sign-extended UTF-8 bytes.
+    """
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64))
+    if not words or max_n < min_n:
+        return empty
+    extended = [f"<{word}>" for word in words]
+    data = np.frombuffer("".join(extended).encode("utf-8"), dtype=np.uint8)
+
+    # Byte offset of every character (plus the end of the buffer)
+    char_bytes = np.append(np.flatnonzero((data & 0xC0) != 0x80), len(data))
+    char_lengths = np.array([len(word) for word in extended], dtype=np.int64)
+    word_starts = np.concatenate(([0], np.cumsum(char_lengths)[:-1]))
+
+    word_ids, starts, ends = [], [], []
+    for n in range(min_n, max_n + 1):
+        # n-gram start positions within each word ([1, L-1) for n == 1: no lone boundary characters)
+        first = 1 if n == 1 else 0
+        counts = np.maximum(char_lengths - n + 1 - 2 * first, 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        owners = np.repeat(np.arange(len(words)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + first
+        char_index = word_starts[owners] + offsets
+        word_ids.append(owners)
+        starts.append(char_bytes[char_index])
+        ends.append(char_bytes[char_index + n])
+    if not word_ids:
+        return empty
+
+    word_ids = np.concatenate(word_ids)
+    starts = np.concatenate(starts)
+    lengths = np.concatenate(ends) - starts
+
+    # FNV-1a, one byte position at a time for all n-grams still that long
+    hashes = np.full(len(starts), _FNV_OFFSET, dtype=np.uint64)
+    for position in range(int(lengths.max())):
+        active = np.flatnonzero(lengths > position)
+        byte = data[starts[active] + position].astype(np.uint64)
+        byte = np.where(byte > 127, byte | np.uint64(0xFFFFFF00), byte)
+        hashes[active] = ((hashes[active] ^ byte) * np.uint64(_FNV_PRIME)) & np.uint64(_UINT32_MASK)
+    return word_ids, hashes
+
+
+def segment_means(segment_ids: np.ndarray, row_ids: np.ndarray, segments: int,
+                  table: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean of table[row_ids[k]] over the k of each segment
+
+    The segment sum is one product of a sparse averaging matrix (segments x
+    table rows, duplicates summed) with table, so the rows are never copied
+    per reference. Returns (means of the non-empty segments, non-empty mask).
+    """
+    counts = np.bincount(segment_ids, minlength=segments)
+    found = counts > 0
+    weights = (1.0 / counts[segment_ids]).astype(np.float32)
+    averaging = sparse.csr_matrix((weights, (segment_ids, row_ids)), shape=(segments, table.shape[0]))
+    return np.asarray(averaging[found] @ table, dtype=np.float32), found
+
+
+class OOVStats:
+    """Running OOV rate and composition cost"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.tokens = 0
+        self.oov_tokens = 0
+        self.distinct_oov = 0
+        self.seconds = 0.0
+
+    def record_tokens(self, tokens: int, oov_tokens: int):
+        self.tokens += tokens
+        self.oov_tokens += oov_tokens
+
+    def record_composition(self, distinct_oov: int, seconds: float):
+        self.distinct_oov += distinct_oov
+        self.seconds += seconds
+
+    @property
+    def oov_rate(self) -> float:
+        return self.oov_tokens / self.tokens if self.tokens else 0.0
+
+    @property
+    def microseconds_per_oov_token(self) -> float:
+        return self.seconds * 1e6 / self.oov_tokens if self.oov_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "tokens": self.tokens,
+            "oov_tokens": self.oov_tokens,
+            "oov_rate": self.oov_rate,
+            "distinct_oov": self.distinct_oov,
+            "us_per_oov_token": self.microseconds_per_oov_token,
+        }
+
+
+class SubwordVectors:
+    """Word vectors with batched OOV composition from n-gram buckets
+
+    ``vectors`` and ``ngrams`` are float arrays or ``QuantizedMatrix``
+    objects (anything with ``rows(indices)``). ``bucket_ids`` lists the
+    FastText buckets kept as rows of a pruned n-gram table.
+    """
+
+    def __init__(self, key_to_index: Dict[str, int], vectors, ngrams, min_n: int, max_n: int,
+                 bucket: int, bucket_ids: Optional[np.ndarray] = None):
+        self.key_to_index = key_to_index
+        self._vector_rows = self._row_reader(vectors)
+        self._ngram_rows = self._row_reader(ngrams)
+        self.vector_size = vectors.shape[1]
+        self.min_n = min_n
+        self.max_n = max_n
+        self.bucket = bucket
+        self.bucket_ids = bucket_ids
+        self.stats = OOVStats()
+        self._shapes = (tuple(vectors.shape), tuple(ngrams.shape))
+        # Persistent VectorCache (vector_cache.py); in-vocabulary rows are only worth
+        # caching when reading them costs more than an in-memory gather
+        self.cache = None
+        self._cache_vocab_rows = hasattr(vectors, "rows")
+
+    def fingerprint(self) -> str:
+        """Identity of these vectors for persistent caches: shapes, hashing settings and sampled rows"""
+        digest = hashlib.sha1(json.dumps([_CACHE_FORMAT, self._shapes, self.min_n, self.max_n, self.bucket,
+                                          None if self.bucket_ids is None else len(self.bucket_ids)]).encode())
+        digest.update("\n".join(itertools.islice(self.key_to_index, 1000)).encode("utf-8"))
+        for rows, count in ((self._vector_rows, self._shapes[0][0]), (self._ngram_rows, self._shapes[1][0])):
+            if count:
+                digest.update(rows(np.linspace(0, count - 1, 16).astype(np.int64)).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _row_reader(matrix):
+        if hasattr(matrix, "rows"):
+            return matrix.rows
+        return lambda indices: np.asarray(matrix[indices], dtype=np.float32)
+
+    @classmethod
+    def from_gensim(cls, keyed_vectors) -> "SubwordVectors":
+        """Wrap gensim FastTextKeyedVectors (raises AttributeError for models without subwords)"""
+        return cls(keyed_vectors.key_to_index, keyed_vectors.vectors, keyed_vectors.vectors_ngrams,
+                   keyed_vectors.min_n, keyed_vectors.max_n, keyed_vectors.bucket)
+
+    def ngram_rows(self, words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(word index, n-gram table row) pairs"""
+        word_ids, hashes = ngram_hashes(words, self.min_n, self.max_n)
+        if self.bucket == 0 or not len(hashes):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        rows = (hashes % np.uint64(self.bucket)).astype(np.int64)
+        if self.bucket_ids is not None and len(self.bucket_ids):
+            positions = np.minimum(np.searchsorted(self.bucket_ids, rows), len(self.bucket_ids) - 1)
+            kept = self.bucket_ids[positions] == rows
+            word_ids, rows = word_ids[kept], positions[kept]
+        elif self.bucket_ids is not None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return word_ids, rows
+
+    def compose(self, words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectors of OOV words: (vectors of the words that have n-gram rows, mask of those words)"""
+        word_ids, rows = self.ngram_rows(words)
+        if not len(rows):
+            return np.zeros((0, self.vector_size), dtype=np.float32), np.zeros(len(words), dtype=bool)
+        # Read every distinct bucket once
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        table = self._ngram_rows(unique_rows)
+        return segment_means(word_ids, inverse, len(words), table)
+
+    def token_vectors(self, tokens: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectors of distinct tokens and the mask of tokens that have one
+
+        Tokens found in the attached persistent cache are not recomputed;
+        new OOV compositions (and dequantized rows) are added to it.
+        """
+        vocab_rows = np.array([self.key_to_index.get(token, -1) for token in tokens], dtype=np.int64)
+        vectors = np.zeros((len(tokens), self.vector_size), dtype=np.float32)
+        # Like gensim 4, an OOV word without n-grams still counts, as the origin vector. A
+        # pruned table (bucket_ids) only has a vector for words with a kept bucket: the
+        # others are skipped, as the origin would dilute the document mean
+        pruned = self.bucket_ids is not None
+        has_vector = (vocab_rows >= 0) | (self.bucket > 0 and not pruned)
+        pending = np.ones(len(tokens), dtype=bool)
+        if self.cache is not None and len(tokens):
+            cached, cached_vectors = self.cache.get_many(tokens)
+            vectors[cached] = cached_vectors
+            has_vector |= cached
+            pending = ~cached
+
+        start = time.perf_counter()
+        oov_positions = np.flatnonzero(pending & (vocab_rows < 0))
+        if len(oov_positions) and self.bucket > 0:
+            oov_vectors, composed = self.compose([tokens[i] for i in oov_positions])
+            vectors[oov_positions[composed]] = oov_vectors
+            if pruned:
+                has_vector[oov_positions[composed]] = True
+        self.stats.record_composition(len(oov_positions), time.perf_counter() - start)
+        in_vocab = np.flatnonzero(pending & (vocab_rows >= 0))
+        if len(in_vocab):
+            vectors[in_vocab] = self._vector_rows(vocab_rows[in_vocab])
+
+        if self.cache is not None:
+            cacheable = pending & has_vector & ((vocab_rows < 0) | self._cache_vocab_rows)
+            new = np.flatnonzero(cacheable)
+            if len(new):
+                self.cache.put_many([tokens[i] for i in new], vectors[new])
+        return vectors, has_vector
+
+    def mean_vectors(self, documents: Sequence[Sequence[str]]) -> np.ndarray:
+        """Mean word vector of every document, equal to averaging gensim's wv[word] (zeros when empty)"""
+        # Distinct tokens of the batch are resolved once
+        token_index: Dict[str, int] = {}
+        doc_tokens = [[token_index.setdefault(token, len(token_index)) for token in doc] for doc in documents]
+        tokens = list(token_index)
+        token_vectors, has_vector = self.token_vectors(tokens)
+
+        # Document means: one segment sum over the flattened token references
+        flat = np.fromiter((token for doc in doc_tokens for token in doc), dtype=np.int64)
+        doc_ids = np.repeat(np.arange(len(doc_tokens)), [len(doc) for doc in doc_tokens])
+        oov = np.array([token not in self.key_to_index for token in tokens], dtype=bool)
+        self.stats.record_tokens(len(flat), int(np.count_nonzero(oov[flat])) if len(flat) else 0)
+
+        kept = has_vector[flat] if len(flat) else np.zeros(0, dtype=bool)
+        flat, doc_ids = flat[kept], doc_ids[kept]
+        result = np.zeros((len(doc_tokens), self.vector_size), dtype=np.float32)
+        if len(flat):
+            means, found = segment_means(doc_ids, flat, len(doc_tokens), token_vectors)
+            result[found] = means
+        return result
+
+    def mean_vector(self, words: Sequence[str]) -> np.ndarray:
+        return self.mean_vectors([list(words)])[0]
+
+
+def oov_tokens(documents: Sequence[Sequence[str]], key_to_index: Dict[str, int]) -> List[str]:
+    """Distinct out-of-vocabulary tokens of documents, in first-seen order"""
+    seen = {}
+    for doc in documents:
+        for token in doc:
+            if token not in key_to_index:
+                seen.setdefault(token, None)
+    return list(seen)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Table-Driven Unicode Normalization
+==================================
+Precompiled replacements for the per-character ``unicodedata.category``
+loops of ``TextProcessor``. Every table is built once per process:
+
+- a ``str.translate`` deletion table of all Basic Multilingual Plane
+  characters in the Unicode "Other" (C*) categories, with a regex over the
+  supplementary planes that is compiled only if such characters show up
+- the removal table of ``clean_khmer_text`` (symbols, digits, Latin,
+  punctuation), built once per ``TextNormalizer``
+
+NFC normalization is skipped when ``unicodedata.is_normalized`` reports the
+text is already in NFC, and ``normalize_tokens`` handles a whole token list
+with one normalization and one translate call. The output is identical to
+the original per-character implementation.
+"""
+
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, List
+
+_BMP_LIMIT = 0x10000
+
+# Delete every BMP character whose general category is C* (Cc, Cf, Cs, Co, Cn)
+_CONTROL_DELETE_TABLE = {
+    cp: None for cp in range(_BMP_LIMIT) if unicodedata.category(chr(cp))[0] == 'C'
+}
+
+_ASTRAL_RE = re.compile('[\U00010000-\U0010ffff]')
+
+# Joins tokens for batched normalization: a starter with no decomposition or
+# composition pairs, so NFC never merges characters across token boundaries
+_TOKEN_SEPARATOR = '␞'
+
+
+@lru_cache(maxsize=1)
+def _astral_control_re() -> 're.Pattern':
+    """Regex matching C* characters outside the BMP (built on first use)"""
+    ranges, start, previous = [], None, None
+    for cp in range(_BMP_LIMIT, sys.maxunicode + 1):
+        if unicodedata.category(chr(cp))[0] != 'C':
+            continue
+        if start is None or cp != previous + 1:
+            if start is not None:
+                ranges.append((start, previous))
+            start = cp
+        previous = cp
+    if start is not None:
+        ranges.append((start, previous))
+    return re.compile('[' + ''.join(
+        re.escape(chr(a)) if a == b else f"{re.escape(chr(a))}-{re.escape(chr(b))}" for a, b in ranges
+    ) + ']+')
+
+
+def nfc(text: str) -> str:
+    """NFC-normalize text, skipping the work when it is already normalized"""
+    return text if unicodedata.is_normalized('NFC', text) else unicodedata.normalize('NFC', text)
+
+
+def remove_control_characters(text: str) -> str:
+    """Delete every character in the Unicode C* categories"""
+    text = text.translate(_CONTROL_DELETE_TABLE)
+    if _ASTRAL_RE.search(text):
+        text = _astral_control_re().sub('', text)
+    return text
+
+
+def normalize_text(text: str) -> str:
+    """NFC normalization followed by control-character removal"""
+    if not text:
+        return ""
+    return remove_control_characters(nfc(text))
+
+
+def normalize_word(word: str) -> str:
+    """Normalize a single token (NFC, strip, control-character removal)"""
+    if not word:
+        return ""
+    return remove_control_characters(nfc(word).strip())
+
+
+def normalize_tokens(tokens: Iterable[str]) -> List[str]:
+    """normalize_word applied to every token, with one NFC check and one translate call"""
+    tokens = list(tokens)
+    if not tokens:
+        return []
+    joined = _TOKEN_SEPARATOR.join(tokens)
+    if joined.count(_TOKEN_SEPARATOR) != len(tokens) - 1:
+        # A token contains the separator itself: normalize one by one
+        return [normalize_word(token) for token in tokens]
+    stripped = _TOKEN_SEPARATOR.join(token.strip() for token in nfc(joined).split(_TOKEN_SEPARATOR))
+    return remove_control_characters(stripped).split(_TOKEN_SEPARATOR)
+
+
+class TextNormalizer:
+    """Cleaning pipeline with its character removal table compiled once"""
+
+    def __init__(self, chars_to_remove: Iterable[str]):
+        self._remove_table = str.maketrans('', '', ''.join(sorted(set(chars_to_remove))))
+
+    def clean(self, text: str) -> str:
+        """Normalize, drop the removal characters and collapse whitespace"""
+        if not text:
+            return ""
+        # str.split() uses the same whitespace definition as the regex \s+
+        return ' '.join(normalize_text(text).translate(self._remove_table).split())
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+TF-IDF Category Feature Analysis
+================================
+Sparse rebuild of the feature analysis of ``3A_Model Development.ipynb``
+(``save_raw_features_to_file`` / ``save_category_features``). The notebook
+densified the whole training matrix and summed it row by row; here the
+per-category mean weights are one sparse product of a category indicator
+matrix with the TF-IDF matrix, and the top-N features of each category
+come from ``argpartition`` over that row's non-zeros. Memory stays
+proportional to the non-zeros of the matrix.
+
+The Khmer analyzers of the notebook live here too, so the vectorizers it
+pickled (``TF_IDF/features/tfidf_vectorizer*.joblib``) load outside it.
+
+Usage:
+    python tfidf_analysis.py --vectorizer TF_IDF/features/tfidf_vectorizer.joblib --top-n 500
+    python tfidf_analysis.py --vectorizer TF_IDF/features/tfidf_vectorizer_filtered.joblib --top-n 100
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# Non-discriminative words removed by the filtered vectorizer (get_features_to_remove in the notebook)
+DATE_FEATURES = frozenset({
+    "កក់ខែ", "កក្កដា", "កញ្ញា", "កុម្ភៈ", "ខែ", "ខែកក្កដា", "ខែកក្ត", "ខែកញ្ញា", "ខែកុម្ភ",
+    "ខែកុម្ភះ", "ខែកុម្ភៈ", "ខែតុលា", "ខែត្រ", "ខែធ្នូ", "ខែម", "ខែមិគសិរ", "ខែមិថុនា", "ខែមីនា",
+    "ខែមេសា", "ខែម្តង", "ខែល", "ខែវិចិ្ឆកា", "ខែវិច្ឆកា", "ខែវិច្ឆិកា", "ខែសីហា", "ខែឧសភា", "ច័ន្ទ",
+    "ឆ្នាំង", "ឆ្នាំងសាក", "ដើមឧសភា", "តុលា", "ថ្ងៃចន្ទ", "ថ្ងៃច័ន្ទ", "ថ្ងៃទី", "ថ្ងៃទីកក្កដា",
+    "ថ្ងៃទីកញ្ញា", "ថ្ងៃពុធ", "ថ្ងៃព្រហស្បតិ៍", "ថ្ងៃព្រហស្បត្តិ៍", "ថ្ងៃសុក្រ", "ថ្ងៃសៅរ៍",
+    "ថ្ងៃស្អែក", "ថ្ងៃអង្គារ", "ថ្ងៃអង្គារ៍", "ថ្ងៃអាទិត្យ", "ធ្នូ", "ពុធ", "ព្រហស្បតិ៍", "មិថុនា",
+    "មីនា", "មេសា", "មេសាង", "ម៉ោង", "វិច្ឆិកា", "វិនាទី", "សប្តាហ៍", "សីហា", "សុក្រ", "សុក្រំ",
+    "សៅរ៍", "អង្គារ", "អាទិត្យ", "អាទិត្យា", "ឧសភា",
+})
+
+LOCATION_FEATURES = frozenset({
+    "កម្ពុជា", "កូរ៉េ", "ក្រុង", "ខេត្ត", "ឃុំ", "ឃុំឃាំង", "ចិន", "ជប៉ុន", "ជាយក្រុង", "ថៃ",
+    "ទីក្រុង", "នាទីក្រុង", "បារាំង", "ប៉ាគីស្ថាន", "ប្រេស៊ីល", "ភូមិ", "ភូមិគ្រឹះ", "ភូមិដ្ឋាន",
+    "ភូមិឋាន", "ភូមិបាល", "ភូមិភាគ", "ភូមិសារ", "ភូមិសាស្ត្រ", "ភូមិសាស្រ្ត", "ភ្នំស្រុក",
+    "មីយ៉ាន់ម៉ា", "មេភូមិ", "ម៉ាក្រុង", "ម៉ាឡេស៊ី", "យូហ្គោស្លាវី", "រាជធានី", "រុស្ស៊ី", "លាវ",
+    "សាលាក្រុង", "សាលាខេត្ត", "សិង្ហបុរី", "ស្រុក", "អង់គ្លេស", "អាមេរិក", "អាមេរិកកាំង",
+    "អាមេរិកាំង", "អាល្លឺម៉ង់", "អាស៊ី", "អាហ្វ្រិក", "អឺរ៉ុប", "អូស្ត្រាលី", "អេហ្ស៊ីប", "ឥណ្ឌា",
+    "ឥណ្ឌូចិន", "ឥណ្ឌូណេស៊ី", "អេស្ប៉ាញ", "អាហ្សង់ទីន", "អារ៉ាប៊ី", "ព័រទុយហ្គាល់", "ទីលាន",
+    "សាអូឌីត", "ហ្វីលីពីន", "អ៊ីតាលី", "ហូឡង់", "ហ្វ្រាំង", "អ៊ុយក្រែន", "អ៊ីស្រាអែល", "ប៉ារីស",
+    "វិសាខា", "ស្វាយរៀង", "សៀមរាប", "ព្រះសីហនុ", "ស្ទឹងត្រែង", "មណ្ឌលគិរី", "រតនគិរី", "ព្រះវិហារ",
+    "កោះកុង", "កំពង់ធំ", "បាត់ដំបង", "កំពង់ចាម", "កំពង់ស្ពឺ", "កណ្តាល", "កំពត", "ព្រៃវែង",
+    "ត្បូងឃ្មុំ", "វ៉េស្ទឡាញន៍", "ណត្សឡាញន៍",
+})
+
+NEUTRAL_FEATURES = frozenset({
+    "កម្មវិធី", "កីឡាកាយ", "កីឡារិនី", "កំប្លោក", "ក្រុមព្រះខ័ន", "ក្រុមហា", "គីឡូ", "គីឡូក្រាម",
+    "គីឡូម៉ែត", "គីឡូម៉ែត្រ", "គីឡូវ៉ាត់", "គុណភាព", "ឃ្លោក", "ច្បាប់", "ដុល្លា", "ដុល្លារ", "ទំហំ",
+    "បច្ចេកទេស", "បច្ចេកវិទ្យាសាក", "ប្រធានាធិបតី", "ពាក្យបច្ចេកទេស", "ពាក្យស្លោក", "ភពលោក",
+    "មនុស្សលោក", "លោកគ្រូបង្វឹក", "លោកពូទីន", "លោកយាយ", "លោកស្រី", "លោក", "អ្នកនាង", "ពាន់", "លាន",
+    "ម៉ឺន", "ប៊ីលាន", "ពាន", "លេខ", "ចំនួន", "សរុប", "ប្រមាណ", "គយ", "មនុស្ស", "វ័យ", "អាយុ",
+    "ផងដែរ", "ផង", "ទៀន", "ទើប", "ម្តង", "ជាដើម", "ជាពិសេស", "ពិសេស", "ពិបាក", "ប្រសើរ", "ធំ",
+    "តូច", "ពេក", "យូរ", "លឿន", "ខ្លី", "វែង", "ពេល", "ពេលខ្លះ", "ពេលនេះ", "ពេលនោះ", "រយៈពេល",
+    "អំឡុង", "អំឡុងពេល", "ជារៀងរាល់", "ផ្សេង", "នានា", "ដទៃ", "ផ្សេងៗ", "ទូទៅ", "ធម្មតា", "ពិតជា",
+    "ពិត", "លក្ខណៈ", "សម្បត្តិ", "សមត្ថភាព", "លទ្ធភាព", "សក្តានុពល", "អត្ថបទ", "រ៉ាឌី", "សុន",
+    "ខ្មែរ", "ជុំវិញ", "កុំ", "រវាង", "ក្រៅ", "ខណៈ",
+})
+
+FEATURES_TO_REMOVE = DATE_FEATURES | LOCATION_FEATURES | NEUTRAL_FEATURES
+
+
+def get_features_to_remove() -> frozenset:
+    return FEATURES_TO_REMOVE
+
+
+# Everything but Khmer and whitespace; what remains splits into the notebook's tokens
+NON_KHMER_PATTERN = re.compile(r"[^\u1780-\u17FF\s]+")
+KHMER_WORD_PATTERN = re.compile(r"[\u1780-\u17FF]{2,}")
+
+
+def khmer_word_analyzer(text: str) -> List[str]:
+    """Whitespace tokens containing Khmer, stripped to their Khmer characters (at least 2)
+
+    Same tokens as the notebook's per-character loop, in two regex passes.
+    """
+    return KHMER_WORD_PATTERN.findall(NON_KHMER_PATTERN.sub("", text))
+
+
+def khmer_word_analyzer_with_filtering(text: str) -> List[str]:
+    """khmer_word_analyzer without the non-discriminative words"""
+    return [word for word in khmer_word_analyzer(text) if word not in FEATURES_TO_REMOVE]
+
+
+def load_vectorizer(path: str):
+    """A vectorizer pickled by the notebook
+
+    The notebook defined its analyzers in ``__main__``, so the pickles refer
+    to ``__main__.khmer_word_analyzer``; they resolve to the functions above.
+    """
+    import joblib
+
+    main = sys.modules["__main__"]
+    for analyzer in (khmer_word_analyzer, khmer_word_analyzer_with_filtering):
+        if not hasattr(main, analyzer.__name__):
+            setattr(main, analyzer.__name__, analyzer)
+    return joblib.load(path)
+
+
+def is_filtered(vectorizer) -> bool:
+    return getattr(vectorizer.analyzer, "__name__", "") == khmer_word_analyzer_with_filtering.__name__
+
+
+def category_mean_weights(X, labels: Sequence[str],
+                          categories: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray, sparse.csr_matrix]:
+    """(categories, document counts, categories x features mean TF-IDF weights)
+
+    The means are ``diag(1 / counts) @ indicator @ X`` with a sparse
+    category-by-document indicator, so nothing is densified.
+    """
+    X = sparse.csr_matrix(X)
+    labels = np.asarray(labels)
+    categories = sorted(set(labels.tolist())) if categories is None else list(categories)
+    index = {category: i for i, category in enumerate(categories)}
+    codes = np.fromiter((index[label] for label in labels), dtype=np.int64, count=len(labels))
+    indicator = sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))),
+                                  shape=(len(categories), X.shape[0]))
+    counts = np.bincount(codes, minlength=len(categories))
+    means = sparse.diags(1.0 / np.maximum(counts, 1)) @ (indicator @ X)
+    return categories, counts, sparse.csr_matrix(means)
+
+
+def top_features(weights: sparse.csr_matrix, row: int, top_n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(feature indices, weights) of the top_n positive weights of a row, heaviest first"""
+    start, end = weights.indptr[row], weights.indptr[row + 1]
+    values, indices = weights.data[start:end], weights.indices[start:end]
+    positive = values > 0
+    values, indices = values[positive], indices[positive]
+    if len(values) > top_n:
+        keep = np.argpartition(-values, top_n - 1)[:top_n]
+        values, indices = values[keep], indices[keep]
+    order = np.lexsort((indices, -values))
+    return indices[order], values[order]
+
+
+def save_raw_features_to_file(vectorizer, output_dir: str) -> int:
+    """raw_features[_filtered].txt: the vocabulary in column order"""
+    feature_names = vectorizer.get_feature_names_out()
+    filtered = is_filtered(vectorizer)
+    path = os.path.join(output_dir, "raw_features_filtered.txt" if filtered else "raw_features.txt")
+    lines = ["TF-IDF Raw Features (After Feature Engineering)", "=" * 50, ""] if filtered else \
+        ["TF-IDF Raw Features", "=" * 30, ""]
+    if filtered:
+        lines.append(f"Max Features Limit: {vectorizer.max_features}")
+    lines.append(f"Total Number of Features: {len(feature_names)}")
+    if filtered:
+        lines.append("Feature Engineering Applied: Non-discriminative features removed")
+    lines += ["", "Features List:", "-" * 20]
+    lines += [f"{i:>6}. {feature}" for i, feature in enumerate(feature_names, 1)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return len(feature_names)
+
+
+def save_category_features(vectorizer, X_train_tfidf, y_train: Sequence[str], output_dir: str,
+                           top_n: int = 500) -> int:
+    """Top-N features per category and the features common to all of them (the notebook's reports)
+
+    Returns the number of common features.
+    """
+    feature_names = vectorizer.get_feature_names_out()
+    filtered = is_filtered(vectorizer)
+    suffix = "_filtered" if filtered else ""
+    rule = "=" * (60 if filtered else 40)
+    categories, counts, weights = category_mean_weights(X_train_tfidf, y_train)
+
+    lines = [f"Top {top_n} Features by Category" + (" (After Feature Engineering)" if filtered else ""), rule, ""]
+    if filtered:
+        lines += ["Feature Engineering Applied: Non-discriminative features removed",
+                  f"Max Features Limit: {vectorizer.max_features}", ""]
+    top_sets: Dict[str, set] = {}
+    for row, category in enumerate(categories):
+        indices, values = top_features(weights, row, top_n)
+        top_sets[category] = set(indices.tolist())
+        lines += [f"Category: {category}", "-" * 30, f"Documents in category: {counts[row]}", "",
+                  f"{'Rank':<6} {'Feature':<30} {'Weight':<12}", "-" * 50]
+        lines += [f"{rank:<6} {feature_names[index]:<30} {value:.8f}"
+                  for rank, (index, value) in enumerate(zip(indices, values), 1)]
+        lines += ["", f"Actual features saved: {len(indices)}", "", rule, ""]
+    with open(os.path.join(output_dir, f"top_{top_n}_features_by_category{suffix}.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    common = set.intersection(*top_sets.values()) if top_sets else set()
+    common_indices = sorted(common, key=lambda index: feature_names[index])
+    lines = ["Common Features Across All Categories" + (" (After Feature Engineering)" if filtered else ""), rule, ""]
+    if filtered:
+        lines.append("Feature Engineering Applied: Non-discriminative features removed")
+    lines += [f"Number of common features: {len(common)}", ""]
+    if common_indices:
+        common_weights = weights[:, common_indices].toarray()
+        lines += [f"{'Feature':<30} {'Avg Weight':<12} Category-specific Weights", "-" * 80]
+        for column, index in enumerate(common_indices):
+            per_category = ", ".join(f"{category}:{common_weights[row, column]:.6f}"
+                                     for row, category in enumerate(categories))
+            lines.append(f"{feature_names[index]:<30} {common_weights[:, column].mean():.8f}   {per_category}")
+    else:
+        lines.append("No common features found across all categories.")
+    with open(os.path.join(output_dir, f"common_features_across_categories{suffix}.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return len(common)
+
+
+def load_training_texts(metadata_path: str, texts_dir: str) -> Tuple[List[str], List[str]]:
+    """Training texts and labels of the notebook (same files, same stratified split)"""
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    texts, labels = [], []
+    metadata = pd.read_csv(metadata_path)
+    for doc_id, category in zip(metadata["docId"], metadata["category"]):
+        path = os.path.join(texts_dir, f"{doc_id}.txt")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                texts.append(f.read())
+            labels.append(category)
+    X_train, _, y_train, _ = train_test_split(texts, labels, test_size=0.2, random_state=42, stratify=labels)
+    return X_train, y_train
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-category TF-IDF feature analysis (sparse)")
+    parser.add_argument("--vectorizer", default=os.path.join("TF_IDF", "features", "tfidf_vectorizer.joblib"))
+    parser.add_argument("--texts", default="preprocessed_articles")
+    parser.add_argument("--metadata", default="metadata.csv")
+    parser.add_argument("--output", default=os.path.join("TF_IDF", "features"))
+    parser.add_argument("--top-n", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    vectorizer = load_vectorizer(args.vectorizer)
+    X_train, y_train = load_training_texts(args.metadata, args.texts)
+    if not X_train:
+        print(f"❌ No documents found in {args.texts}")
+        return 1
+    start = time.time()
+    X_train_tfidf = vectorizer.transform(X_train)
+    print(f"📦 {X_train_tfidf.shape[0]:,} x {X_train_tfidf.shape[1]:,} TF-IDF matrix "
+          f"({X_train_tfidf.nnz:,} non-zeros) in {time.time() - start:.1f}s")
+
+    os.makedirs(args.output, exist_ok=True)
+    start = time.time()
+    total = save_raw_features_to_file(vectorizer, args.output)
+    common = save_category_features(vectorizer, X_train_tfidf, y_train, args.output, args.top_n)
+    print(f"✅ {total:,} features, top {args.top_n} per category, {common} common; "
+          f"analysis in {time.time() - start:.2f}s, written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+SVM Training and Hyperparameter Search
+======================================
+Command-line replacement for the training cells of
+``4A_FastText_Model_Development.ipynb`` (StandardScaler + RBF SVC), with a
+parallel, cached search over C, gamma and class_weight:
+
+- cross-validation folds as in the notebook (``cross_val_score(cv=5)``:
+  stratified, unshuffled); each fold's standardized squared-distance
+  matrices are computed once and stored in a content-addressed cache, so
+  every gamma only costs an ``exp`` and the SVC is fitted on the
+  precomputed kernel
+- fold results are cached under a hash of the data, the fold and the
+  parameters: re-running a search (or widening the grid) only fits what is
+  new
+- ``--search grid`` evaluates the configurations fold by fold and stops
+  early those whose mean is more than ``--prune-margin`` below the best;
+  ``--search halving`` runs successive halving over training-set size
+- folds run on ``joblib`` workers (``--jobs``, by default as many as fit
+  in the available memory), which read the cached matrices through mmap
+- the best configuration is refitted on the whole training set and saved
+  as ``svm_model.joblib``; ``svm_model_info.txt`` keeps the notebook's
+  format and ``svm_search_report.txt`` / ``.json`` hold the full search
+
+Usage:
+    python train_models.py --features FastText/features --output FastText/models \\
+        --C 0.1 1 10 --gamma scale 0.001 0.01 --class-weight none balanced --jobs 4
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+import feature_store
+
+CACHE_VERSION = 1
+
+
+@dataclass
+class Candidate:
+    """One hyperparameter configuration and its cross-validation results"""
+    C: float
+    gamma: str
+    class_weight: Optional[str]
+    scores: Dict[int, float] = field(default_factory=dict)
+    fit_seconds: float = 0.0
+    status: str = "evaluated"
+
+    @property
+    def params(self) -> Dict:
+        return {"C": self.C, "gamma": self.gamma, "class_weight": self.class_weight}
+
+    @property
+    def label(self) -> str:
+        return f"C={self.C:g}, gamma={self.gamma}, class_weight={self.class_weight}"
+
+    @property
+    def mean(self) -> float:
+        return float(np.mean(list(self.scores.values()))) if self.scores else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.std(list(self.scores.values()))) if self.scores else 0.0
+
+
+def _digest(*parts) -> str:
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True).encode("utf-8"))
+    return sha.hexdigest()[:20]
+
+
+def data_fingerprint(X: np.ndarray, y: np.ndarray) -> str:
+    return _digest(np.ascontiguousarray(X).tobytes(), np.asarray(y).astype(str).tobytes(), CACHE_VERSION)
+
+
+class FoldCache:
+    """Content-addressed store of fold distance matrices and fold results"""
+
+    def __init__(self, directory: str, fingerprint: str):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        os.makedirs(os.path.join(directory, "folds"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "results"), exist_ok=True)
+        self.hits = 0
+
+    def fold_paths(self, fold: int, n_folds: int) -> Dict[str, str]:
+        key = _digest(self.fingerprint, "fold", fold, n_folds)
+        base = os.path.join(self.directory, "folds", key)
+        return {"train": base + ".train.npy", "val": base + ".val.npy", "meta": base + ".json"}
+
+    def prepare_fold(self, X: np.ndarray, y: np.ndarray, fold: int, n_folds: int,
+                     train_rows: np.ndarray, val_rows: np.ndarray) -> Dict[str, str]:
+        """Squared distances of the standardized fold (train x train, val x train), computed once"""
+        from sklearn.metrics.pairwise import euclidean_distances
+        from sklearn.preprocessing import StandardScaler
+
+        paths = self.fold_paths(fold, n_folds)
+        if all(os.path.exists(path) for path in paths.values()):
+            return paths
+        scaler = StandardScaler().fit(X[train_rows])
+        X_train, X_val = scaler.transform(X[train_rows]), scaler.transform(X[val_rows])
+        for name, rows in (("train", X_train), ("val", X_val)):
+            distances = euclidean_distances(rows, X_train, squared=True).astype(np.float32)
+            np.save(paths[name] + ".tmp.npy", distances)
+            os.replace(paths[name] + ".tmp.npy", paths[name])
+        with open(paths["meta"], "w", encoding="utf-8") as f:
+            json.dump({"fold": fold, "scale_gamma": 1.0 / (X_train.shape[1] * X_train.var())}, f)
+        return paths
+
+    def result_path(self, fold: int, n_folds: int, params: Dict, subsample: int) -> str:
+        key = _digest(self.fingerprint, "result", fold, n_folds, params, subsample)
+        return os.path.join(self.directory, "results", key + ".json")
+
+    def get_result(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            self.hits += 1
+            return result
+        except (OSError, ValueError):
+            return None
+
+
+def _rbf_kernel(distances: np.ndarray, gamma: float) -> np.ndarray:
+    """exp(-gamma * distances) in one float64 buffer, read straight from the (memory-mapped) distances
+
+    float64 because libsvm works in doubles: SVC.fit would copy a float32
+    kernel into a float64 one, so this is the smallest peak.
+    """
+    kernel = np.multiply(distances, -gamma, dtype=np.float64)
+    return np.exp(kernel, out=kernel)
+
+
+def fold_fit_bytes(n_train: int, svc_cache_mb: float = 200.0) -> int:
+    """Peak memory of one fold fit: its float64 kernel and the SVC's kernel cache"""
+    return 8 * n_train * n_train + int(svc_cache_mb * 1024 * 1024)
+
+
+def available_memory() -> Optional[int]:
+    """Available RAM in bytes (None when it cannot be read)"""
+    try:
+        import psutil
+
+        return int(psutil.virtual_memory().available)
+    except ImportError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_jobs(n_train: int, memory_fraction: float = 0.7) -> int:
+    """Parallel fold fits that fit in memory_fraction of the available RAM, at most one per CPU"""
+    cpus = os.cpu_count() or 1
+    memory = available_memory()
+    if memory is None:
+        return 1
+    return max(1, min(cpus, int(memory * memory_fraction // fold_fit_bytes(n_train))))
+
+
+def _fit_fold(paths: Dict[str, str], y_train: np.ndarray, y_val: np.ndarray, params: Dict,
+              subsample_rows: Optional[np.ndarray], result_path: str) -> Dict:
+    """Fit one fold on its precomputed kernel and store the validation accuracy"""
+    from sklearn.svm import SVC
+
+    start = time.perf_counter()
+    with open(paths["meta"], "r", encoding="utf-8") as f:
+        scale_gamma = json.load(f)["scale_gamma"]
+    gamma = scale_gamma if params["gamma"] == "scale" else float(params["gamma"])
+    train_distances = np.load(paths["train"], mmap_mode="r")
+    val_distances = np.load(paths["val"], mmap_mode="r")
+    if subsample_rows is not None:
+        train_distances = train_distances[np.ix_(subsample_rows, subsample_rows)]
+        val_distances = val_distances[:, subsample_rows]
+        y_train = y_train[subsample_rows]
+    model = SVC(kernel="precomputed", C=params["C"], class_weight=params["class_weight"])
+    model.fit(_rbf_kernel(train_distances, gamma), y_train)
+    val_kernel = _rbf_kernel(val_distances, gamma)
+    result = {"score": float(np.mean(model.predict(val_kernel) == y_val)),
+              "fit_seconds": time.perf_counter() - start}
+    with open(result_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    os.replace(result_path + ".tmp", result_path)
+    return result
+
+
+class SearchRunner:
+    """Runs (candidate, fold) fits in parallel, answering repeated ones from the cache"""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, cache: FoldCache, n_folds: int = 5, jobs: int = 1):
+        from sklearn.model_selection import StratifiedKFold
+
+        self.y = np.asarray(y)
+        self.cache = cache
+        self.n_folds = n_folds
+        self.jobs = jobs
+        self.folds = list(StratifiedKFold(n_splits=n_folds).split(X, self.y))
+        start = time.perf_counter()
+        self.paths = [cache.prepare_fold(X, self.y, fold, n_folds, train_rows, val_rows)
+                      for fold, (train_rows, val_rows) in enumerate(self.folds)]
+        logging.info(f"Fold kernels ready in {time.perf_counter() - start:.1f}s")
+
+    def subsample(self, fold: int, size: Optional[int], seed: int = 42) -> Optional[np.ndarray]:
+        """Stratified subset of size rows of a fold's training part (None: all of it)"""
+        train_rows = self.folds[fold][0]
+        if size is None or size >= len(train_rows):
+            return None
+        from sklearn.model_selection import train_test_split
+
+        positions = np.arange(len(train_rows))
+        subset, _ = train_test_split(positions, train_size=size, random_state=seed,
+                                     stratify=self.y[train_rows])
+        return np.sort(subset)
+
+    def evaluate(self, candidates: Sequence[Candidate], folds: Sequence[int], size: Optional[int] = None):
+        """Score each candidate on each fold (at size training rows), in parallel"""
+        tasks, pending = [], []
+        for candidate in candidates:
+            for fold in folds:
+                result_path = self.cache.result_path(fold, self.n_folds, candidate.params, size or 0)
+                cached = self.cache.get_result(result_path)
+                if cached is not None:
+                    candidate.scores[fold] = cached["score"]
+                    continue
+                train_rows, val_rows = self.folds[fold]
+                tasks.append(joblib.delayed(_fit_fold)(self.paths[fold], self.y[train_rows], self.y[val_rows],
+                                                       candidate.params, self.subsample(fold, size), result_path))
+                pending.append((candidate, fold))
+        if tasks:
+            results = joblib.Parallel(n_jobs=self.jobs)(tasks)
+            for (candidate, fold), result in zip(pending, results):
+                candidate.scores[fold] = result["score"]
+                candidate.fit_seconds += result["fit_seconds"]
+
+
+def grid_search(runner: SearchRunner, candidates: List[Candidate], prune_margin: float) -> List[Candidate]:
+    """All candidates fold by fold; those far below the best running mean stop early"""
+    alive = list(candidates)
+    for fold in range(runner.n_folds):
+        runner.evaluate(alive, [fold])
+        best = max(candidate.mean for candidate in alive)
+        for candidate in alive:
+            if candidate.mean < best - prune_margin:
+                candidate.status = f"pruned after fold {fold + 1}"
+        alive = [candidate for candidate in alive if candidate.status == "evaluated"]
+    return candidates
+
+
+def halving_search(runner: SearchRunner, candidates: List[Candidate], factor: int = 3,
+                   min_samples: int = 500) -> List[Candidate]:
+    """Successive halving: keep the best 1/factor at each step while the training size grows by factor"""
+    full = min(len(train_rows) for train_rows, _ in runner.folds)
+    rounds = max(1, min(int(math.log(len(candidates), factor)) + 1,
+                        int(math.log(max(full / min_samples, 1), factor)) + 1))
+    alive = list(candidates)
+    for round_index in range(rounds):
+        size = None if round_index == rounds - 1 else int(full / factor ** (rounds - 1 - round_index))
+        for candidate in alive:
+            candidate.scores = {}
+        runner.evaluate(alive, range(runner.n_folds), size)
+        logging.info(f"Halving round {round_index + 1}/{rounds}: {len(alive)} candidates at "
+                     f"{size or full} training rows")
+        if round_index < rounds - 1:
+            alive.sort(key=lambda candidate: candidate.mean, reverse=True)
+            keep = max(1, math.ceil(len(alive) / factor))
+            for candidate in alive[keep:]:
+                candidate.status = f"eliminated in round {round_index + 1} ({size} rows)"
+            alive = alive[:keep]
+    return candidates
+
+
+def build_pipeline(params: Dict, probability: bool):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+
+    options = {"probability": True} if probability else {}
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", SVC(C=params["C"], gamma="scale" if params["gamma"] == "scale" else float(params["gamma"]),
+                    class_weight=params["class_weight"], kernel="rbf", random_state=42, **options)),
+    ])
+
+
+def write_model_info(path: str, best: Candidate, metrics: Dict, probability: bool):
+    """svm_model_info.txt in the notebook's format"""
+    lines = [
+        "SVM Model Information",
+        "=" * 60,
+        "",
+        "Pipeline: StandardScaler + SVM",
+        "Model Type: Support Vector Machine (RBF kernel)",
+        f"Parameters: C={best.C:g}, gamma={best.gamma}, class_weight={best.class_weight}, probability={probability}",
+        "Feature Engineering: FastText mean embeddings",
+        f"Feature Count: {metrics['feature_count']}",
+        f"Training Samples: {metrics['train_samples']}",
+        f"Test Samples: {metrics['test_samples']}",
+        f"Training Time: {metrics['training_time']:.2f} seconds",
+        f"Training Accuracy: {metrics['train_accuracy']:.4f}",
+        f"Validation Accuracy: {best.mean:.4f}",
+        f"Test Accuracy: {metrics['accuracy']:.4f}",
+        f"Test F1-Score: {metrics['f1_score']:.4f}",
+        f"Test Precision: {metrics['precision']:.4f}",
+        f"Test Recall: {metrics['recall']:.4f}",
+        f"Overfitting Gap: {metrics['train_accuracy'] - metrics['accuracy']:.4f}",
+        f"CV Mean: {best.mean:.4f}",
+        f"CV Std: {best.std:.4f}",
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_search_report(directory: str, candidates: List[Candidate], settings: Dict, cache_hits: int,
+                        seconds: float):
+    ranked = sorted(candidates, key=lambda candidate: (candidate.status != "evaluated", -candidate.mean))
+    with open(os.path.join(directory, "svm_search_report.json"), "w", encoding="utf-8") as f:
+        json.dump({"settings": settings, "seconds": seconds, "cache_hits": cache_hits,
+                   "candidates": [dict(asdict(candidate), mean=candidate.mean, std=candidate.std)
+                                  for candidate in ranked]}, f, indent=2)
+    lines = ["SVM Hyperparameter Search", "=" * 60, "",
+             f"Search: {settings['search']} ({settings['folds']}-fold CV, {len(candidates)} configurations)",
+             f"Search Time: {seconds:.1f} seconds ({cache_hits} cached fold results)", ""]
+    for rank, candidate in enumerate(ranked, 1):
+        lines.append(f"{rank:>3}. {candidate.label:<50} CV {candidate.mean:.4f} (±{candidate.std:.4f})  "
+                     f"fit {candidate.fit_seconds:6.1f}s  {candidate.status}")
+    with open(os.path.join(directory, "svm_search_report.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def load_features(directory: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """X/y train/test of a features directory (joblib pickles or feature store)"""
+    arrays = [feature_store.load(os.path.join(directory, f"{name}_fasttext.joblib"))
+              for name in ("X_train", "y_train", "X_test", "y_test")]
+    return tuple(np.asarray(array) for array in arrays)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel, cached SVM hyperparameter search and training")
+    parser.add_argument("--features", default=os.path.join("FastText", "features"))
+    parser.add_argument("--output", default=os.path.join("FastText", "models"))
+    parser.add_argument("--cache", default=".train_cache", help="Content-addressed fold cache directory")
+    parser.add_argument("--C", type=float, nargs="+", default=[0.1, 1.0, 10.0])
+    parser.add_argument("--gamma", nargs="+", default=["scale"], help='"scale" or numbers')
+    parser.add_argument("--class-weight", nargs="+", default=["balanced"], choices=["none", "balanced"])
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--search", choices=["grid", "halving"], default="grid")
+    parser.add_argument("--prune-margin", type=float, default=0.03,
+                        help="Grid: stop configurations this far below the best running CV mean")
+    parser.add_argument("--halving-factor", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Parallel fold fits (joblib n_jobs; default: as many as fit in the available RAM)")
+    parser.add_argument("--probability", action="store_true", help="Fit the final SVC with probability=True")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    X_train, y_train, X_test, y_test = load_features(args.features)
+    print(f"📦 {len(X_train):,} training and {len(X_test):,} test rows of {X_train.shape[1]} features")
+
+    cache = FoldCache(args.cache, data_fingerprint(X_train, y_train))
+    candidates = [Candidate(C, gamma, None if weight == "none" else weight)
+                  for C, gamma, weight in product(args.C, args.gamma, args.class_weight)]
+    search_start = time.time()
+    jobs = args.jobs
+    if jobs is None:
+        fold_rows = len(X_train) - len(X_train) // args.folds
+        jobs = default_jobs(fold_rows)
+        logging.info(f"{jobs} parallel fold fits ({fold_fit_bytes(fold_rows) / 1024 ** 3:.1f} GB each)")
+    runner = SearchRunner(X_train, y_train, cache, args.folds, jobs)
+    if args.search == "halving":
+        halving_search(runner, candidates, args.halving_factor)
+    else:
+        grid_search(runner, candidates, args.prune_margin)
+    search_seconds = time.time() - search_start
+    finalists = [candidate for candidate in candidates if candidate.status == "evaluated"]
+    best = max(finalists, key=lambda candidate: candidate.mean)
+    print(f"🏅 Best: {best.label} (CV {best.mean:.4f} ±{best.std:.4f}) after {search_seconds:.1f}s, "
+          f"{cache.hits} cached fold results")
+
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+    start = time.time()
+    pipeline = build_pipeline(best.params, args.probability).fit(X_train, y_train)
+    training_time = time.time() - start
+    y_pred = pipeline.predict(X_test)
+    metrics = {
+        "feature_count": X_train.shape[1],
+        "train_samples": len(X_train),
+        "test_samples": len(X_test),
+        "training_time": training_time,
+        "train_accuracy": pipeline.score(X_train, y_train),
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, average="weighted"),
+        "recall": recall_score(y_test, y_pred, average="weighted"),
+        "f1_score": f1_score(y_test, y_pred, average="weighted"),
+    }
+
+    os.makedirs(args.output, exist_ok=True)
+    joblib.dump(pipeline, os.path.join(args.output, "svm_model.joblib"))
+    write_model_info(os.path.join(args.output, "svm_model_info.txt"), best, metrics, args.probability)
+    settings = {"search": args.search, "folds": args.folds, "C": args.C, "gamma": args.gamma,
+                "class_weight": args.class_weight, "prune_margin": args.prune_margin,
+                "halving_factor": args.halving_factor}
+    write_search_report(args.output, candidates, settings, cache.hits, search_seconds)
+    print(f"✅ Test accuracy {metrics['accuracy']:.4f}, F1 {metrics['f1_score']:.4f}; "
+          f"model and reports written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -72,6 +72,7 @@ def check_dependencies():
 def check_model_files():
     """Check if required model files exist"""
     print("\n🤖 Checking model files...")
+    from feature_store import is_store, store_paths
     
     required_files = [
         'Demo_model/svm_model.joblib',
@@ -98,9 +99,12 @@ def check_model_files():
             print(f"   ❌ {file_path} - NOT FOUND")
             all_good = False
     
-    # Check optional files
+    # Check optional files (features and labels may be memory-mapped stores, see feature_store.py)
     for file_path in optional_files:
-        if os.path.exists(file_path):
+        if file_path.endswith('_fasttext.joblib') and is_store(file_path):
+            size = os.path.getsize(store_paths(file_path)['data'])
+            print(f"   ✅ {store_paths(file_path)['data']} - {size / (1024 * 1024):.1f} MB (feature store)")
+        elif os.path.exists(file_path):
             size = os.path.getsize(file_path)
             size_mb = size / (1024 * 1024)
             print(f"   ✅ {file_path} - {size_mb:.1f} MB")
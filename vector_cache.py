@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent Word-Vector Cache
+============================
+On-disk token -> vector cache (in-vocabulary rows and OOV compositions)
+that survives restarts and deploys, so warm latency is available right
+after start-up instead of after the first few thousand requests.
+
+Layout of the cache directory (``Config.VECTOR_CACHE_DIR``):
+
+- ``meta.json``: format version, model fingerprint, vector size and the
+  current generation
+- ``tokens.<gen>.txt`` / ``vectors.<gen>.npy``: the compacted cache, one
+  token per line and a float32 matrix that every process memory-maps
+  read-only (the pages are shared through the OS page cache)
+- ``append.<gen>.log``: records added since the last compaction, appended
+  with one ``write`` per batch; a record is
+  ``<uint32 token byte length><token UTF-8><vector_size float32>``
+
+Writers take an exclusive ``flock`` on ``lock`` to append or compact.
+Compaction merges the log into a new generation and switches ``meta.json``
+atomically; readers notice the new generation on their next refresh and
+reopen. A cache written for another model (fingerprint mismatch) is
+discarded.
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+CACHE_VERSION = 1
+_LENGTH = struct.Struct("<I")
+_PRELOAD_CHUNK_ROWS = 16384
+
+
+class VectorCache:
+    """Append-only, memory-mapped token -> float32 vector cache"""
+
+    def __init__(self, directory: str, vector_size: int, fingerprint: str, max_entries: int = 200000,
+                 compact_every: int = 20000, refresh_interval: float = 5.0, writable: bool = True):
+        self.directory = directory
+        self.vector_size = vector_size
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self.refresh_interval = refresh_interval
+        self.writable = writable
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._reset_state(generation=-1)
+        if writable:
+            os.makedirs(directory, exist_ok=True)
+        self.reload()
+
+    # ------------------------------------------------------------------
+    # Files and locking
+    # ------------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _log_path(self, generation: int) -> str:
+        return self._path(f"append.{generation}.log")
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None or not self.writable:
+            yield
+            return
+        with open(self._path("lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, generation: int, count: int):
+        meta = {"version": CACHE_VERSION, "fingerprint": self.fingerprint, "vector_size": self.vector_size,
+                "generation": generation, "count": count}
+        temporary = self._path("meta.json.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temporary, self._path("meta.json"))
+
+    def _meta_matches(self, meta: Optional[Dict]) -> bool:
+        return bool(meta) and meta.get("version") == CACHE_VERSION and \
+            meta.get("fingerprint") == self.fingerprint and meta.get("vector_size") == self.vector_size
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _reset_state(self, generation: int):
+        self.generation = generation
+        self._index: Dict[str, int] = {}
+        self._base = np.zeros((0, self.vector_size), dtype=np.float32)
+        self._extra = np.zeros((1024, self.vector_size), dtype=np.float32)
+        self._extra_count = 0
+        self._log_offset = 0
+        self._last_refresh = time.monotonic()
+
+    def reload(self):
+        """(Re)open the current generation from disk"""
+        meta = self._read_meta()
+        if self._meta_matches(meta):
+            with self._lock:
+                self._open_generation(meta["generation"])
+            return
+        if meta is not None:
+            logging.warning(f"Vector cache at {self.directory} belongs to another model; starting empty")
+        if not self.writable:
+            with self._lock:
+                self._reset_state(generation=-1)
+            return
+        with self._file_lock():
+            self._sync_locked()
+
+    def _sync_locked(self):
+        """Open the current generation, starting a new empty one if it is missing or
+        belongs to another model (called with the file lock held)"""
+        meta = self._read_meta()
+        with self._lock:
+            if self._meta_matches(meta):
+                self._open_generation(meta["generation"])
+            else:
+                self._start_generation(meta)
+
+    def _open_generation(self, generation: int):
+        self._reset_state(generation)
+        tokens_path, vectors_path = self._path(f"tokens.{generation}.txt"), self._path(f"vectors.{generation}.npy")
+        if os.path.exists(vectors_path):
+            self._base = np.load(vectors_path, mmap_mode="r")
+            with open(tokens_path, "r", encoding="utf-8") as f:
+                self._index = {line.rstrip("\n"): row for row, line in enumerate(f)}
+        self._read_log()
+
+    def _start_generation(self, meta: Optional[Dict]):
+        generation = (meta or {}).get("generation", -1) + 1
+        open(self._log_path(generation), "ab").close()
+        self._write_meta(generation, 0)
+        self._remove_old_generations(generation)
+        self._reset_state(generation)
+
+    def _remove_old_generations(self, current: int):
+        for name in os.listdir(self.directory):
+            parts = name.split(".")
+            if len(parts) == 3 and parts[0] in ("tokens", "vectors", "append") and parts[1].isdigit() \
+                    and int(parts[1]) != current:
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass
+
+    def _read_log(self):
+        """Read records appended to the current log since the last read"""
+        try:
+            with open(self._log_path(self.generation), "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except OSError:
+            return
+        record_vector_bytes = 4 * self.vector_size
+        position = 0
+        while position + _LENGTH.size <= len(data):
+            (length,) = _LENGTH.unpack_from(data, position)
+            end = position + _LENGTH.size + length + record_vector_bytes
+            if end > len(data):
+                break  # Partially written record: picked up on the next read
+            token = data[position + _LENGTH.size:position + _LENGTH.size + length].decode("utf-8")
+            vector = np.frombuffer(data, dtype=np.float32, count=self.vector_size,
+                                   offset=position + _LENGTH.size + length)
+            self._add(token, vector)
+            position = end
+        self._log_offset += position
+
+    def _add(self, token: str, vector: np.ndarray):
+        if token in self._index:
+            return
+        if self._extra_count == len(self._extra):
+            grown = np.zeros((2 * len(self._extra), self.vector_size), dtype=np.float32)
+            grown[:self._extra_count] = self._extra[:self._extra_count]
+            self._extra = grown
+        self._extra[self._extra_count] = vector
+        self._index[token] = len(self._base) + self._extra_count
+        self._extra_count += 1
+
+    def refresh(self, force: bool = False):
+        """Pick up appends and compactions of other processes (at most every refresh_interval)"""
+        if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        meta = self._read_meta()
+        if meta is not None and meta.get("generation") != self.generation:
+            self.reload()
+            return
+        with self._lock:
+            self._read_log()
+            self._last_refresh = time.monotonic()
+
+    def preload(self):
+        """Fault the memory-mapped vectors into the page cache"""
+        for start in range(0, len(self._base), _PRELOAD_CHUNK_ROWS):
+            np.add.reduce(self._base[start:start + _PRELOAD_CHUNK_ROWS], axis=0)
+
+    # ------------------------------------------------------------------
+    # Lookups and appends
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._index
+
+    def _rows(self, rows: np.ndarray) -> np.ndarray:
+        base_count = len(self._base)
+        result = np.empty((len(rows), self.vector_size), dtype=np.float32)
+        in_base = rows < base_count
+        if in_base.any():
+            result[in_base] = self._base[rows[in_base]]
+        if not in_base.all():
+            result[~in_base] = self._extra[rows[~in_base] - base_count]
+        return result
+
+    def get(self, token: str) -> Optional[np.ndarray]:
+        found, vectors = self.get_many([token])
+        return vectors[0] if found[0] else None
+
+    def get_many(self, tokens: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(mask of the cached tokens, their vectors in token order)"""
+        self.refresh()
+        with self._lock:
+            rows = np.array([self._index.get(token, -1) for token in tokens], dtype=np.int64)
+            found = rows >= 0
+            vectors = self._rows(rows[found])
+        hits = int(found.sum())
+        self.hits += hits
+        self.misses += len(tokens) - hits
+        return found, vectors
+
+    def put_many(self, tokens: Sequence[str], vectors: np.ndarray):
+        """Append new token vectors (ignored when read-only or full)"""
+        if not self.writable or not len(tokens):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            room = self.max_entries - len(self._index)
+            new = [(token, vector) for token, vector in zip(tokens, vectors)
+                   if token not in self._index and "\n" not in token]
+            new = new[:max(room, 0)]
+        if not new:
+            return
+        with self._file_lock():
+            meta = self._read_meta()
+            if not self._meta_matches(meta) or meta["generation"] != self.generation:
+                # Compacted or reset by another process in the meantime
+                self._sync_locked()
+            log_path = self._log_path(self.generation)
+            with self._lock:
+                self._read_log()
+            if os.path.exists(log_path) and os.path.getsize(log_path) > self._log_offset:
+                # Partial record of a writer that died mid-write: drop it
+                os.truncate(log_path, self._log_offset)
+            payload = b"".join(
+                _LENGTH.pack(len(encoded)) + encoded + np.ascontiguousarray(vector).tobytes()
+                for encoded, vector in ((token.encode("utf-8"), vector) for token, vector in new)
+            )
+            fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+            with self._lock:
+                self._read_log()
+            if self._extra_count >= self.compact_every:
+                self._compact_locked()
+
+    def compact(self):
+        """Merge the append log into a new compacted generation"""
+        if not self.writable:
+            return
+        with self._file_lock():
+            self._compact_locked()
+
+    def _compact_locked(self):
+        meta = self._read_meta()
+        if not self._meta_matches(meta) or meta["generation"] != self.generation:
+            self._sync_locked()
+        with self._lock:
+            self._read_log()
+            tokens: List[str] = [""] * len(self._index)
+            for token, row in self._index.items():
+                tokens[row] = token
+            vectors = self._rows(np.arange(len(tokens), dtype=np.int64))
+        generation = self.generation + 1
+        np.save(self._path(f"vectors.{generation}.npy"), vectors)
+        with open(self._path(f"tokens.{generation}.txt"), "w", encoding="utf-8") as f:
+            f.writelines(f"{token}\n" for token in tokens)
+        open(self._log_path(generation), "ab").close()
+        self._write_meta(generation, len(tokens))
+        self._remove_old_generations(generation)
+        with self._lock:
+            self._open_generation(generation)
+        logging.info(f"Compacted vector cache: {len(tokens):,} entries (generation {generation})")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "compacted": len(self._base),
+            "appended": self._extra_count,
+            "generation": self.generation,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_vector_cache(directory: str, vector_size: int, fingerprint: str) -> Optional[VectorCache]:
+    """Shared, preloaded cache for a model (None if the directory cannot be used)"""
+    try:
+        start = time.time()
+        cache = VectorCache(directory, vector_size, fingerprint)
+        cache.preload()
+        logging.info(f"Vector cache: {len(cache):,} entries from {directory} in {time.time() - start:.2f}s")
+        return cache
+    except OSError as e:
+        logging.warning(f"Vector cache disabled ({directory}): {e}")
+        return None
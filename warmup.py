@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Start-up Warm-up
+================
+After a restart the first users pay for every cold cache and page fault.
+``start_warm_up`` runs a warm-up phase on a background thread as soon as
+the models are loaded:
+
+1. a cold probe document goes through ``classify_batch`` (segmenter,
+   embedding and one SVM batch, faulting their pages in) and its latency is
+   logged as the cold first-request latency
+2. the top-K tokens of the corpus frequency profile are pre-resolved into
+   the word-vector cache (the persistent ``VectorCache`` when enabled),
+   chunk by chunk, until the time budget is used up (skipped when the
+   subword path has no persistent cache: its vectors would not be kept)
+3. a second probe made of other profile tokens is timed as the warm
+   first-request latency
+
+The profile is a ``token<TAB>count`` file, most frequent first, generated
+from the segmented training corpus:
+
+    python warmup.py build-profile --corpus preprocessed_articles --metadata metadata.csv \\
+        --output Demo_model/token_profile.tsv
+
+``python warmup.py run`` performs the warm-up synchronously (for example as
+a deploy step that fills the persistent cache before traffic is switched).
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+from classifier_core import Config
+from embedding_bundle import count_corpus_tokens
+
+# Tokens per probe document and per resolution chunk
+_PROBE_TOKENS = 200
+_CHUNK_TOKENS = 2000
+# Used when no profile is available
+_FALLBACK_PROBE = "ក្រសួងសេដ្ឋកិច្ចនិងហិរញ្ញវត្ថុ បានប្រកាសពីកំណើនសេដ្ឋកិច្ចនៅក្នុងប្រទេសកម្ពុជា"
+
+
+@dataclass
+class WarmupReport:
+    """What the warm-up did and the probe latencies around it"""
+    cold_ms: float
+    warm_ms: Optional[float]
+    profile_tokens: int
+    tokens_resolved: int
+    seconds: float
+    budget_seconds: float
+
+    @property
+    def budget_exhausted(self) -> bool:
+        return self.tokens_resolved < self.profile_tokens
+
+
+def build_frequency_profile(corpus_dir: str, metadata_path: Optional[str] = None) -> Counter:
+    """Token counts of the segmented corpus (the articles of metadata.csv when given)"""
+    return count_corpus_tokens(corpus_dir, metadata_path)
+
+
+def write_profile(counts: Counter, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        for token, count in counts.most_common():
+            f.write(f"{token}\t{count}\n")
+
+
+def read_profile(path: str, limit: Optional[int] = None) -> List[str]:
+    """The first limit tokens of a profile file (most frequent first)"""
+    tokens = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if limit is not None and len(tokens) >= limit:
+                break
+            token = line.split("\t", 1)[0].strip()
+            if token:
+                tokens.append(token)
+    return tokens
+
+
+def _timed_probe(engine, text: str) -> float:
+    start = time.perf_counter()
+    engine.classify_batch([text])
+    return (time.perf_counter() - start) * 1000
+
+
+def _keeps_resolved_tokens(engine) -> bool:
+    """Whether resolving tokens leaves anything behind (a cache to fill)"""
+    return engine.subword_vectors is None or engine.subword_vectors.cache is not None
+
+
+def _resolve(engine, tokens: List[str]):
+    if engine.subword_vectors is not None:
+        engine.subword_vectors.token_vectors(tokens)
+    else:
+        # Per-word path: fills the engine's in-memory word embedding cache
+        engine.get_sentence_embedding(" ".join(tokens))
+
+
+def warm_up(engine, profile_path: Optional[str] = None, top_k: Optional[int] = None,
+            budget_seconds: Optional[float] = None) -> WarmupReport:
+    """Pre-resolve the most frequent tokens and fault in the models within a time budget"""
+    profile_path = profile_path or Config.WARMUP_PROFILE_PATH
+    top_k = Config.WARMUP_TOP_K if top_k is None else top_k
+    budget_seconds = Config.WARMUP_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+    start = time.perf_counter()
+
+    tokens: List[str] = []
+    if os.path.exists(profile_path):
+        tokens = read_profile(profile_path, top_k)
+    else:
+        logging.warning(f"Warm-up profile not found at {profile_path}; only faulting in the models")
+
+    # Probes: even and odd ranks of the head of the profile, so the warm probe's
+    # tokens are resolved by the warm-up but not by the cold probe
+    head = tokens[:2 * _PROBE_TOKENS]
+    cold_probe = " ".join(head[0::2]) or _FALLBACK_PROBE
+    warm_probe = " ".join(head[1::2])
+    cold_ms = _timed_probe(engine, cold_probe)
+
+    resolved = 0
+    if tokens and not _keeps_resolved_tokens(engine):
+        logging.info("Warm-up: persistent vector cache disabled (KHMER_CLASSIFIER_VECTOR_CACHE_DIR); "
+                     "skipping profile token resolution")
+        tokens = []
+    for chunk_start in range(0, len(tokens), _CHUNK_TOKENS):
+        if time.perf_counter() - start >= budget_seconds:
+            break
+        chunk = tokens[chunk_start:chunk_start + _CHUNK_TOKENS]
+        _resolve(engine, chunk)
+        resolved += len(chunk)
+
+    warm_ms = _timed_probe(engine, warm_probe) if warm_probe else None
+    report = WarmupReport(cold_ms, warm_ms, len(tokens), resolved, time.perf_counter() - start, budget_seconds)
+    warm_text = f"{warm_ms:.0f} ms" if warm_ms is not None else "n/a"
+    logging.info(f"Warm-up: cold first request {cold_ms:.0f} ms, warm first request {warm_text}; "
+                 f"{resolved:,}/{len(tokens):,} profile tokens resolved in {report.seconds:.1f}s "
+                 f"(budget {budget_seconds:.0f}s)")
+    return report
+
+
+def start_warm_up(engine, **kwargs) -> Optional[threading.Thread]:
+    """Run warm_up on a daemon thread (None when the budget is 0)"""
+    budget = kwargs.get("budget_seconds", Config.WARMUP_BUDGET_SECONDS)
+    if not budget or budget <= 0:
+        return None
+
+    def run():
+        try:
+            warm_up(engine, **kwargs)
+        except Exception as e:
+            logging.warning(f"Warm-up failed: {e}")
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the warm-up profile or warm the caches")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    profile_parser = subparsers.add_parser("build-profile", help="Token frequency profile of the corpus")
+    profile_parser.add_argument("--corpus", default="preprocessed_articles")
+    profile_parser.add_argument("--metadata", default=None, help="Only count the articles listed in metadata.csv")
+    profile_parser.add_argument("--output", default=Config.WARMUP_PROFILE_PATH)
+
+    run_parser = subparsers.add_parser("run", help="Load the models and warm up synchronously")
+    run_parser.add_argument("--profile", default=Config.WARMUP_PROFILE_PATH)
+    run_parser.add_argument("--top-k", type=int, default=Config.WARMUP_TOP_K)
+    run_parser.add_argument("--budget", type=float, default=Config.WARMUP_BUDGET_SECONDS, help="Seconds")
+    args = parser.parse_args(argv)
+
+    if args.command == "build-profile":
+        start = time.time()
+        counts = build_frequency_profile(args.corpus, args.metadata)
+        write_profile(counts, args.output)
+        print(f"✅ {len(counts):,} tokens ({sum(counts.values()):,} occurrences) -> {args.output} "
+              f"in {time.time() - start:.1f}s")
+        return 0
+
+    from classifier_core import create_classification_engine
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    start = time.time()
+    engine = create_classification_engine()
+    print(f"📦 Models loaded in {time.time() - start:.1f}s")
+    report = warm_up(engine, args.profile, args.top_k, args.budget)
+    warm_text = f"{report.warm_ms:.0f} ms" if report.warm_ms is not None else "n/a"
+    print(f"✅ Cold first request {report.cold_ms:.0f} ms, warm {warm_text}; "
+          f"{report.tokens_resolved:,}/{report.profile_tokens:,} tokens in {report.seconds:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())